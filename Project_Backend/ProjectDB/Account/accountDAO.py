@@ -9,6 +9,11 @@ from cryptography.fernet import Fernet
 from fastapi import UploadFile
 from typing import Optional
 from ProjectDB.SSY.ssyFileNameGenerator import SsyFileNameGenerator 
+from ProjectDB.SSY.ssyCache import responseCache
+from ProjectDB.SSY.ssyLeaderboard import SsyLeaderboard
+from ProjectDB.SSY.ssyGeoIndex import SsyGeoIndex
+from ProjectDB.SSY.ssyDistrictCentroid import SsyDistrictCentroid
+from ProjectDB.Notification.notificationDAO import NotificationDAO
 
 # 상위 공간의 token_utils import
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -30,6 +35,34 @@ except Exception as e:
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 점수 랭킹 인덱스 (서버 시작 시 loadRanking으로 채우고, 점수/회원 변경 시 갱신)
+rankingBoard = SsyLeaderboard()
+
+# 사용자 거주지(주소 → 구/시 중심 좌표) 인덱스 — 주변 사용자 알림 대상 선정용
+# 좌표는 Users 행(home_lat/home_lng, migrations/0014_users_home_location.sql)에 저장해 두고 재사용
+homeIndex = SsyGeoIndex(cellDeg=0.01)
+homeDistricts = {}      # district 키 -> {user_id, ...}
+_homeDistrictOf = {}    # user_id -> district 키
+
+def _indexHome(user_id, address, lat=None, lng=None):
+    _unindexHome(user_id)
+    geo = SsyDistrictCentroid.geocode(address)
+    if not geo:
+        return None
+    glat, glng, district = geo
+    lat = glat if lat is None else float(lat)
+    lng = glng if lng is None else float(lng)
+    homeIndex.add(user_id, lat, lng)
+    homeDistricts.setdefault(district, set()).add(user_id)
+    _homeDistrictOf[user_id] = district
+    return lat, lng
+
+def _unindexHome(user_id):
+    homeIndex.remove(user_id)
+    district = _homeDistrictOf.pop(user_id, None)
+    if district:
+        homeDistricts.get(district, set()).discard(user_id)
+
 # ADMIN이 유저 랭킹에서 개인정보 볼려면 필요한거
 DB_SCHEMA = os.environ.get("DB_SCHEMA", "").strip()
 
@@ -54,7 +87,6 @@ class AccountDAO:
     # 1. 회원가입 메서드 (signUp)
     def signUp(self, user_id, password, nickname, name, address, resident_id_number, phone_number=None, profile_pic: Optional[UploadFile] = None):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         profile_pic_filename = None
         file_path = None
 
@@ -78,43 +110,47 @@ class AccountDAO:
             return JSONResponse({"result": "회원가입 실패", "error": f"프로필 사진 저장 중 오류: {e}"}, status_code=500, headers=h)
         
         try:
-            con, cur = SsyDBManager.makeConCur()
+            with SsyDBManager.conCur() as (con, cur):
             
-            hashed_password = self.hash_password(password)
+                hashed_password = self.hash_password(password)
 
-            # 여기 추가: 주민등록번호 암호화 전/후 값 확인
-            print(f"DEBUG: Plain resident_id_number: {resident_id_number}")
-            encrypted_resident_id_number = self.encrypt_resident_id_number(resident_id_number)
-            print(f"DEBUG: Encrypted resident_id_number: {encrypted_resident_id_number}")
+                # 여기 추가: 주민등록번호 암호화 전/후 값 확인
+                print(f"DEBUG: Plain resident_id_number: {resident_id_number}")
+                encrypted_resident_id_number = self.encrypt_resident_id_number(resident_id_number)
+                print(f"DEBUG: Encrypted resident_id_number: {encrypted_resident_id_number}")
 
 
-            sql = """
-                INSERT INTO Users (
-                    user_id, password, profile_pic_url, nickname, name, 
-                    phone_number, address, resident_id_number, score 
-                ) VALUES (
-                    :user_id, :password, :profile_pic_url, :nickname, :name, 
-                    :phone_number, :address, :resident_id_number, 0 
-                )
-            """ 
-            # 여기 추가: SQL 쿼리 및 파라미터 확인
-            print(f"DEBUG: SQL query for signUp: {sql}")
-            print(f"DEBUG: SQL params for signUp: {{'user_id': {user_id}, ..., 'resident_id_number': {encrypted_resident_id_number}}}") # 다른 파라미터도 포함하여 출력
-            cur.execute(sql, {
-                'user_id': user_id,
-                'password': hashed_password,
-                'profile_pic_url': profile_pic_url_for_db, 
-                'nickname': nickname,
-                'name': name,
-                'phone_number': phone_number,
-                'address': address,
-                'resident_id_number': encrypted_resident_id_number 
-            })
-            con.commit()
-            #  status_code 추가
-            return JSONResponse({"result": "회원가입 성공"}, status_code=200, headers=h)
+                sql = """
+                    INSERT INTO Users (
+                        user_id, password, profile_pic_url, nickname, name, 
+                        phone_number, address, resident_id_number, score 
+                    ) VALUES (
+                        :user_id, :password, :profile_pic_url, :nickname, :name, 
+                        :phone_number, :address, :resident_id_number, 0 
+                    )
+                """ 
+                # 여기 추가: SQL 쿼리 및 파라미터 확인
+                print(f"DEBUG: SQL query for signUp: {sql}")
+                print(f"DEBUG: SQL params for signUp: {{'user_id': {user_id}, ..., 'resident_id_number': {encrypted_resident_id_number}}}") # 다른 파라미터도 포함하여 출력
+                cur.execute(sql, {
+                    'user_id': user_id,
+                    'password': hashed_password,
+                    'profile_pic_url': profile_pic_url_for_db, 
+                    'nickname': nickname,
+                    'name': name,
+                    'phone_number': phone_number,
+                    'address': address,
+                    'resident_id_number': encrypted_resident_id_number 
+                })
+                con.commit()
+                rankingBoard.setScore(user_id, 0)
+                rankingBoard.setInfo(user_id, nickname, profile_pic_url_for_db)
+                self.saveHomeLocation(user_id, address)
+                NotificationDAO.rememberRegion(user_id, address)
+                responseCache.invalidate("ranking")
+                #  status_code 추가
+                return JSONResponse({"result": "회원가입 성공"}, status_code=200, headers=h)
         except Exception as e:
-            if con: con.rollback()
             error_message = str(e).upper()
             print(f"회원가입 DB 오류 발생: {error_message}")
 
@@ -152,314 +188,369 @@ class AccountDAO:
             # ORA-00001이 아닌 다른 DB 오류
             #  status_code 추가
             return JSONResponse({"result": "회원가입 실패", "error": f"알 수 없는 DB 오류: {e}"}, status_code=500, headers=h)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
 
     # 2. 로그인 메서드 (signIn)
     def signIn(self, user_id, password):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT 
-                    password, profile_pic_url, nickname, name, 
-                    phone_number, address, resident_id_number, score,
-                    is_admin
-                FROM Users
-                WHERE user_id = :user_id
-            """ 
-            cur.execute(sql, {'user_id': user_id})
-            result = cur.fetchone() 
-
-            if result:
-                (hashed_password_db, profile_pic_url, nickname, name, 
-                 phone_number, address, encrypted_resident_id_number, 
-                 score, is_admin) = result 
+            with SsyDBManager.conCur() as (con, cur):
+                sql = """
+                    SELECT 
+                        password, profile_pic_url, nickname, name, 
+                        phone_number, address, resident_id_number, score,
+                        is_admin
+                    FROM Users
+                    WHERE user_id = :user_id
+                """ 
+                cur.execute(sql, {'user_id': user_id})
+                result = cur.fetchone() 
+
+                if result:
+                    (hashed_password_db, profile_pic_url, nickname, name, 
+                     phone_number, address, encrypted_resident_id_number, 
+                     score, is_admin) = result 
                 
-                if self.verify_password(password, hashed_password_db):
-                    decrypted_resident_id_number = self.decrypt_resident_id_number(encrypted_resident_id_number)
+                    if self.verify_password(password, hashed_password_db):
+                        decrypted_resident_id_number = self.decrypt_resident_id_number(encrypted_resident_id_number)
                     
-                    payload = {
-                        "user_id": user_id,
-                        "nickname": nickname,
-                        "name": name,
-                        "address": address,
-                        "resident_id_number": decrypted_resident_id_number,
-                        "score": score,
-                        "profile_pic_url": profile_pic_url,
-                        "phone_number": phone_number,
-                        "role": "admin" if int(is_admin) == 1 else "user",  #  role 추가
-                        "exp": datetime.now(timezone.utc) + timedelta(minutes=ACCESS_EXPIRE_MIN),
-                    }
-
-                    # 앱 켜진 상태에서 단기 연결 유지용 token
-                    access_token = jwt.encode(payload, SECRET_KEY, ALGORITHM)
-                    # 앱 꺼진 상태에서 장기 로그인 유지용 token
-                    refresh_token = create_refresh_token(user_id)
-
-                    return JSONResponse(
-                        {"result": "로그인 성공", "token": access_token, "refreshToken" : refresh_token},
-                        status_code=200,
-                        headers=h
-                    )
-
-                return JSONResponse({"result": "로그인 실패: 비밀번호 불일치"}, status_code=401, headers=h)
-
-            return JSONResponse({"result": "로그인 실패: 사용자 ID 없음"}, status_code=404, headers=h)
+                        payload = {
+                            "user_id": user_id,
+                            "nickname": nickname,
+                            "name": name,
+                            "address": address,
+                            "resident_id_number": decrypted_resident_id_number,
+                            "score": score,
+                            "profile_pic_url": profile_pic_url,
+                            "phone_number": phone_number,
+                            "role": "admin" if int(is_admin) == 1 else "user",  #  role 추가
+                            "exp": datetime.now(timezone.utc) + timedelta(minutes=ACCESS_EXPIRE_MIN),
+                        }
+
+                        # 앱 켜진 상태에서 단기 연결 유지용 token
+                        access_token = jwt.encode(payload, SECRET_KEY, ALGORITHM)
+                        # 앱 꺼진 상태에서 장기 로그인 유지용 token
+                        refresh_token = create_refresh_token(user_id)
+
+                        return JSONResponse(
+                            {"result": "로그인 성공", "token": access_token, "refreshToken" : refresh_token},
+                            status_code=200,
+                            headers=h
+                        )
+
+                    return JSONResponse({"result": "로그인 실패: 비밀번호 불일치"}, status_code=401, headers=h)
+
+                return JSONResponse({"result": "로그인 실패: 사용자 ID 없음"}, status_code=404, headers=h)
 
         except Exception as e:
             print(f"로그인 중 오류 발생: {e}")
             return JSONResponse({"result": f"로그인 DB 오류: {e}"}, status_code=500, headers=h)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
 
     # ---닉네임 중복 확인 메서드 추가 ---
     def checkNicknameDuplicate(self, nickname: str) -> bool:
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = "SELECT COUNT(*) FROM Users WHERE nickname = :nickname"
-            cur.execute(sql, {'nickname': nickname})
-            count = cur.fetchone()[0]
+            with SsyDBManager.conCur() as (con, cur):
+                sql = "SELECT COUNT(*) FROM Users WHERE nickname = :nickname"
+                cur.execute(sql, {'nickname': nickname})
+                count = cur.fetchone()[0]
 
-            return count > 0 
+                return count > 0 
         except Exception as e:
             print(f"닉네임 중복 확인 중 오류 발생: {str(e)}")
             # 이 메서드는 True/False를 반환하므로 JSONResponse를 반환하지 않습니다.
             # HTTP 500 에러는 FastAPI 엔드포인트에서 HTTPException을 발생시켜야 합니다.
             return False 
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
     
 
     #---id 중복 확인 메서드 추가
     def checkUserIdDuplicate(self, user_id: str) -> bool:
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = "SELECT COUNT(*) FROM Users WHERE user_id = :user_id"
-            cur.execute(sql, {'user_id': user_id})
-            count = cur.fetchone()[0]
-            return count > 0
+            with SsyDBManager.conCur() as (con, cur):
+                sql = "SELECT COUNT(*) FROM Users WHERE user_id = :user_id"
+                cur.execute(sql, {'user_id': user_id})
+                count = cur.fetchone()[0]
+                return count > 0
         except Exception as e:
             print(f"사용자 ID 중복 확인 중 오류 발생: {str(e)}")
             # 이 메서드도 True/False를 반환하므로 JSONResponse를 반환하지 않습니다.
             return False 
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
     
+    # ----------------------------------------------------------------------
+    # 거주지 위치 (주변 사용자 알림)
+    # ----------------------------------------------------------------------
+    def loadHomeIndex(self):
+        """
+        서버 시작 시 일반 사용자 거주지 인덱스 적재.
+        home_lat/home_lng가 비어 있는 사용자는 주소로 계산해 한 번에 채워 둔다.
+        """
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                cur.arraysize = 5000
+                cur.execute("SELECT user_id, address, home_lat, home_lng FROM Users WHERE is_admin = 0")
+                rows = cur.fetchall()
+                backfill = []
+                for user_id, address, lat, lng in rows:
+                    located = _indexHome(user_id, address, lat, lng)
+                    if located and lat is None:
+                        backfill.append({"lat": located[0], "lng": located[1], "user_id": user_id})
+                if backfill:
+                    cur.executemany("UPDATE Users SET home_lat = :lat, home_lng = :lng WHERE user_id = :user_id", backfill)
+                    con.commit()
+                print(f"INFO: 거주지 인덱스 로드 완료 ({len(homeIndex)}명, 좌표 저장 {len(backfill)}명)")
+                return len(homeIndex)
+        except Exception as e:
+            print(f"ERROR in loadHomeIndex: {e}")
+            return 0
+
+    def saveHomeLocation(self, user_id, address):
+        """주소가 바뀌면 좌표를 다시 계산해 Users 행과 인덱스에 반영"""
+        located = _indexHome(user_id, address)
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                cur.execute(
+                    "UPDATE Users SET home_lat = :lat, home_lng = :lng WHERE user_id = :user_id",
+                    {"lat": located[0] if located else None, "lng": located[1] if located else None, "user_id": user_id}
+                )
+                con.commit()
+                return located
+        except Exception as e:
+            print(f"거주지 좌표 저장 실패: {e}")
+            return located
+
+    def getHomeDistrict(self, user_id):
+        """거주지 district 키 ("서울특별시 강남구" 등), 모르면 None"""
+        return _homeDistrictOf.get(user_id)
+
+    def getDistrictResidents(self, district) -> set:
+        """district 키에 거주지가 있는 사용자 id (관리자/토큰 없는 사용자 포함)"""
+        return set(homeDistricts.get(district, ()))
+
+    def getNearbyUserIds(self, lat: float, lng: float, radius_m: float, sameDistrict: bool = True) -> set:
+        """(lat, lng) 반경 radius_m 안에 거주지가 있거나, 같은 구/시에 사는 사용자 id"""
+        user_ids = {uid for uid, _d in homeIndex.nearby(lat, lng, radius_m)}
+        if sameDistrict:
+            district = SsyDistrictCentroid.nearest(lat, lng)
+            if district:
+                user_ids |= homeDistricts.get(district, set())
+        return user_ids
+
+    # 랭킹 인덱스 적재 (서버 시작 시 1회)
+    def loadRanking(self):
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                cur.arraysize = 5000
+                cur.execute("SELECT user_id, NVL(score, 0), nickname, profile_pic_url FROM Users")
+                rankingBoard.load(cur)
+                print(f"INFO: 랭킹 인덱스 로드 완료 ({len(rankingBoard)}명)")
+                return len(rankingBoard)
+        except Exception as e:
+            print(f"ERROR in loadRanking: {e}")
+            return 0
+
     #--- 랭킹 조회 메서드
     def getRanking(self, userId: str, limit: int = 100):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
+
+        # 랭킹 인덱스가 적재되어 있으면 DB 없이 상위 N명 + 내 정확한 순위 + 내 주변 순위
+        if rankingBoard.loaded:
+            rankingData = {
+                "result": "랭킹 조회 성공",
+                "ranking": rankingBoard.top(limit),
+                "myRanking": rankingBoard.rankOf(userId) or 0,
+                "around": rankingBoard.around(userId),
+            }
+            return JSONResponse(rankingData, status_code=200, headers=h)
 
         # 상위 랭크 100명까지 조회
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT profile_pic_url, user_id, nickname, score, RANK() OVER (ORDER BY score DESC) AS rank
-                FROM Users 
-                ORDER BY score DESC 
-                FETCH FIRST :limit ROWS ONLY
-            """
-            cur.execute(sql, {'limit': limit})
-
-            ranking_list = []
-            myRanking = 0
-            for profile, user_id, nickname, score, rank in cur:
-                ranking_list.append({
-                    "profile_pic_url": profile,
-                    "user_id": user_id,
-                    "nickname": nickname,
-                    "score": score,
-                    "rank": rank
-                })
+            with SsyDBManager.conCur() as (con, cur):
+                sql = """
+                    SELECT profile_pic_url, user_id, nickname, score, RANK() OVER (ORDER BY score DESC) AS rank
+                    FROM Users 
+                    ORDER BY score DESC 
+                    FETCH FIRST :limit ROWS ONLY
+                """
+                cur.execute(sql, {'limit': limit})
+
+                ranking_list = []
+                myRanking = 0
+                for profile, user_id, nickname, score, rank in cur:
+                    ranking_list.append({
+                        "profile_pic_url": profile,
+                        "user_id": user_id,
+                        "nickname": nickname,
+                        "score": score,
+                        "rank": rank
+                    })
 
-                # 내 등수 저장
-                if user_id == userId:
-                    myRanking = rank
+                    # 내 등수 저장
+                    if user_id == userId:
+                        myRanking = rank
 
-            rankingData = {
-                "result": "랭킹 조회 성공",
-                "ranking": ranking_list,
-                "myRanking": myRanking
-            }
+                rankingData = {
+                    "result": "랭킹 조회 성공",
+                    "ranking": ranking_list,
+                    "myRanking": myRanking
+                }
 
-            return JSONResponse(rankingData, status_code=200, headers=h)
+                return JSONResponse(rankingData, status_code=200, headers=h)
 
         except Exception as e:
             print(f"랭킹 조회 중 오류 발생: {e}")
             return JSONResponse({"result": f"랭킹 조회 DB 오류: {e}"}, status_code=500, headers=h)
         
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
     
     # 개인정보 수정 
     def updateUserInfo(self, user_id, nickname=None, phone_number=None, address=None, profile_pic_url=None):
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            update_fields = []
-            params = {"user_id": user_id}
-
-            if nickname:
-                update_fields.append("nickname = :nickname")
-                params["nickname"] = nickname
-            if phone_number:
-                update_fields.append("phone_number = :phone_number")
-                params["phone_number"] = phone_number
-            if address:
-                update_fields.append("address = :address")
-                params["address"] = address
-            if profile_pic_url is not None:
-                update_fields.append("profile_pic_url = :profile_pic_url")
-                params["profile_pic_url"] = profile_pic_url
-
-            if not update_fields:
-                return False
-
-            sql = f"UPDATE Users SET {', '.join(update_fields)} WHERE user_id = :user_id"
-            cur.execute(sql, params)
-            con.commit()
-            return True
+            with SsyDBManager.conCur() as (con, cur):
+                update_fields = []
+                params = {"user_id": user_id}
+
+                if nickname:
+                    update_fields.append("nickname = :nickname")
+                    params["nickname"] = nickname
+                if phone_number:
+                    update_fields.append("phone_number = :phone_number")
+                    params["phone_number"] = phone_number
+                if address:
+                    update_fields.append("address = :address")
+                    params["address"] = address
+                if profile_pic_url is not None:
+                    update_fields.append("profile_pic_url = :profile_pic_url")
+                    params["profile_pic_url"] = profile_pic_url
+
+                if not update_fields:
+                    return False
+
+                sql = f"UPDATE Users SET {', '.join(update_fields)} WHERE user_id = :user_id"
+                cur.execute(sql, params)
+                con.commit()
+                rankingBoard.setInfo(user_id, nickname, profile_pic_url)
+                if address:
+                    self.saveHomeLocation(user_id, address)
+                    NotificationDAO.rememberRegion(user_id, address)
+                responseCache.invalidate("ranking")
+                return True
         except Exception as e:
-            if con: con.rollback()
             print("회원 정보 수정 실패:", str(e))
             return False
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
 
     # 유저 정보 가져오기 
     def getUserInfo(self, user_id: str) -> dict:
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT 
-                    user_id, nickname, name, address, resident_id_number,
-                    score, profile_pic_url, phone_number, is_admin
-                FROM Users
-                WHERE user_id = :user_id
-            """
-            cur.execute(sql, {'user_id': user_id})
-            row = cur.fetchone()
-
-            if not row:
-                return {}
-
-            return {
-                "user_id": row[0],
-                "nickname": row[1],
-                "name": row[2],
-                "address": row[3],
-                "resident_id_number": row[4],
-                "score": row[5],
-                "profile_pic_url": row[6],
-                "phone_number": row[7],
-                "is_admin": row[8],
-            }
+            with SsyDBManager.conCur() as (con, cur):
+                sql = """
+                    SELECT 
+                        user_id, nickname, name, address, resident_id_number,
+                        score, profile_pic_url, phone_number, is_admin
+                    FROM Users
+                    WHERE user_id = :user_id
+                """
+                cur.execute(sql, {'user_id': user_id})
+                row = cur.fetchone()
+
+                if not row:
+                    return {}
+
+                return {
+                    "user_id": row[0],
+                    "nickname": row[1],
+                    "name": row[2],
+                    "address": row[3],
+                    "resident_id_number": row[4],
+                    "score": row[5],
+                    "profile_pic_url": row[6],
+                    "phone_number": row[7],
+                    "is_admin": row[8],
+                }
         except Exception as e:
             print(f"[getUserInfo] 사용자 정보 조회 오류: {e}")
             return {}
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
         
     # 회원 탈퇴 (DB에서 사용자 삭제)
     def deleteUser(self, user_id: str) -> bool:
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = "DELETE FROM Users WHERE user_id = :user_id"
-            cur.execute(sql, {'user_id': user_id})
-            con.commit()
-            print(f"[회원 탈퇴] 사용자 {user_id} 삭제 완료")
-            return True
+            with SsyDBManager.conCur() as (con, cur):
+                sql = "DELETE FROM Users WHERE user_id = :user_id"
+                cur.execute(sql, {'user_id': user_id})
+                con.commit()
+                rankingBoard.remove(user_id)
+                _unindexHome(user_id)
+                NotificationDAO.forgetRegion(user_id)
+                responseCache.invalidate("ranking")
+                print(f"[회원 탈퇴] 사용자 {user_id} 삭제 완료")
+                return True
         except Exception as e:
             print(f"[회원 탈퇴 오류] {e}")
-            if con:
-                con.rollback()
             return False
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
 
     #admim이 유저 개인정보 조회
     def getUserDetailsById(self, user_id: str) -> dict:
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = f"""
-                SELECT
-                    u.USER_ID,
-                    u.NICKNAME,
-                    u.PHONE_NUMBER,
-                    u.ADDRESS,
-                    u.SCORE,
-                    u.PROFILE_PIC_URL,
-                    u.IS_ADMIN,
-                    (SELECT COUNT(*)
-                    FROM {qname('REPORTS')} r
-                    WHERE r.USER_ID = u.USER_ID) AS REPORTS_COUNT
-                FROM {qname('USERS')} u
-                WHERE u.USER_ID = :user_id
-            """
-            cur.execute(sql, {"user_id": user_id})
-            row = cur.fetchone()
-            if not row:
-                return {}
-            return {
-                "user_id": row[0],
-                "nickname": row[1],
-                "phone_number": row[2],
-                "address": row[3],
-                "score": row[4],
-                "profile_pic_url": row[5],
-                "is_admin": row[6],
-                "reports_count": row[7],
-            }
+            with SsyDBManager.conCur() as (con, cur):
+                sql = f"""
+                    SELECT
+                        u.USER_ID,
+                        u.NICKNAME,
+                        u.PHONE_NUMBER,
+                        u.ADDRESS,
+                        u.SCORE,
+                        u.PROFILE_PIC_URL,
+                        u.IS_ADMIN,
+                        (SELECT COUNT(*)
+                        FROM {qname('REPORTS')} r
+                        WHERE r.USER_ID = u.USER_ID) AS REPORTS_COUNT
+                    FROM {qname('USERS')} u
+                    WHERE u.USER_ID = :user_id
+                """
+                cur.execute(sql, {"user_id": user_id})
+                row = cur.fetchone()
+                if not row:
+                    return {}
+                return {
+                    "user_id": row[0],
+                    "nickname": row[1],
+                    "phone_number": row[2],
+                    "address": row[3],
+                    "score": row[4],
+                    "profile_pic_url": row[5],
+                    "is_admin": row[6],
+                    "reports_count": row[7],
+                }
         except Exception as e:
             print(f"[getUserDetailsById] SQL 오류: {e}")
             return {}
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
 
     # 이메일로 조회 + 신고횟수 포함  (이전 함수 개선)
     def getUserByEmail(self, email: str) -> dict:
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = f"""
-                SELECT
-                    u.USER_NO,         -- PK
-                    u.USER_ID,
-                    u.NICKNAME,
-                    u.PHONE_NUMBER,
-                    u.ADDRESS,
-                    (SELECT COUNT(*)
-                    FROM {qname('REPORTS')} r
-                    WHERE r.USER_ID = u.USER_ID) AS REPORTS_COUNT
-                FROM {qname('USERS')} u
-                WHERE u.USER_ID = :email
-                AND ROWNUM = 1
-            """
-            cur.execute(sql, {"email": email})
-            row = cur.fetchone()
-            if not row:
-                return {}
-            return {
-                "user_pk": row[0],
-                "user_id": row[1],
-                "nickname": row[2],
-                "phone_number": row[3],
-                "address": row[4],
-                "reports_count": row[5],
-            }
+            with SsyDBManager.conCur() as (con, cur):
+                sql = f"""
+                    SELECT
+                        u.USER_NO,         -- PK
+                        u.USER_ID,
+                        u.NICKNAME,
+                        u.PHONE_NUMBER,
+                        u.ADDRESS,
+                        (SELECT COUNT(*)
+                        FROM {qname('REPORTS')} r
+                        WHERE r.USER_ID = u.USER_ID) AS REPORTS_COUNT
+                    FROM {qname('USERS')} u
+                    WHERE u.USER_ID = :email
+                    AND ROWNUM = 1
+                """
+                cur.execute(sql, {"email": email})
+                row = cur.fetchone()
+                if not row:
+                    return {}
+                return {
+                    "user_pk": row[0],
+                    "user_id": row[1],
+                    "nickname": row[2],
+                    "phone_number": row[3],
+                    "address": row[4],
+                    "reports_count": row[5],
+                }
         except Exception as e:
             print(f"[getUserByEmail] SQL 오류: {e}")
-            return {}
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
\ No newline at end of file
+            return {}
\ No newline at end of file
@@ -0,0 +1,290 @@
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+from ProjectDB.SSY.ssyDBManager import SsyDBManager
+
+# 백그라운드 job 영속 큐
+#   Oracle 스키마: migrations/0017_jobs.sql (job_seq, jobs, jobs_claim_ix) / SQLite는 아래 DDL로 자동 생성
+#   status: queued / running / done / failed
+#   run_after: queued면 실행 가능 시각, running이면 lease 만료 시각
+# 시각은 epoch 초(NUMBER)로 저장 — Oracle/SQLite가 같은 SQL과 같은 지연시간 계산을 쓰도록
+#
+# running 상태의 run_after = lease 만료 시각이므로 "run_after <= now" 한 조건으로
+# 실행할 차례가 된 job과 워커가 죽어 lease가 지난 job(visibility timeout)을 같이 가져온다.
+# 단 lease가 지난 job도 max_attempts를 다 쓴 것은 다시 가져가지 않고 claim 때 failed로 정리한다
+# (워커를 죽이는 job이 끝없이 재실행되지 않도록)
+
+_SQLITE_DDL = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id        INTEGER PRIMARY KEY AUTOINCREMENT,
+        queue         TEXT NOT NULL,
+        kind          TEXT NOT NULL,
+        payload       TEXT,
+        status        TEXT NOT NULL,
+        attempts      INTEGER DEFAULT 0 NOT NULL,
+        max_attempts  INTEGER DEFAULT 5 NOT NULL,
+        run_after     REAL NOT NULL,
+        locked_by     TEXT,
+        last_error    TEXT,
+        created_at    REAL NOT NULL,
+        started_at    REAL,
+        finished_at   REAL
+    );
+    CREATE INDEX IF NOT EXISTS jobs_claim_ix ON jobs (queue, status, run_after);
+"""
+
+_SQL_CLAIMABLE = """
+    SELECT job_id, kind, payload, attempts, max_attempts, created_at
+    FROM jobs
+    WHERE queue = :q AND status IN ('queued', 'running') AND run_after <= :now
+      AND (status = 'queued' OR attempts < max_attempts)
+    ORDER BY run_after
+"""
+
+_SQL_FAIL_EXHAUSTED = """
+    UPDATE jobs
+       SET status = 'failed', finished_at = :now, locked_by = NULL,
+           last_error = 'lease expired after max_attempts'
+     WHERE queue = :q AND status = 'running' AND run_after <= :now AND attempts >= max_attempts
+"""
+
+_SQL_MARK_RUNNING = """
+    UPDATE jobs
+       SET status = 'running', attempts = attempts + 1, run_after = :lease,
+           locked_by = :w, started_at = COALESCE(started_at, :now)
+     WHERE job_id = :id
+"""
+
+class JobDAO:
+    """
+    - enqueue(): 웹 서버가 job을 넣고 바로 응답
+    - claim(): 워커가 lease를 잡고 가져감 (Oracle: FOR UPDATE SKIP LOCKED, SQLite: BEGIN IMMEDIATE)
+    - complete()/fail()/extendLease(): lease를 가진 워커(locked_by)만 상태를 바꿀 수 있음
+    - backend: "oracle"(기본, SsyDBManager 풀) / "sqlite"(로컬 실행용, JOB_SQLITE_PATH 파일)
+    """
+
+    def __init__(self, backend: Optional[str] = None, sqlitePath: Optional[str] = None,
+                 retryBase: float = 5, retryMax: float = 600):
+        self.backend = (backend or os.environ.get("JOB_BACKEND", "oracle")).lower()
+        self.sqlitePath = sqlitePath or os.environ.get("JOB_SQLITE_PATH", "jobs.db")
+        self.retryBase = retryBase
+        self.retryMax = retryMax
+        self._sqliteReady = False
+        self._sqliteLock = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    # 커넥션
+    # ----------------------------------------------------------------------
+    @contextmanager
+    def _conCur(self):
+        if self.backend != "sqlite":
+            with SsyDBManager.conCur() as (con, cur):
+                yield con, cur
+            return
+        con = sqlite3.connect(self.sqlitePath, timeout=30, isolation_level=None)
+        try:
+            if not self._sqliteReady:
+                with self._sqliteLock:
+                    con.execute("PRAGMA journal_mode=WAL")
+                    con.executescript(_SQLITE_DDL)
+                    self._sqliteReady = True
+            yield con, con.cursor()
+        finally:
+            con.close()
+
+    def _limit(self, n: int) -> str:
+        return f"LIMIT {int(n)}" if self.backend == "sqlite" else f"FETCH FIRST {int(n)} ROWS ONLY"
+
+    # ----------------------------------------------------------------------
+    # 등록
+    # ----------------------------------------------------------------------
+    def enqueue(self, queue: str, kind: str, payload: dict, delay: float = 0, max_attempts: int = 5) -> int:
+        now = time.time()
+        params = {"q": queue, "k": kind, "p": json.dumps(payload, ensure_ascii=False, default=str),
+                  "m": max_attempts, "ra": now + delay, "now": now}
+        with self._conCur() as (con, cur):
+            if self.backend == "sqlite":
+                cur.execute("""
+                    INSERT INTO jobs (queue, kind, payload, status, max_attempts, run_after, created_at)
+                    VALUES (:q, :k, :p, 'queued', :m, :ra, :now)
+                """, params)
+                return cur.lastrowid
+            o_id = cur.var(int)
+            cur.execute("""
+                INSERT INTO jobs (job_id, queue, kind, payload, status, max_attempts, run_after, created_at)
+                VALUES (job_seq.NEXTVAL, :q, :k, :p, 'queued', :m, :ra, :now)
+                RETURNING job_id INTO :o_id
+            """, dict(params, o_id=o_id))
+            con.commit()
+            return o_id.getvalue()[0]
+
+    # ----------------------------------------------------------------------
+    # 워커 쪽
+    # ----------------------------------------------------------------------
+    def claim(self, queue: str, worker: str, limit: int, leaseSec: float) -> List[dict]:
+        """실행할 job을 최대 limit개 가져와 running + lease 설정"""
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._conCur() as (con, cur):
+            if self.backend == "sqlite":
+                # 쓰기 잠금을 먼저 잡아 다른 워커의 claim과 직렬화
+                cur.execute("BEGIN IMMEDIATE")
+                try:
+                    cur.execute(_SQL_FAIL_EXHAUSTED, {"q": queue, "now": now})
+                    cur.execute(_SQL_CLAIMABLE + f" {self._limit(limit)}", {"q": queue, "now": now})
+                    rows = cur.fetchall()
+                except Exception:
+                    con.rollback()
+                    raise
+            else:
+                # SKIP LOCKED는 fetch 시점에 행을 잠그므로, prefetch도 limit에 맞춰 필요한 만큼만 잠근다
+                # (FOR UPDATE에는 FETCH FIRST를 못 씀)
+                cur.execute(_SQL_FAIL_EXHAUSTED, {"q": queue, "now": now})
+                cur.arraysize = limit
+                cur.prefetchrows = limit
+                cur.execute(_SQL_CLAIMABLE + " FOR UPDATE SKIP LOCKED", {"q": queue, "now": now})
+                rows = cur.fetchmany(limit)
+            if rows:
+                cur.executemany(_SQL_MARK_RUNNING, [
+                    {"lease": now + leaseSec, "w": worker, "now": now, "id": r[0]} for r in rows
+                ])
+            con.commit()
+        return [{
+            "job_id": r[0],
+            "queue": queue,
+            "kind": r[1],
+            "payload": json.loads(r[2]) if r[2] else {},
+            "attempts": r[3] + 1,
+            "max_attempts": r[4],
+            "created_at": r[5],
+        } for r in rows]
+
+    def extendLease(self, job_id: int, worker: str, leaseSec: float) -> bool:
+        """오래 걸리는 job의 heartbeat. False면 lease를 잃음(다른 워커가 가져감)"""
+        with self._conCur() as (con, cur):
+            cur.execute("""
+                UPDATE jobs SET run_after = :lease
+                 WHERE job_id = :id AND locked_by = :w AND status = 'running'
+            """, {"lease": time.time() + leaseSec, "id": job_id, "w": worker})
+            con.commit()
+            return cur.rowcount > 0
+
+    def complete(self, job_id: int, worker: str) -> bool:
+        now = time.time()
+        with self._conCur() as (con, cur):
+            cur.execute("""
+                UPDATE jobs SET status = 'done', finished_at = :now, run_after = :now, last_error = NULL
+                 WHERE job_id = :id AND locked_by = :w AND status = 'running'
+            """, {"now": now, "id": job_id, "w": worker})
+            con.commit()
+            ok = cur.rowcount > 0
+        if not ok:
+            logging.warning(f"[JobDAO] job {job_id} 완료 기록 실패 (lease 만료 후 다른 워커가 가져감)")
+        return ok
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.retryMax, self.retryBase * (2 ** max(0, attempts - 1)))
+        return delay + random.uniform(0, delay / 4)
+
+    def fail(self, job: dict, worker: str, error: str, retry: bool = True) -> str:
+        """재시도 가능하면 backoff 뒤 queued, 아니면 failed → 바뀐 상태"""
+        now = time.time()
+        retry = retry and job["attempts"] < job["max_attempts"]
+        status = "queued" if retry else "failed"
+        with self._conCur() as (con, cur):
+            cur.execute("""
+                UPDATE jobs
+                   SET status = :st, run_after = :ra, finished_at = :fin, last_error = :err, locked_by = NULL
+                 WHERE job_id = :id AND locked_by = :w AND status = 'running'
+            """, {
+                "st": status,
+                "ra": now + self.backoff(job["attempts"]) if retry else now,
+                "fin": None if retry else now,
+                "err": (error or "")[:1000],
+                "id": job["job_id"],
+                "w": worker,
+            })
+            con.commit()
+        return status
+
+    def purge(self, olderThanSec: float = 7 * 86400) -> int:
+        """끝난 job 정리"""
+        with self._conCur() as (con, cur):
+            cur.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < :t",
+                        {"t": time.time() - olderThanSec})
+            con.commit()
+            return cur.rowcount
+
+    # ----------------------------------------------------------------------
+    # 조회 (/jobs.stats)
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _percentile(values, p: float):
+        if not values:
+            return None
+        s = sorted(values)
+        return round(s[min(len(s) - 1, int(len(s) * p))], 3)
+
+    def stats(self, windowSec: float = 3600, sample: int = 5000) -> dict:
+        """
+        큐별 상태 개수, 가장 오래 기다린 queued job 나이, 재시도 대기 수,
+        최근 windowSec 동안 끝난 job의 대기(created→started)/전체(created→finished) 시간
+        """
+        now = time.time()
+        queues = {}
+        with self._conCur() as (con, cur):
+            cur.execute("""
+                SELECT queue, status, COUNT(*), MIN(created_at),
+                       SUM(CASE WHEN attempts > 0 THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN run_after <= :now THEN 1 ELSE 0 END)
+                FROM jobs
+                GROUP BY queue, status
+            """, {"now": now})
+            for queue, status, n, oldest, retried, due in cur.fetchall():
+                q = queues.setdefault(queue, {"queued": 0, "running": 0, "done": 0, "failed": 0})
+                q[status] = n
+                if status == "queued":
+                    q["ready"] = due or 0
+                    q["retry_wait"] = retried or 0
+                    q["oldest_queued_sec"] = round(now - oldest, 1) if oldest else None
+                elif status == "running":
+                    q["lease_expired"] = due or 0
+
+            cur.execute(f"""
+                SELECT queue, started_at - created_at, finished_at - created_at, attempts
+                FROM jobs
+                WHERE status = 'done' AND finished_at >= :since
+                ORDER BY finished_at DESC
+                {self._limit(sample)}
+            """, {"since": now - windowSec})
+            waits, totals, attempts = {}, {}, {}
+            for queue, wait, total, n in cur.fetchall():
+                waits.setdefault(queue, []).append(wait or 0)
+                totals.setdefault(queue, []).append(total or 0)
+                attempts.setdefault(queue, []).append(n)
+
+        for queue, q in queues.items():
+            w, t = waits.get(queue, []), totals.get(queue, [])
+            q["recent_done"] = len(t)
+            q["wait_sec"] = {"avg": round(sum(w) / len(w), 3) if w else None,
+                             "p95": self._percentile(w, 0.95)}
+            q["latency_sec"] = {"avg": round(sum(t) / len(t), 3) if t else None,
+                                "p95": self._percentile(t, 0.95),
+                                "max": round(max(t), 3) if t else None}
+            a = attempts.get(queue, [])
+            q["avg_attempts"] = round(sum(a) / len(a), 2) if a else None
+        return {"backend": self.backend, "window_sec": windowSec, "queues": queues}
+
+
+# 프로세스 전체 공용
+jobDAO = JobDAO(
+    retryBase=float(os.environ.get("JOB_RETRY_BASE", "5")),
+    retryMax=float(os.environ.get("JOB_RETRY_MAX", "600")),
+)
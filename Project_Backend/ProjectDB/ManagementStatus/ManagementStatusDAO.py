@@ -2,41 +2,122 @@ import os
 from datetime import datetime
 from fastapi.responses import JSONResponse
 from ProjectDB.SSY.ssyDBManager import SsyDBManager
+from ProjectDB.SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from ProjectDB.SSY.ssyRowMapper import SsyRowMapper
+from ProjectDB.SSY.ssyPageCursor import SsyPageCursor
+from ProjectDB.SSY.ssyCache import responseCache
 from typing import List, Dict, Any, Optional
 
+# 지도(핀)용 목록 (sync/async 공용, {where}/{fetch}는 SsyPageCursor.reportQuery로 채움)
+_SQL_DAMAGE_LOCATIONS = """
+    SELECT
+        r.report_id,
+        r.latitude,
+        r.longitude,
+        r.location_description,
+        r.details,
+        r.photo_url,
+        r.report_date,
+        r.user_id,
+        r.repair_status,
+        r.ai_status,        -- 추가
+        r.caption_en,       -- 추가 (CLOB)
+        r.caption_ko,       -- 추가 (CLOB)
+        r.mask_url,           -- 추가
+        r.is_normal
+    FROM Reports r
+    {where}
+    ORDER BY r.report_date DESC, r.report_id DESC
+    {fetch}
+"""
+_LOCATION_FILTERS = ["r.latitude IS NOT NULL", "r.longitude IS NOT NULL"]
+
+# 지도 뷰포트 마커 API 설정
+# 이 줌 레벨 이하에서는 서버에서 격자 클러스터링, 초과하면 개별 마커
+CLUSTER_MAX_ZOOM = 15
+# 클러스터 격자 한 칸 = 256px 타일의 1/4 (약 64px)
+CLUSTER_CELLS_PER_TILE = 4
+# 개별 마커 모드에서 한 번에 내려줄 최대 개수
+MAX_VIEW_MARKERS = 500
+
+# 뷰포트 안의 신고를 격자 칸 단위로 묶어 개수 + 중심점만 반환
+# (SELECT/GROUP BY에 바인드 식을 반복하면 ORA-00979가 날 수 있어 칸 번호는 안쪽에서 계산)
+# 인덱스: migrations/0005_reports_lat_lng_ix.sql (Reports (latitude, longitude))
+_SQL_VIEW_CLUSTERS = """
+    SELECT gy, gx, COUNT(*), AVG(latitude), AVG(longitude), MAX(report_id),
+           SUM(CASE WHEN repair_status = 1 THEN 0 ELSE 1 END)
+    FROM (
+        SELECT FLOOR(r.latitude / :cell) AS gy, FLOOR(r.longitude / :cell) AS gx,
+               r.latitude, r.longitude, r.report_id, r.repair_status
+        FROM Reports r
+        WHERE r.latitude BETWEEN :south AND :north
+          AND r.longitude BETWEEN :west AND :east
+    )
+    GROUP BY gy, gx
+"""
+
+# 확대 시 개별 마커 (상세 CLOB은 제외, 상세는 /management.report/{id}로 조회)
+_SQL_VIEW_MARKERS = """
+    SELECT r.report_id, r.latitude, r.longitude, r.repair_status, r.is_normal, r.ai_status
+    FROM Reports r
+    WHERE r.latitude BETWEEN :south AND :north
+      AND r.longitude BETWEEN :west AND :east
+    ORDER BY r.report_date DESC, r.report_id DESC
+    FETCH FIRST :p_lim ROWS ONLY
+"""
+
+# 상세 패널용 한 건 (sync/async 공용)
+_SQL_REPORT_DETAIL = """
+    SELECT
+        r.report_id,
+        r.latitude,
+        r.longitude,
+        r.location_description,
+        r.details,
+        r.photo_url,
+        r.report_date,
+        r.user_id,
+        r.repair_status,
+        r.ai_status,
+        r.caption_en,
+        r.caption_ko,
+        r.mask_url
+    FROM Reports r
+    WHERE r.report_id = :rid
+"""
+
 class ManagementStatusDAO:
     def __init__(self):
         pass
 
     def addStatus(self, report_id, current_status, damage_info_details, facility_type, manager_nickname, manager_comments=None):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None # 초기화
         try:
-            con, cur = SsyDBManager.makeConCur()
+            with SsyDBManager.conCur() as (con, cur):
             
-            # --- 이전 오류 해결을 위해 임시로 추가했던 UUID 관련 코드 제거 (만약 있었다면) ---
-            # unique_manager_nickname = f"{manager_nickname}_{uuid.uuid4().hex[:8]}"
-            # -------------------------------------------------------------------------
-
-            sql = """
-                INSERT INTO Maintenance_Status (
-                    report_id, current_status, damage_info_details, facility_type, manager_nickname, manager_comments, last_updated_date
-                ) VALUES (
-                    :report_id, :current_status, :damage_info_details, :facility_type, :manager_nickname, :manager_comments, SYSTIMESTAMP
-                )
-            """
-            cur.execute(sql, {
-                'report_id': report_id,
-                'current_status': current_status,
-                'damage_info_details': damage_info_details,
-                'facility_type': facility_type,
-                'manager_nickname': manager_nickname, # FastAPI로부터 받은 manager_nickname 값을 그대로 사용
-                'manager_comments': manager_comments
-            })
-            con.commit()
-            return JSONResponse({"result": "관리 상태 등록 성공"}, headers=h)
+                # --- 이전 오류 해결을 위해 임시로 추가했던 UUID 관련 코드 제거 (만약 있었다면) ---
+                # unique_manager_nickname = f"{manager_nickname}_{uuid.uuid4().hex[:8]}"
+                # -------------------------------------------------------------------------
+
+                sql = """
+                    INSERT INTO Maintenance_Status (
+                        report_id, current_status, damage_info_details, facility_type, manager_nickname, manager_comments, last_updated_date
+                    ) VALUES (
+                        :report_id, :current_status, :damage_info_details, :facility_type, :manager_nickname, :manager_comments, SYSTIMESTAMP
+                    )
+                """
+                cur.execute(sql, {
+                    'report_id': report_id,
+                    'current_status': current_status,
+                    'damage_info_details': damage_info_details,
+                    'facility_type': facility_type,
+                    'manager_nickname': manager_nickname, # FastAPI로부터 받은 manager_nickname 값을 그대로 사용
+                    'manager_comments': manager_comments
+                })
+                con.commit()
+                responseCache.invalidate("reports")
+                return JSONResponse({"result": "관리 상태 등록 성공"}, headers=h)
         except Exception as e:
-            if con: con.rollback() # 오류 발생 시 롤백
             error_message = str(e).upper()
             # ORA-00001은 UNIQUE 제약 조건 위반 오류 코드
             # (이 오류가 다시 발생한다면 DB에서 해당 제약조건을 제거해야 합니다.)
@@ -44,168 +125,190 @@ class ManagementStatusDAO:
                  # 'MANAGER.NICKNAME'이 특정 인덱스 이름일 수 있으므로 좀 더 일반적인 메시지 유지
                  return JSONResponse({"result": "관리 상태 등록 실패", "error": f"중복 오류: {e}"}, headers=h)
             return JSONResponse({"result": "관리 상태 등록 실패", "error": str(e)}, headers=h)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
 
-    def getAllStatuses(self):
+    def getAllStatuses(self, limit: Optional[int] = None, cursor: Optional[str] = None):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None # 초기화
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT status_id, report_id, current_status, damage_info_details, facility_type, manager_nickname, manager_comments, last_updated_date
-                FROM Maintenance_Status ORDER BY status_id DESC
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result = []
-            for r in rows:
-                # CLOB 타입 컬럼 처리 (damage_info_details, manager_comments)
-                damage_info_details_data = r[3] # damage_info_details는 r[3]
-                if hasattr(damage_info_details_data, 'read'):
-                    damage_info_details_data = damage_info_details_data.read()
-                    if isinstance(damage_info_details_data, bytes):
-                        damage_info_details_data = damage_info_details_data.decode('utf-8')
-
-                manager_comments_data = r[6] # manager_comments는 r[6]
-                if hasattr(manager_comments_data, 'read'):
-                    manager_comments_data = manager_comments_data.read()
-                    if isinstance(manager_comments_data, bytes):
-                        manager_comments_data = manager_comments_data.decode('utf-8')
-
-
-                result.append({
-                    "status_id": r[0],
-                    "report_id": r[1],
-                    "current_status": r[2],
-                    "damage_info_details": damage_info_details_data, # 처리된 데이터 사용
-                    "facility_type": r[4],
-                    "manager_nickname": r[5], # manager_nickname은 LOB 아닐 가능성 높음
-                    "manager_comments": manager_comments_data, # 처리된 데이터 사용
-                    "last_updated_date": r[7].strftime("%Y-%m-%d %H:%M:%S") if r[7] else None, # TIMESTAMP 포맷팅
-                })
-            return JSONResponse({"result": "조회 성공", "data": result}, headers=h)
+            # limit/cursor가 있으면 status_id 기준 keyset 페이지네이션
+            limit = SsyPageCursor.pageLimit(limit, cursor)
+            where, params, fetch = "", {}, ""
+            if limit is not None:
+                keyset, params = SsyPageCursor.idKeyset(cursor, "status_id")
+                where = f"WHERE {keyset}" if keyset else ""
+                fetch = "FETCH FIRST :p_lim ROWS ONLY"
+                params["p_lim"] = limit + 1
+            with SsyDBManager.conCur() as (con, cur):
+                sql = f"""
+                    SELECT status_id, report_id, current_status, damage_info_details, facility_type, manager_nickname, manager_comments, last_updated_date
+                    FROM Maintenance_Status {where} ORDER BY status_id DESC {fetch}
+                """
+                if limit is not None:
+                    SsyPageCursor.tune(cur, limit)
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+                if limit is None:
+                    # CLOB(damage_info_details, manager_comments)/TIMESTAMP 변환은 컬럼 타입 기준으로 공용 처리
+                    return JSONResponse({"result": "조회 성공", "data": SsyRowMapper.mapRows(cur.description, rows)}, headers=h)
+                rows, next_cursor = SsyPageCursor.cutIdPage(rows, limit, idIdx=0)
+                return JSONResponse({
+                    "result": "조회 성공",
+                    "data": SsyRowMapper.mapRows(cur.description, rows),
+                    "next_cursor": next_cursor
+                }, headers=h)
         except Exception as e:
             return JSONResponse({"result": "조회 실패", "error": str(e)}, headers=h)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
 
-    # --- 내부 유틸: LOB/Text/Datetime 정리 ---
+    # --- 내부 유틸: LOB/Text/Datetime 정리 (SsyRowMapper 공용) ---
     def _lob_to_text(self, v: Any) -> Optional[str]:
-        if v is None:
-            return None
-        if hasattr(v, "read"):
-            data = v.read()
-            if isinstance(data, bytes):
-                return data.decode("utf-8", errors="ignore")
-            return data
-        return str(v)
-    
+        return SsyRowMapper.toText(v)
+
     def _dt2str(self, v: Any) -> Optional[str]:
-        try:
-            return v.strftime("%Y-%m-%d %H:%M:%S") if v else None
-        except Exception:
-            return str(v) if v else None
+        return SsyRowMapper.dt2str(v)
 
+    def _locationRow(self, r) -> Dict[str, Any]:
+        return {
+            "report_id": r[0],
+            "latitude": r[1],
+            "longitude": r[2],
+            "location_description": r[3],
+            "details": self._lob_to_text(r[4]),
+            "photo_url": r[5],
+            "report_date": self._dt2str(r[6]),
+            "user_id": r[7],
+            "repair_status": int(r[8]) if r[8] is not None else 0,
+            "ai_status": r[9],
+            "caption_en": self._lob_to_text(r[10]),
+            "caption_ko": self._lob_to_text(r[11]),
+            "mask_url": r[12],
+            "is_normal":r[13]
+        }
+
+    def _detailRow(self, r) -> Dict[str, Any]:
+        return {
+            "report_id": r[0],
+            "latitude": r[1],
+            "longitude": r[2],
+            "location_description": r[3],
+            "details": self._lob_to_text(r[4]),
+            "photo_url": r[5],
+            "report_date": self._dt2str(r[6]),
+            "user_id": r[7],
+            "repair_status": int(r[8]) if r[8] is not None else 0,
+            "ai_status": r[9],
+            "caption_en": self._lob_to_text(r[10]),
+            "caption_ko": self._lob_to_text(r[11]),
+            "mask_url": r[12],
+        }
+
+    def _locationPage(self, rows, limit):
+        h = {"Access-Control-Allow-Origin": "*"}
+        next_cursor = None
+        if limit is not None:
+            rows, next_cursor = SsyPageCursor.cutReportPage(rows, limit, dateIdx=6, idIdx=0)
+        result: List[Dict[str, Any]] = [self._locationRow(r) for r in rows]
+        # 배열 응답 형태를 유지하기 위해 다음 커서는 헤더로 전달
+        if next_cursor:
+            h.update({"X-Next-Cursor": next_cursor, "Access-Control-Expose-Headers": "X-Next-Cursor"})
+        return JSONResponse(result, headers=h)
 
     # --- ❶ 지도(핀)용 목록: Reports에서 필요한 필드 + AI 결과 ---
-    def getAllDamageReportLocations(self):
+    def getAllDamageReportLocations(self, limit: Optional[int] = None, cursor: Optional[str] = None):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT
-                    r.report_id,
-                    r.latitude,
-                    r.longitude,
-                    r.location_description,
-                    r.details,
-                    r.photo_url,
-                    r.report_date,
-                    r.user_id,
-                    r.repair_status,
-                    r.ai_status,        -- 추가
-                    r.caption_en,       -- 추가 (CLOB)
-                    r.caption_ko,       -- 추가 (CLOB)
-                    r.mask_url,           -- 추가
-                    r.is_normal
-                FROM Reports r
-                WHERE r.latitude IS NOT NULL AND r.longitude IS NOT NULL
-                ORDER BY r.report_date DESC
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result: List[Dict[str, Any]] = []
-            for r in rows:
-                result.append({
-                    "report_id": r[0],
-                    "latitude": r[1],
-                    "longitude": r[2],
-                    "location_description": r[3],
-                    "details": self._lob_to_text(r[4]),
-                    "photo_url": r[5],
-                    "report_date": self._dt2str(r[6]),
-                    "user_id": r[7],
-                    "repair_status": int(r[8]) if r[8] is not None else 0,
-                    "ai_status": r[9],
-                    "caption_en": self._lob_to_text(r[10]),
-                    "caption_ko": self._lob_to_text(r[11]),
-                    "mask_url": r[12],
-                    "is_normal":r[13]
-                })
-            return JSONResponse(result, headers=h)
+            limit = SsyPageCursor.pageLimit(limit, cursor)
+            sql, params = SsyPageCursor.reportQuery(_SQL_DAMAGE_LOCATIONS, cursor, limit, filters=_LOCATION_FILTERS)
+            with SsyDBManager.conCur() as (con, cur):
+                if limit is not None:
+                    SsyPageCursor.tune(cur, limit)
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+                return self._locationPage(rows, limit)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, headers=h, status_code=400)
+        except Exception as e:
+            return JSONResponse({"error": str(e)}, headers=h, status_code=500)
+
+    async def getAllDamageReportLocationsAsync(self, limit: Optional[int] = None, cursor: Optional[str] = None):
+        h = {"Access-Control-Allow-Origin": "*"}
+        try:
+            limit = SsyPageCursor.pageLimit(limit, cursor)
+            sql, params = SsyPageCursor.reportQuery(_SQL_DAMAGE_LOCATIONS, cursor, limit, filters=_LOCATION_FILTERS)
+            async with SsyAsyncDBManager.conCur() as (con, cur):
+                if limit is not None:
+                    SsyPageCursor.tune(cur, limit)
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                return self._locationPage(rows, limit)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, headers=h, status_code=400)
         except Exception as e:
             return JSONResponse({"error": str(e)}, headers=h, status_code=500)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
 
     # --- ❷ 상세 패널용: 특정 report_id 한 건 조회 ---
     def getReportDetail(self, report_id: int):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT
-                    r.report_id,
-                    r.latitude,
-                    r.longitude,
-                    r.location_description,
-                    r.details,
-                    r.photo_url,
-                    r.report_date,
-                    r.user_id,
-                    r.repair_status,
-                    r.ai_status,
-                    r.caption_en,
-                    r.caption_ko,
-                    r.mask_url
-                FROM Reports r
-                WHERE r.report_id = :rid
-            """
-            cur.execute(sql, {"rid": report_id})
-            r = cur.fetchone()
-            if not r:
-                return JSONResponse({"error": "not_found"}, headers=h, status_code=404)
-
-            data = {
-                "report_id": r[0],
-                "latitude": r[1],
-                "longitude": r[2],
-                "location_description": r[3],
-                "details": self._lob_to_text(r[4]),
-                "photo_url": r[5],
-                "report_date": self._dt2str(r[6]),
-                "user_id": r[7],
-                "repair_status": int(r[8]) if r[8] is not None else 0,
-                "ai_status": r[9],
-                "caption_en": self._lob_to_text(r[10]),
-                "caption_ko": self._lob_to_text(r[11]),
-                "mask_url": r[12],
-            }
-            return JSONResponse(data, headers=h)
+            with SsyDBManager.conCur() as (con, cur):
+                cur.execute(_SQL_REPORT_DETAIL, {"rid": report_id})
+                r = cur.fetchone()
+                if not r:
+                    return JSONResponse({"error": "not_found"}, headers=h, status_code=404)
+                return JSONResponse(self._detailRow(r), headers=h)
+        except Exception as e:
+            return JSONResponse({"error": str(e)}, headers=h, status_code=500)
+
+    async def getReportDetailAsync(self, report_id: int):
+        h = {"Access-Control-Allow-Origin": "*"}
+        try:
+            async with SsyAsyncDBManager.conCur() as (con, cur):
+                await cur.execute(_SQL_REPORT_DETAIL, {"rid": report_id})
+                r = await cur.fetchone()
+                if not r:
+                    return JSONResponse({"error": "not_found"}, headers=h, status_code=404)
+                return JSONResponse(self._detailRow(r), headers=h)
+        except Exception as e:
+            return JSONResponse({"error": str(e)}, headers=h, status_code=500)
+
+    # --- ❸ 지도 뷰포트용: 화면 안의 신고만, 줌이 낮으면 서버에서 클러스터링 ---
+    async def getMapMarkers(self, south: float, west: float, north: float, east: float, zoom: int):
+        h = {"Access-Control-Allow-Origin": "*"}
+        if south > north or west > east:
+            return JSONResponse({"error": "잘못된 bounding box 입니다."}, headers=h, status_code=400)
+
+        bbox = {"south": south, "west": west, "north": north, "east": east}
+        try:
+            async with SsyAsyncDBManager.conCur() as (con, cur):
+                if zoom <= CLUSTER_MAX_ZOOM:
+                    cell = 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+                    await cur.execute(_SQL_VIEW_CLUSTERS, {**bbox, "cell": cell})
+                    clusters = []
+                    for gy, gx, cnt, lat, lng, last_id, pending in await cur.fetchall():
+                        clusters.append({
+                            "latitude": float(lat),
+                            "longitude": float(lng),
+                            "count": int(cnt),
+                            "pending": int(pending or 0),
+                            # 한 건짜리 칸은 바로 마커로 그릴 수 있도록 report_id 포함
+                            "report_id": last_id if cnt == 1 else None,
+                        })
+                    return JSONResponse({"mode": "cluster", "zoom": zoom, "cell": cell, "clusters": clusters}, headers=h)
+
+                SsyPageCursor.tune(cur, MAX_VIEW_MARKERS)
+                await cur.execute(_SQL_VIEW_MARKERS, {**bbox, "p_lim": MAX_VIEW_MARKERS + 1})
+                rows = await cur.fetchall()
+                markers = [{
+                    "report_id": r[0],
+                    "latitude": r[1],
+                    "longitude": r[2],
+                    "repair_status": int(r[3]) if r[3] is not None else 0,
+                    "is_normal": r[4],
+                    "ai_status": r[5],
+                } for r in rows[:MAX_VIEW_MARKERS]]
+                return JSONResponse({
+                    "mode": "marker",
+                    "zoom": zoom,
+                    "markers": markers,
+                    "truncated": len(rows) > MAX_VIEW_MARKERS
+                }, headers=h)
         except Exception as e:
             return JSONResponse({"error": str(e)}, headers=h, status_code=500)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, List, Optional
+
+class AdminDigest:
+    """
+    관리자용 "신규 신고" 알림 묶음(coalescing).
+    - add(): 등록 경로에서는 메모리 리스트에 append만 한다
+    - 첫 이벤트 뒤 window초가 지나거나 maxEvents개가 모이면 flush →
+      sink(title, body, data) 한 번 = 관리자 푸시 1건 + notifications 1행(ADMIN_ALL)
+    - 이벤트 루프 스레드(async 엔드포인트)에서만 호출하므로 잠금 없음
+    - 아직 flush 전인 이벤트는 프로세스가 죽으면 사라진다 (신고 자체는 DB에 있음)
+    """
+
+    def __init__(self, sink: Optional[Callable[[str, str, dict], Awaitable]] = None,
+                 window: float = 30, maxEvents: int = 20, maxListed: int = 10):
+        self.sink = sink
+        self.window = window
+        self.maxEvents = maxEvents
+        self.maxListed = maxListed    # 본문에 이름을 나열할 최대 신고 수
+        self._events = []
+        self._timer = None
+        self._flushing = set()
+        self.stats = {"events": 0, "digests": 0, "max_batch": 0, "errors": 0}
+
+    def add(self, report_id: int, nickname: Optional[str] = None):
+        self._events.append((report_id, nickname or "익명", time.time()))
+        self.stats["events"] += 1
+        if len(self._events) >= self.maxEvents:
+            self._flushSoon()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flushSoon)
+
+    def _flushSoon(self):
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    @staticmethod
+    def compose(events: List[tuple], maxListed: int = 10):
+        """이벤트 목록 → (title, body, data)"""
+        ids = [e[0] for e in events]
+        if len(events) == 1:
+            report_id, nickname, _ts = events[0]
+            return ("[신규 신고 등록 알림]",
+                    f"사용자 '{nickname}'님이 새로운 파손 내용을 등록하셨습니다.",
+                    {"type": "new_report", "report_ids": ids})
+        names = list(dict.fromkeys(e[1] for e in events))
+        shown = ", ".join(names[:maxListed]) + (f" 외 {len(names) - maxListed}명" if len(names) > maxListed else "")
+        listed = ", ".join(f"#{i}" for i in ids[:maxListed]) + (" …" if len(ids) > maxListed else "")
+        return ("[신규 신고 등록 알림]",
+                f"새로운 파손 신고 {len(events)}건이 등록되었습니다. ({shown})\n신고 번호: {listed}",
+                {"type": "new_report_digest", "report_ids": ids})
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        events, self._events = self._events[:self.maxEvents], self._events[self.maxEvents:]
+        if not events:
+            return None
+        if self._events:
+            # 한 묶음은 최대 maxEvents건, 남은 것은 다음 묶음으로
+            if len(self._events) >= self.maxEvents:
+                self._flushSoon()
+            else:
+                self._timer = asyncio.get_running_loop().call_later(self.window, self._flushSoon)
+        self.stats["digests"] += 1
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(events))
+        title, body, data = self.compose(events, self.maxListed)
+        try:
+            return await self.sink(title, body, data)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logging.exception(f"[AdminDigest] 전송 실패 (신고 {len(events)}건): {e}")
+
+    async def stop(self):
+        """종료 시 남은 이벤트를 흘려보냄"""
+        while self._events:
+            await self.flush()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    def status(self) -> dict:
+        pending = len(self._events)
+        oldest = self._events[0][2] if self._events else None
+        return dict(self.stats, pending=pending, window_sec=self.window, max_events=self.maxEvents,
+                    oldest_pending_sec=round(time.time() - oldest, 1) if oldest else None)
+
+
+# 프로세스 전체 공용 (sink는 homeController에서 연결)
+adminDigest = AdminDigest(
+    window=float(os.environ.get("ADMIN_DIGEST_WINDOW_SEC", "30")),
+    maxEvents=int(os.environ.get("ADMIN_DIGEST_MAX_EVENTS", "20")),
+)
@@ -1,199 +1,529 @@
 from fastapi.responses import JSONResponse
 from ProjectDB.SSY.ssyDBManager import SsyDBManager
+from ProjectDB.SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from ProjectDB.SSY.ssyDistrictCentroid import SsyDistrictCentroid
+from ProjectDB.SSY.ssyEventBroker import eventBroker
 from typing import Optional, List, Tuple
+import bisect
 import logging
+import re
+from array import array
+import threading
+import time
+import zlib
 from fastapi import HTTPException
 from datetime import datetime 
 
 SEQ_NAME = "notification_seq"  # Oracle 시퀀스 이름
+# 일괄 INSERT 시 executemany 한 번에 보낼 최대 행 수
+BULK_CHUNK = 1000
+
+# 사용자 알림함 조회 (sync/async 공용)
+# 사용자에게 해당하는 recipient_code 목록(_recipient_keys)을 미리 계산해 IN 조건으로만 거른다.
+# 키 개수가 달라도 같은 SQL(문장 캐시 재사용)이 되도록 바인드 수는 _INBOX_KEYS의 배수로 맞춘다 (남는 자리는 첫 키로 채움)
+# — 보통은 _INBOX_KEYS개 한 가지 문장, 키가 더 늘어나도 자르지 않고 다음 배수 크기의 문장을 쓴다
+# 인덱스: migrations/0011_notifications_rc_sent_ix.sql (notifications (recipient_code, sent_at DESC))
+_INBOX_KEYS = 7
+_SQL_INBOX_TEMPLATE = """
+    SELECT
+        n.notification_id,
+        n.content,
+        TO_CHAR(n.sent_at, 'YYYY-MM-DD HH24') || ':' || TO_CHAR(n.sent_at, 'MI') || ':' || TO_CHAR(n.sent_at, 'SS') AS sent_at,
+        n.sender,
+        n.recipient_code
+    FROM notifications n
+    WHERE n.recipient_code IN ({keys})
+    ORDER BY n.sent_at DESC NULLS LAST
+    FETCH FIRST :p_lim ROWS ONLY
+"""
+_inboxSql = {}
+
+def _inbox_sql(params: dict) -> str:
+    n = sum(1 for k in params if k.startswith("k"))
+    sql = _inboxSql.get(n)
+    if sql is None:
+        sql = _inboxSql[n] = _SQL_INBOX_TEMPLATE.format(keys=", ".join(f":k{i}" for i in range(n)))
+    return sql
+
+# 주소 → 시 단위 지역 코드 (필요한 시/도 코드를 여기에 추가)
+_CITY_CODES = [
+    ("서울특별시", "SEOUL"),
+    ("부산광역시", "BUSAN"),
+    ("인천광역시", "INCHEON"),
+    ("경기도", "GYEONGGI"),
+]
+_DISTRICT_RE = re.compile(r"[^ ]+구")
+
+# user_id(대문자) -> (시 코드, 구 이름, 시 코드_구/시/군 이름). signUp/updateUserInfo에서 갱신, 없으면 첫 조회 때 주소로 계산
+# (세 번째 값은 지역 브로드캐스트 코드 LOCATION_<시 코드>_<구/시/군>용, SsyDistrictCentroid 표 기준)
+_regionCache = {}
+_regionLock = threading.Lock()
+
+def districtRegionCode(district: Optional[str]) -> Optional[str]:
+    """
+    SsyDistrictCentroid district 키("서울특별시 중구") → "SEOUL_중구".
+    중구/동구/서구/강서구처럼 여러 시에 같은 이름이 있으므로 시 코드를 붙인다 (시 코드가 없으면 None)
+    """
+    parts = district.split() if district else []
+    city = dict(_CITY_CODES).get(parts[0]) if len(parts) == 2 else None
+    return f"{city}_{parts[1]}" if city else None
+
+def _region_of(address: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    if not address:
+        return None, None, None
+    city = next((code for prefix, code in _CITY_CODES if address.startswith(prefix)), None)
+    m = _DISTRICT_RE.search(address)
+    fullCity, district = SsyDistrictCentroid.parse(address)
+    return city, (m.group(0) if m else None), districtRegionCode(f"{fullCity} {district}" if district else None)
+
+# 사용자별 "마지막으로 본 알림" 커서 (migrations/0015_notification_cursors.sql)
+_SQL_MARK_SEEN = """
+    MERGE INTO notification_cursors c
+    USING (SELECT :p_uid AS user_id, :p_last AS last_seen_id FROM dual) s
+    ON (c.user_id = s.user_id)
+    WHEN MATCHED THEN UPDATE SET c.last_seen_id = GREATEST(c.last_seen_id, s.last_seen_id), c.updated_at = SYSTIMESTAMP
+    WHEN NOT MATCHED THEN INSERT (user_id, last_seen_id) VALUES (s.user_id, s.last_seen_id)
+"""
+_lastSeen = {}      # user_id(대문자) -> last_seen_id
+
+# 관리자 공용 알림 코드 (관리자 digest 알림을 한 행으로 저장)
+ADMIN_CODE = "ADMIN_ALL"
+# 관리자 user_id(대문자) 집합 — 알림함 키에 ADMIN_ALL을 붙일지 판단 (관리자 지정은 DB에서 직접 하므로 주기적으로 다시 읽음)
+ADMIN_IDS_TTL = 300
+_adminIds = None
+_adminIdsAt = 0.0
+
+class _InboxIndex:
+    """
+    recipient_code별 notification_id 정렬 배열.
+    안 읽은 수 = 사용자 키마다 last_seen_id 뒤의 개수 → 키 수 × 이진 탐색
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def load(self, rows):
+        ids = {}
+        for code, nid in rows:
+            ids.setdefault(code, array("q")).append(int(nid))
+        with self.lock:
+            self.ids = ids
+            self.loaded = True
+
+    def add(self, code: str, nid):
+        if nid is None:
+            return
+        nid = int(nid)
+        with self.lock:
+            arr = self.ids.setdefault(code, array("q"))
+            if not arr or arr[-1] < nid:
+                arr.append(nid)
+            else:
+                arr.insert(bisect.bisect_left(arr, nid), nid)
+
+    def countAfter(self, codes, lastId: int) -> int:
+        n = 0
+        with self.lock:
+            for code in codes:
+                arr = self.ids.get(code)
+                if arr:
+                    n += len(arr) - bisect.bisect_right(arr, lastId)
+        return n
+
+    def maxId(self, codes) -> int:
+        with self.lock:
+            return max((self.ids[c][-1] for c in codes if self.ids.get(c)), default=0)
+
+inboxIndex = _InboxIndex()
+
+# 새 알림을 SSE 구독자에게 전달 (토픽: code:<recipient_code>)
+def _publish(code: str, notification_id, content: str, sender: str, sent_at: Optional[datetime]):
+    eventBroker.publish(f"code:{code}", {
+        "type": "notification",
+        "notification_id": notification_id,
+        "content": content,
+        "sender": sender,
+        "recipient_code": code,
+        "sent_at": (sent_at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+def _notification_row(r):
+    return {
+        "notification_id": r[0],
+        "content": r[1],
+        "sent_at": r[2],
+        "sender": r[3],
+        "recipient_code": r[4],
+    }
 
 class NotificationDAO:
 
     def __init__(self):
         pass
 
+    # ----------------------------------------------------------------------
+    # 알림함 수신 키
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def rememberRegion(user_id: str, address: Optional[str]):
+        """가입/주소 변경 시 지역 코드를 다시 계산해 둔다"""
+        if not user_id:
+            return
+        with _regionLock:
+            _regionCache[user_id.strip().upper()] = _region_of(address)
+
+    @staticmethod
+    def forgetRegion(user_id: str):
+        if not user_id:
+            return
+        with _regionLock:
+            _regionCache.pop(user_id.strip().upper(), None)
+
+    # user_id 대소문자/공백이 섞여 있어도 찾도록 UPPER(TRIM(user_id))로 비교
+    # — 함수 기반 인덱스 migrations/0011_users_user_id_upper_ix.sql로 인덱스 조회
+    def _loadRegion(self, uid: str):
+        with SsyDBManager.conCur() as (con, cur):
+            cur.execute(
+                "SELECT address FROM USERS WHERE UPPER(TRIM(user_id)) = :p_uid AND ROWNUM = 1",
+                {"p_uid": uid}
+            )
+            row = cur.fetchone()
+            region = _region_of(row[0] if row else None)
+            with _regionLock:
+                _regionCache[uid] = region
+            return region
+
+    async def _loadRegionAsync(self, uid: str):
+        async with SsyAsyncDBManager.conCur() as (con, cur):
+            await cur.execute(
+                "SELECT address FROM USERS WHERE UPPER(TRIM(user_id)) = :p_uid AND ROWNUM = 1",
+                {"p_uid": uid}
+            )
+            row = await cur.fetchone()
+            region = _region_of(row[0] if row else None)
+            with _regionLock:
+                _regionCache[uid] = region
+            return region
+
+    _SQL_ADMIN_IDS = "SELECT UPPER(TRIM(user_id)) FROM USERS WHERE is_admin = 1"
+
+    def _adminIdsFresh(self) -> bool:
+        return _adminIds is not None and time.time() - _adminIdsAt < ADMIN_IDS_TTL
+
+    def _setAdminIds(self, rows):
+        global _adminIds, _adminIdsAt
+        _adminIds = {r[0] for r in rows}
+        _adminIdsAt = time.time()
+
+    def _isAdmin(self, uid: str) -> bool:
+        if not self._adminIdsFresh():
+            try:
+                with SsyDBManager.conCur() as (con, cur):
+                    cur.execute(self._SQL_ADMIN_IDS)
+                    self._setAdminIds(cur.fetchall())
+            except Exception as e:
+                logging.exception(f"[Notifications] 관리자 목록 조회 실패: {e}")
+                return bool(_adminIds and uid in _adminIds)
+        return uid in _adminIds
+
+    async def _isAdminAsync(self, uid: str) -> bool:
+        if not self._adminIdsFresh():
+            try:
+                async with SsyAsyncDBManager.conCur() as (con, cur):
+                    await cur.execute(self._SQL_ADMIN_IDS)
+                    self._setAdminIds(await cur.fetchall())
+            except Exception as e:
+                logging.exception(f"[Notifications] 관리자 목록 조회 실패: {e}")
+                return bool(_adminIds and uid in _adminIds)
+        return uid in _adminIds
+
+    @staticmethod
+    def _recipient_keys(recipient_code: str, region, isAdmin: bool = False) -> dict:
+        """USER_ALL, NAME_<id>, NAME_<email 앞부분>, LOCATION_<시>, LOCATION_<구>, LOCATION_<시>_<구/시/군>, (관리자면) ADMIN_ALL → IN 바인드"""
+        uid = recipient_code.strip()
+        keys = ["USER_ALL", f"NAME_{uid.upper()}"]
+        if isAdmin:
+            keys.append(ADMIN_CODE)
+        if "@" in uid:
+            keys.append(f"NAME_{uid.split('@', 1)[0].upper()}")
+        for code in region or ():
+            if code:
+                keys.append(f"LOCATION_{code}")
+        keys = list(dict.fromkeys(keys))
+        size = -(-len(keys) // _INBOX_KEYS) * _INBOX_KEYS
+        keys += [keys[0]] * (size - len(keys))
+        return {f"k{i}": k for i, k in enumerate(keys)}
+
     def list(self, recipient_code: Optional[str] = None, limit: int = 50):
-        con, cur = None, None
+        if not recipient_code:
+            raise HTTPException(status_code=400, detail="recipient_code가 필요합니다.")
+
         try:
-            con, cur = SsyDBManager.makeConCur()
-            if cur is None:
-                logging.error("DB cursor init failed")
-                raise HTTPException(status_code=500, detail="DB cursor init failed")
-
-            logging.info(f"[Notifications] recipient_code(user_id)={recipient_code}, limit={limit}")
-
-            if recipient_code:
-                sql = """
-                    SELECT *
-                    FROM (
-                        SELECT
-                            n.notification_id,
-                            n.content,
-                            TO_CHAR(n.sent_at, 'YYYY-MM-DD HH24') || ':' || TO_CHAR(n.sent_at, 'MI') || ':' || TO_CHAR(n.sent_at, 'SS') AS sent_at,
-                            n.sender,
-                            n.recipient_code
-                        FROM notifications n
-                        WHERE
-                            -- 모든 사용자 알림
-                            UPPER(n.recipient_code) = 'USER_ALL'
-                            -- 개별 사용자(ID) 알림
-                            OR UPPER(n.recipient_code) = 'NAME_' || UPPER(TRIM(:p_uid))
-                            -- 개별 사용자(이메일) 알림
-                            OR (
-                                INSTR(TRIM(:p_uid), '@') > 0 AND
-                                UPPER(n.recipient_code) = 'NAME_' || UPPER(SUBSTR(TRIM(:p_uid), 1, INSTR(TRIM(:p_uid), '@') - 1))
-                            )
-                            --  시 단위 알림 조건
-                            OR n.recipient_code = 'LOCATION_' || (
-                                SELECT 
-                                    CASE
-                                        WHEN REGEXP_LIKE(address, '^서울특별시') THEN 'SEOUL'
-                                        WHEN REGEXP_LIKE(address, '^부산광역시') THEN 'BUSAN'
-                                        WHEN REGEXP_LIKE(address, '^인천광역시') THEN 'INCHEON'
-                                        WHEN REGEXP_LIKE(address, '^경기도') THEN 'GYEONGGI'
-                                        -- 필요한 시/도 코드를 여기에 추가
-                                        ELSE ''
-                                    END
-                                FROM USERS
-                                WHERE UPPER(TRIM(user_id)) = UPPER(TRIM(:p_uid)) AND ROWNUM = 1
-                            )
-                            -- 구 단위 알림 조건
-                            OR n.recipient_code = 'LOCATION_' || (
-                                SELECT REGEXP_SUBSTR(address, '([^ ]+구)')
-                                FROM USERS
-                                WHERE UPPER(TRIM(user_id)) = UPPER(TRIM(:p_uid)) AND ROWNUM = 1
-                            )
-                        ORDER BY n.sent_at DESC NULLS LAST
-                    )
-                    WHERE ROWNUM <= :p_lim
-                """
-                params = {"p_uid": recipient_code, "p_lim": int(limit)}
-
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-            results = []
-            for r in rows:
-                results.append({
-                    "notification_id": r[0],
-                    "content": r[1],
-                    "sent_at": r[2],
-                    "sender": r[3],
-                    "recipient_code": r[4],
-                })
-
-            return {"result": "ok", "notifications": results}
+            uid = recipient_code.strip().upper()
+            region = _regionCache.get(uid) or self._loadRegion(uid)
+
+            with SsyDBManager.conCur() as (con, cur):
+                if cur is None:
+                    logging.error("DB cursor init failed")
+                    raise HTTPException(status_code=500, detail="DB cursor init failed")
+
+                logging.info(f"[Notifications] recipient_code(user_id)={recipient_code}, limit={limit}")
+
+                params = self._recipient_keys(recipient_code, region, self._isAdmin(uid))
+                params["p_lim"] = int(limit)
+                cur.execute(_inbox_sql(params), params)
+                rows = cur.fetchall()
+
+                results = [_notification_row(r) for r in rows]
+                return {"result": "ok", "notifications": results}
 
         except HTTPException:
             raise
         except Exception as e:
             logging.exception(f"[Notifications] 조회 실패: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
+
+    async def listAsync(self, recipient_code: Optional[str] = None, limit: int = 50):
+        if not recipient_code:
+            raise HTTPException(status_code=400, detail="recipient_code가 필요합니다.")
+
+        try:
+            uid = recipient_code.strip().upper()
+            region = _regionCache.get(uid) or await self._loadRegionAsync(uid)
+
+            async with SsyAsyncDBManager.conCur() as (con, cur):
+                logging.info(f"[Notifications] recipient_code(user_id)={recipient_code}, limit={limit}")
+
+                params = self._recipient_keys(recipient_code, region, await self._isAdminAsync(uid))
+                params["p_lim"] = int(limit)
+                await cur.execute(_inbox_sql(params), params)
+                rows = await cur.fetchall()
+
+                results = [_notification_row(r) for r in rows]
+                return {"result": "ok", "notifications": results}
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logging.exception(f"[Notifications] 조회 실패: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    # ----------------------------------------------------------------------
+    # 안 읽은 알림 수 / 읽음 커서
+    # ----------------------------------------------------------------------
+    def loadInboxIndex(self):
+        """서버 시작 시 recipient_code별 알림 id 적재"""
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                cur.arraysize = 5000
+                cur.execute("SELECT recipient_code, notification_id FROM notifications ORDER BY notification_id")
+                inboxIndex.load(cur)
+                logging.info(f"[Notifications] 알림함 인덱스 로드 완료 (코드 {len(inboxIndex.ids)}개)")
+        except Exception as e:
+            logging.exception(f"[Notifications] 알림함 인덱스 로드 실패: {e}")
+
+    def _userKeys(self, user_id: str):
+        uid = user_id.strip().upper()
+        region = _regionCache.get(uid) or self._loadRegion(uid)
+        return list(dict.fromkeys(self._recipient_keys(user_id, region, self._isAdmin(uid)).values()))
+
+    def eventTopics(self, user_id: str) -> List[str]:
+        """SSE 구독 토픽: 사용자가 받는 recipient_code 전부"""
+        return [f"code:{k}" for k in self._userKeys(user_id)]
+
+    def getLastSeen(self, user_id: str) -> int:
+        uid = user_id.strip().upper()
+        if uid in _lastSeen:
+            return _lastSeen[uid]
+        with SsyDBManager.conCur() as (con, cur):
+            cur.execute("SELECT last_seen_id FROM notification_cursors WHERE user_id = :p_uid", {"p_uid": uid})
+            row = cur.fetchone()
+            _lastSeen[uid] = int(row[0]) if row and row[0] is not None else 0
+            return _lastSeen[uid]
+
+    def markSeen(self, user_id: str, last_id: Optional[int] = None) -> int:
+        """last_id까지 읽음 처리 (생략하면 지금 보이는 최신 알림까지). 커서는 뒤로 가지 않는다"""
+        uid = user_id.strip().upper()
+        if last_id is None:
+            last_id = inboxIndex.maxId(self._userKeys(user_id))
+        last_id = max(int(last_id), self.getLastSeen(user_id))
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                cur.execute(_SQL_MARK_SEEN, {"p_uid": uid, "p_last": last_id})
+                con.commit()
+                _lastSeen[uid] = last_id
+                return last_id
+        except Exception as e:
+            logging.exception(f"[Notifications] 읽음 처리 실패: {e}")
+            raise HTTPException(status_code=500, detail="Mark seen failed")
+
+    def unreadCount(self, user_id: str) -> dict:
+        """
+        안 읽은 알림 수. 브로드캐스트 행(USER_ALL/LOCATION_*)도 사용자별로 복제하지 않고
+        사용자 키 × last_seen_id로 읽는 시점에 계산한다 (DB 조회 없이 인메모리)
+        """
+        if not user_id:
+            raise HTTPException(status_code=400, detail="user_id가 필요합니다.")
+        keys = self._userKeys(user_id)
+        last = self.getLastSeen(user_id)
+        if inboxIndex.loaded:
+            return {"result": "ok", "unread": inboxIndex.countAfter(keys, last), "last_seen_id": last}
+
+        # 인덱스를 못 올린 경우에만 DB에서 계산
+        with SsyDBManager.conCur() as (con, cur):
+            binds = {f"k{i}": k for i, k in enumerate(keys)}
+            binds["p_last"] = last
+            cur.execute(f"""
+                SELECT COUNT(*) FROM notifications
+                WHERE recipient_code IN ({", ".join(":k%d" % i for i in range(len(keys)))})
+                  AND notification_id > :p_last
+            """, binds)
+            return {"result": "ok", "unread": int(cur.fetchone()[0]), "last_seen_id": last}
+
+    # 조건부 응답(ETag)용 알림함 버전: 사용자 키 + 그 키들의 알림 수 + 최신 notification_id (조회 실패 시 None)
+    # 주소가 바뀌면 지역 키가 바뀌므로 버전도 바뀐다. 인덱스가 있으면 DB 조회 없이, 없으면 사용자 키로만 좁혀 집계
+    def getInboxVersion(self, recipient_code: str):
+        try:
+            keys = self._userKeys(recipient_code)
+            tag = f"{zlib.crc32('|'.join(keys).encode()):08x}"
+            if inboxIndex.loaded:
+                return f"{inboxIndex.countAfter(keys, 0)}:{inboxIndex.maxId(keys)}:{tag}"
+            with SsyDBManager.conCur() as (con, cur):
+                binds = {f"k{i}": k for i, k in enumerate(keys)}
+                cur.execute(f"""
+                    SELECT COUNT(*), MAX(notification_id) FROM notifications
+                    WHERE recipient_code IN ({", ".join(":k%d" % i for i in range(len(keys)))})
+                """, binds)
+                cnt, last = cur.fetchone()
+                return f"{cnt}:{last or 0}:{tag}"
+        except Exception as e:
+            logging.exception(f"[Notifications] 버전 조회 실패: {e}")
+            return None
 
     # 계정 알림을 위한 토큰을 DB에 저장
     def saveExpoPushToken(self, user_id, expoPushToken):
         h = {"Access-Control-Allow-Origin": "*"}
 
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            params = {"expoPushToken": expoPushToken, "user_id": user_id}
+            with SsyDBManager.conCur() as (con, cur):
+                params = {"expoPushToken": expoPushToken, "user_id": user_id}
 
-            sql = f"UPDATE Users SET TOKEN = NULL WHERE user_id != :user_id AND TOKEN = :expoPushToken"
-            cur.execute(sql, params)
+                sql = f"UPDATE Users SET TOKEN = NULL WHERE user_id != :user_id AND TOKEN = :expoPushToken"
+                cur.execute(sql, params)
 
-            sql = f"UPDATE Users SET TOKEN = :expoPushToken WHERE user_id = :user_id"
-            cur.execute(sql, params)
-            con.commit()
+                sql = f"UPDATE Users SET TOKEN = :expoPushToken WHERE user_id = :user_id"
+                cur.execute(sql, params)
+                con.commit()
 
-            return JSONResponse({'result': 'success'}, headers=h)
+                return JSONResponse({'result': 'success'}, headers=h)
         except Exception as e:
-            if con: con.rollback()
             print("회원 정보 수정 실패:", str(e))
             return JSONResponse({'error': 'save failed'}, headers=h)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
+
+    # 더 이상 전달되지 않는 토큰(DeviceNotRegistered 등) 일괄 삭제 → 지운 행 수
+    def clearExpoPushTokens(self, tokens: List[str]) -> int:
+        if not tokens:
+            return 0
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                cur.executemany("UPDATE Users SET TOKEN = NULL WHERE TOKEN = :1", [(t,) for t in tokens])
+                con.commit()
+                return cur.rowcount
+        except Exception as e:
+            logging.exception(f"[clearExpoPushTokens] SQL 오류: {e}")
+            return 0
 
     # 알림용 토큰 받기 (개인)
     def getExpoPushToken(self, to_user_id):
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql =   """
-                        SELECT token
-                        FROM Users
-                        WHERE user_id = :to_user_id
-                    """
-            cur.execute(sql, {'to_user_id': to_user_id})
-            row = cur.fetchone()
+            with SsyDBManager.conCur() as (con, cur):
+                sql =   """
+                            SELECT token
+                            FROM Users
+                            WHERE user_id = :to_user_id
+                        """
+                cur.execute(sql, {'to_user_id': to_user_id})
+                row = cur.fetchone()
 
-            if not row:
-                return False
+                if not row:
+                    return False
 
-            return row[0]
+                return row[0]
 
         except Exception as e:
             return False
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
 
     # 알림용 토큰 받기 (관리자)
     def getAdminExpoPushToken(self):
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql =   """
-                    SELECT token
-                    FROM Users
-                    WHERE is_admin = 1
-                    """
-            cur.execute(sql)
+            with SsyDBManager.conCur() as (con, cur):
+                sql =   """
+                        SELECT token
+                        FROM Users
+                        WHERE is_admin = 1
+                        """
+                cur.execute(sql)
 
-            admin_token = []
-            for id in cur:
-                admin_token.append(id)
+                admin_token = []
+                for id in cur:
+                    admin_token.append(id)
 
-            return admin_token
+                return admin_token
 
         except Exception as e:
             print(f"[getAdminExpoPushToken] SQL 오류: {e}")
             return []
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
 
     # 알림용 토큰 받기 (지역)
     def getLocalExpoPushToken(self):
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql =   """
-                    SELECT token, user_id
-                    FROM Users
-                    WHERE is_admin = 0 and token is not NULL
-                    """
-            cur.execute(sql)
+            with SsyDBManager.conCur() as (con, cur):
+                sql =   """
+                        SELECT token, user_id
+                        FROM Users
+                        WHERE is_admin = 0 and token is not NULL
+                        """
+                cur.execute(sql)
 
-            other_token = []
-            user_ids = []
+                other_token = []
+                user_ids = []
 
-            for token, user_id in cur:
-                other_token.append(token)
-                user_ids.append(user_id)
+                for token, user_id in cur:
+                    other_token.append(token)
+                    user_ids.append(user_id)
 
-            return other_token, user_ids
+                return other_token, user_ids
 
         except Exception as e:
             print(f"[getLocalExpoPushToken] SQL 오류: {e}")
             return "err", "err"
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
                 
+    # 알림용 토큰 받기 (지정한 일반 사용자들만) → [(user_id, token), ...]
+    def getExpoPushTokensFor(self, user_ids) -> List[Tuple[str, str]]:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return []
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                found = []
+                # Oracle IN 목록은 최대 1000개
+                for i in range(0, len(user_ids), 1000):
+                    group = user_ids[i:i + 1000]
+                    binds = {f"u{j}": uid for j, uid in enumerate(group)}
+                    cur.execute(f"""
+                        SELECT user_id, token
+                        FROM Users
+                        WHERE is_admin = 0 AND token IS NOT NULL
+                          AND user_id IN ({", ".join(":" + k for k in binds)})
+                    """, binds)
+                    found.extend((r[0], r[1]) for r in cur)
+                return found
+        except Exception as e:
+            print(f"[getExpoPushTokensFor] SQL 오류: {e}")
+            return []
+
     # ===== 추가: 수신코드 정규화 =====
     @staticmethod
     def _normalize_recipient_code(recipient_code: str) -> str:
@@ -204,7 +534,7 @@ class NotificationDAO:
         if not recipient_code:
             return "USER_ALL"
         up = recipient_code.strip().upper()
-        if up.startswith(("USER_ALL", "NAME_", "LOCATION_")):
+        if up.startswith(("USER_ALL", "NAME_", "LOCATION_", ADMIN_CODE)):
             return up
         if "@" in recipient_code:
             # 이메일 -> @ 앞부분만 추출
@@ -225,52 +555,49 @@ class NotificationDAO:
 
         norm_code = self._normalize_recipient_code(recipient_code)
 
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            if cur is None:
-                logging.error("DB cursor init failed")
-                raise HTTPException(status_code=500, detail="DB cursor init failed")
-
-            if sent_at is None:
-                sql = """
-                    INSERT INTO notifications (notification_id, content, sender, recipient_code)
-                    VALUES (notification_seq.NEXTVAL, :p_content, :p_sender, :p_rc)
-                    RETURNING notification_id INTO :p_new_id
-                """
-                params = {"p_content": content, "p_sender": sender, "p_rc": norm_code}
-            else:
-                sql = """
-                    INSERT INTO notifications (notification_id, content, sent_at, sender, recipient_code)
-                    VALUES (notification_seq.NEXTVAL, :p_content, :p_sent_at, :p_sender, :p_rc)
-                    RETURNING notification_id INTO :p_new_id
-                """
-                params = {
-                    "p_content": content,
-                    "p_sent_at": sent_at,  # 오라클 드라이버가 TIMESTAMP로 매핑
-                    "p_sender": sender,
-                    "p_rc": norm_code
-                }
-
-            out_id = cur.var(int)
-            params["p_new_id"] = out_id
-            cur.execute(sql, params)
-            con.commit()
-
-            new_id = out_id.getvalue()
-            if isinstance(new_id, (list, tuple)):
-                new_id = new_id[0]
-
-            logging.info(f"[Notifications] inserted id={new_id}, rc={norm_code}")
-            return {"result": "ok", "notification_id": int(new_id) if new_id is not None else None}
+            with SsyDBManager.conCur() as (con, cur):
+                if cur is None:
+                    logging.error("DB cursor init failed")
+                    raise HTTPException(status_code=500, detail="DB cursor init failed")
+
+                if sent_at is None:
+                    sql = """
+                        INSERT INTO notifications (notification_id, content, sender, recipient_code)
+                        VALUES (notification_seq.NEXTVAL, :p_content, :p_sender, :p_rc)
+                        RETURNING notification_id INTO :p_new_id
+                    """
+                    params = {"p_content": content, "p_sender": sender, "p_rc": norm_code}
+                else:
+                    sql = """
+                        INSERT INTO notifications (notification_id, content, sent_at, sender, recipient_code)
+                        VALUES (notification_seq.NEXTVAL, :p_content, :p_sent_at, :p_sender, :p_rc)
+                        RETURNING notification_id INTO :p_new_id
+                    """
+                    params = {
+                        "p_content": content,
+                        "p_sent_at": sent_at,  # 오라클 드라이버가 TIMESTAMP로 매핑
+                        "p_sender": sender,
+                        "p_rc": norm_code
+                    }
+
+                out_id = cur.var(int)
+                params["p_new_id"] = out_id
+                cur.execute(sql, params)
+                con.commit()
+
+                new_id = out_id.getvalue()
+                if isinstance(new_id, (list, tuple)):
+                    new_id = new_id[0]
+
+                inboxIndex.add(norm_code, new_id)
+                _publish(norm_code, new_id, content, sender, sent_at)
+                logging.info(f"[Notifications] inserted id={new_id}, rc={norm_code}")
+                return {"result": "ok", "notification_id": int(new_id) if new_id is not None else None}
 
         except Exception as e:
-            if con: con.rollback()
             logging.exception(f"[Notifications] insert failed: {e}")
             raise HTTPException(status_code=500, detail="Insert failed")
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
 
     # ===== 추가: 일괄 INSERT =====
     def insert_notifications_bulk(
@@ -285,74 +612,79 @@ class NotificationDAO:
         if not recipients:
             raise HTTPException(status_code=400, detail="recipients가 비어있습니다.")
 
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            if cur is None:
-                logging.error("DB cursor init failed")
-                raise HTTPException(status_code=500, detail="DB cursor init failed")
-
-            if sent_at is None:
-                sql = """
-                    INSERT INTO notifications (notification_id, content, sender, recipient_code)
-                    VALUES (notification_seq.NEXTVAL, :p_content, :p_sender, :p_rc)
-                    RETURNING notification_id INTO :p_new_id
-                """
-            else:
-                sql = """
-                    INSERT INTO notifications (notification_id, content, sent_at, sender, recipient_code)
-                    VALUES (notification_seq.NEXTVAL, :p_content, :p_sent_at, :p_sender, :p_rc)
-                    RETURNING notification_id INTO :p_new_id
-                """
-
-            ids = []
-            for rc in recipients:
-                norm_code = self._normalize_recipient_code(rc)
-                out_id = cur.var(int)
-                params = {
-                    "p_content": content,
-                    "p_sender": sender,
-                    "p_rc": norm_code,
-                    "p_new_id": out_id
-                }
-                if sent_at is not None:
-                    params["p_sent_at"] = sent_at
-
-                cur.execute(sql, params)
-                new_id = out_id.getvalue()
-                if isinstance(new_id, (list, tuple)):
-                    new_id = new_id[0]
-                ids.append(int(new_id) if new_id is not None else None)
+            with SsyDBManager.conCur() as (con, cur):
+                if cur is None:
+                    logging.error("DB cursor init failed")
+                    raise HTTPException(status_code=500, detail="DB cursor init failed")
+
+                # 한 번의 executemany(array bind)로 BULK_CHUNK건씩 INSERT,
+                # 생성된 notification_id는 배열 RETURNING 변수로 받는다
+                if sent_at is None:
+                    sql = """
+                        INSERT INTO notifications (notification_id, content, sender, recipient_code)
+                        VALUES (notification_seq.NEXTVAL, :1, :2, :3)
+                        RETURNING notification_id INTO :4
+                    """
+                else:
+                    sql = """
+                        INSERT INTO notifications (notification_id, content, sender, recipient_code, sent_at)
+                        VALUES (notification_seq.NEXTVAL, :1, :2, :3, :4)
+                        RETURNING notification_id INTO :5
+                    """
 
-            con.commit()
-            logging.info(f"[Notifications] bulk inserted cnt={len(ids)}")
-            return {"result": "ok", "inserted": len(ids), "ids": ids}
+                codes = [self._normalize_recipient_code(rc) for rc in recipients]
+                ids, failed = [], []
+                for base in range(0, len(codes), BULK_CHUNK):
+                    chunk = codes[base:base + BULK_CHUNK]
+                    if sent_at is None:
+                        rows = [(content, sender, rc) for rc in chunk]
+                    else:
+                        rows = [(content, sender, rc, sent_at) for rc in chunk]
+                    out_ids = cur.var(int, arraysize=len(rows))
+                    cur.setinputsizes(*([None] * len(rows[0])), out_ids)
+                    cur.executemany(sql, rows, batcherrors=True)
+
+                    # 실패한 행은 건너뛰고 나머지는 그대로 반영 (부분 실패 보고)
+                    errors = {err.offset: err.message for err in cur.getbatcherrors()}
+                    for i, rc in enumerate(chunk):
+                        if i in errors:
+                            ids.append(None)
+                            failed.append({"index": base + i, "recipient_code": rc, "error": errors[i]})
+                            continue
+                        new_id = out_ids.getvalue(i)
+                        if isinstance(new_id, (list, tuple)):
+                            new_id = new_id[0] if new_id else None
+                        ids.append(int(new_id) if new_id is not None else None)
+
+                con.commit()
+                for rc, new_id in zip(codes, ids):
+                    inboxIndex.add(rc, new_id)
+                    if new_id is not None:
+                        _publish(rc, new_id, content, sender, sent_at)
+                inserted = len(ids) - len(failed)
+                if failed:
+                    logging.warning(f"[Notifications] bulk insert partial failure: {len(failed)}/{len(ids)}")
+                logging.info(f"[Notifications] bulk inserted cnt={inserted}")
+                return {"result": "ok" if not failed else "partial", "inserted": inserted, "ids": ids, "failed": failed}
 
         except Exception as e:
-            if con: con.rollback()
             logging.exception(f"[Notifications] bulk insert failed: {e}")
             raise HTTPException(status_code=500, detail="Bulk insert failed")
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
     # ------- (B) 관리자 (user_id, token) 함께 조회: DB 저장에 필요 -------
     def getAdminsWithTokens(self) -> List[tuple[str, str]]:
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            cur.execute("""
-                SELECT user_id, token
-                FROM USERS
-                WHERE is_admin = 1
-                AND token IS NOT NULL
-            """)
-            return [(r[0], r[1]) for r in cur.fetchall()]
+            with SsyDBManager.conCur() as (con, cur):
+                cur.execute("""
+                    SELECT user_id, token
+                    FROM USERS
+                    WHERE is_admin = 1
+                    AND token IS NOT NULL
+                """)
+                return [(r[0], r[1]) for r in cur.fetchall()]
         except Exception as e:
             logging.exception(f"[getAdminsWithTokens] SQL 오류: {e}")
             return []
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
 
     def insert_notification_user(self, content: str, sender: str, user_id_or_email: str, sent_at: Optional[datetime]=None) -> dict:
         rc = self._normalize_recipient_code(user_id_or_email)
@@ -0,0 +1,114 @@
+from typing import Optional
+import os
+from fastapi.concurrency import run_in_threadpool
+from ProjectDB.Account.accountDAO import AccountDAO
+from ProjectDB.Registration.RegistrationDAO import reportIndex
+from ProjectDB.Notification.notificationDAO import NotificationDAO, ADMIN_CODE, districtRegionCode
+from ProjectDB.Notification.pushDispatcher import PushDispatcher, pushDispatcher
+from ProjectDB.SSY.ssyDistrictCentroid import SsyDistrictCentroid
+
+# 알림 대상 계산 + DB 저장 + pushDispatcher enqueue
+# (homeController 엔드포인트와 jobWorker의 notify.* job이 같이 쓴다)
+aDAO = AccountDAO()
+notifyDAO = NotificationDAO()
+
+async def adminRecipients():
+    # [(user_id, token), ...]
+    return await run_in_threadpool(notifyDAO.getAdminsWithTokens)
+
+# 주변 사용자 알림 반경 (이 반경 안 + 같은 구/시 거주 사용자)
+NOTIFY_RADIUS_M = float(os.environ.get("NOTIFY_RADIUS_M", "3000"))
+
+# 주변 사용자 알림 DB 저장 방식
+#   broadcast: 지역 코드(LOCATION_<시 코드>_<구/시/군>) 한 행만 저장하고 읽을 때 계산
+#              — 그 지역 거주자가 모두 수신 대상일 때만 (신고자 본인/관리자가 살면 fanout, 위치를 모르면 fanout)
+#   fanout   : 수신자마다 한 행씩 저장 (이전 방식)
+NOTIFY_DELIVERY = os.environ.get("NOTIFY_DELIVERY", "broadcast")
+
+def reportPosition(latitude: Optional[float], longitude: Optional[float], report_id: Optional[int]):
+    if (latitude is None or longitude is None) and report_id is not None:
+        return reportIndex.get(report_id) or (None, None)
+    return latitude, longitude
+
+async def localRecipients(exclude_user_id: Optional[str] = None,
+                          latitude: Optional[float] = None, longitude: Optional[float] = None,
+                          report_id: Optional[int] = None):
+    # 신고 위치를 알면 거주지 인덱스로 주변 사용자만, 모르면 기존처럼 일반 사용자 전체
+    latitude, longitude = reportPosition(latitude, longitude, report_id)
+    if latitude is not None and longitude is not None:
+        user_ids = aDAO.getNearbyUserIds(latitude, longitude, NOTIFY_RADIUS_M)
+        user_ids.discard(exclude_user_id)
+        return await run_in_threadpool(notifyDAO.getExpoPushTokensFor, user_ids)
+
+    tokens, user_ids = await run_in_threadpool(notifyDAO.getLocalExpoPushToken)
+    if tokens == "err":
+        return []
+    return [(uid, t) for uid, t in zip(user_ids, tokens) if uid and uid != exclude_user_id and t]
+
+async def saveNotifications(recipients, title, body, tag: str):
+    if not recipients:
+        return
+    try:
+        await run_in_threadpool(notifyDAO.insert_notifications_bulk,
+                                content=f"{title or ''}\n{body or ''}", sender="system",
+                                recipients=[u for (u, _t) in recipients])
+    except Exception as e:
+        # DB 저장 실패 시에도 푸시 전송은 계속 진행
+        print(f"[{tag}] DB insert 실패: {e}")
+
+def _broadcastCode(latitude: Optional[float], longitude: Optional[float], exclude_user_id: Optional[str]):
+    """(지역 코드, district 키) — 한 행 broadcast로 수신자 집합이 그대로 유지될 때만, 아니면 (None, None)"""
+    if latitude is None or longitude is None:
+        # USER_ALL 행은 관리자에게도 보이므로 (getLocalExpoPushToken은 관리자 제외) 개별 행
+        return None, None
+    district = SsyDistrictCentroid.nearest(latitude, longitude)
+    code = districtRegionCode(district)
+    if not code:
+        return None, None
+    # 지역 행은 그 지역 거주자 전원의 알림함에 보이므로, 빠져야 할 사람이 살고 있으면 개별 행
+    residents = aDAO.getDistrictResidents(district)
+    if exclude_user_id in residents or any(notifyDAO._isAdmin(u.strip().upper()) for u in residents):
+        return None, None
+    return f"LOCATION_{code}", district
+
+async def saveLocalNotifications(recipients, title, body, tag: str,
+                                 latitude: Optional[float] = None, longitude: Optional[float] = None,
+                                 exclude_user_id: Optional[str] = None):
+    if NOTIFY_DELIVERY != "broadcast" or not recipients:
+        return await saveNotifications(recipients, title, body, tag)
+
+    code, district = await run_in_threadpool(_broadcastCode, latitude, longitude, exclude_user_id)
+    if not code:
+        return await saveNotifications(recipients, title, body, tag)
+    # 반경 안이지만 다른 구/시에 사는 사용자는 지역 코드로 안 잡히므로 개별 행
+    outliers = [r for r in recipients if aDAO.getHomeDistrict(r[0]) != district]
+    try:
+        await run_in_threadpool(notifyDAO.insert_notification,
+                                content=f"{title or ''}\n{body or ''}", sender="system", recipient_code=code)
+    except Exception as e:
+        print(f"[{tag}] broadcast insert 실패: {e}")
+    await saveNotifications(outliers, title, body, tag)
+
+def pushMessages(recipients, title, body, data=None):
+    return [PushDispatcher.message(t, title, body, data) for (_u, t) in recipients]
+
+# 신고 등록 후 (notify.admins job): 관리자 전원에게 알림
+# digest=True: 관리자별 행 대신 ADMIN_ALL 한 행만 저장 (adminDigest가 묶은 알림)
+async def notifyAdmins(title: str, body: str, data: dict = None, digest: bool = False):
+    admins = await adminRecipients()
+    if digest:
+        try:
+            await run_in_threadpool(notifyDAO.insert_notification,
+                                    content=f"{title or ''}\n{body or ''}", sender="system", recipient_code=ADMIN_CODE)
+        except Exception as e:
+            print(f"[notify_admin] digest insert 실패: {e}")
+    else:
+        await saveNotifications(admins, title, body, "notify_admin")
+    return await pushDispatcher.enqueue(pushMessages(admins, title, body, data), {"type": "admin"})
+
+# 신고 등록 후 (notify.local job): 주변(일반) 사용자에게 알림
+async def notifyLocal(title: str, body: str, data: dict = None, exclude_user_id: Optional[str] = None,
+                      latitude: Optional[float] = None, longitude: Optional[float] = None):
+    locals_ = await localRecipients(exclude_user_id, latitude, longitude)
+    await saveLocalNotifications(locals_, title, body, "notify_local", latitude, longitude, exclude_user_id)
+    return await pushDispatcher.enqueue(pushMessages(locals_, title, body, data), {"type": "local"})
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import os
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+import httpx
+from token_utils import EXPO_PUSH_URL
+from ProjectDB.Notification.receiptPoller import receiptPoller as defaultReceiptPoller
+
+# Expo push API 한 요청당 최대 메시지 수
+EXPO_CHUNK = 100
+
+class PushJob:
+    """enqueue 한 번(= 알림 묶음 하나)의 진행 상태와 메시지별 결과"""
+
+    def __init__(self, messages: List[dict], meta: Optional[dict] = None):
+        self.id = uuid.uuid4().hex
+        self.meta = meta or {}
+        self.tokens = [m.get("to") for m in messages]
+        self.results = [None] * len(messages)   # 메시지별 {"status": "ok", "id": ...} / {"status": "error", ...}
+        self.pendingChunks = 0
+        self.createdAt = time.time()
+        self.finishedAt = None
+        self.done = asyncio.Event()
+
+    def summary(self, withResults: bool = False) -> dict:
+        ok = sum(1 for r in self.results if r and r.get("status") == "ok")
+        failed = sum(1 for r in self.results if r and r.get("status") != "ok")
+        data = {
+            "job_id": self.id,
+            "meta": self.meta,
+            "count": len(self.results),
+            "ok": ok,
+            "failed": failed,
+            "pending": len(self.results) - ok - failed,
+            "done": self.done.is_set(),
+            "created_at": self.createdAt,
+            "finished_at": self.finishedAt,
+        }
+        if withResults:
+            data["results"] = [dict(r or {"status": "pending"}, to=t) for t, r in zip(self.tokens, self.results)]
+        return data
+
+
+class PushDispatcher:
+    """
+    Expo 푸시 전송 전담 서브시스템.
+    - 엔드포인트는 enqueue()로 메시지를 넘기고 바로 job_id를 돌려받는다
+    - 메시지는 100개 단위 청크로 나뉘어 bounded queue에 들어가고,
+      workers개의 전송 태스크가 공유 httpx.AsyncClient로 동시에 보낸다
+    - 429/5xx/네트워크 오류는 지수 백오프로 재시도, 메시지별 결과(ticket/에러)는 job에 기록
+    - 받은 ticket은 receiptPoller에 넘겨 나중에 최종 전달 결과(receipt)를 확인
+    """
+
+    def __init__(self, url: str = EXPO_PUSH_URL, workers: int = 4, queueSize: int = 1000,
+                 maxRetries: int = 5, baseDelay: float = 0.5, timeout: float = 15, keepJobs: int = 1000,
+                 receiptPoller=None):
+        self.url = url
+        self.workers = workers
+        self.queueSize = queueSize
+        self.maxRetries = maxRetries
+        self.baseDelay = baseDelay
+        self.timeout = timeout
+        self.keepJobs = keepJobs
+        self.receiptPoller = receiptPoller
+        self._queue = None
+        self._client = None
+        self._tasks = []
+        self._jobs = OrderedDict()
+        self.stats = {"enqueued": 0, "sent": 0, "ok": 0, "failed": 0, "retries": 0, "requests": 0}
+
+    @staticmethod
+    def message(token: str, title, body, data=None) -> dict:
+        return {
+            "to": token,
+            "title": title,
+            "body": body,
+            "data": data or {},
+            "sound": "default",
+            "channelId": "default",
+            "priority": "high",
+        }
+
+    # ----------------------------------------------------------------------
+    # 수명 주기 (app startup/shutdown 이벤트에서 호출)
+    # ----------------------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queueSize)
+        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logging.info(f"[PushDispatcher] started workers={self.workers} url={self.url}")
+
+    async def stop(self, drainTimeout: float = 10):
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drainTimeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"[PushDispatcher] 종료 시 미전송 청크 {self._queue.qsize()}개")
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._client.aclose()
+        self._client = None
+
+    # ----------------------------------------------------------------------
+    # 등록 / 조회
+    # ----------------------------------------------------------------------
+    async def enqueue(self, messages: List[dict], meta: Optional[dict] = None) -> PushJob:
+        """메시지를 청크로 나눠 큐에 넣는다. 큐가 가득 차면 자리가 날 때까지 기다린다(backpressure)"""
+        if not self.running:
+            await self.start()
+        messages = [m for m in messages if m.get("to")]
+        job = PushJob(messages, meta)
+        self._remember(job)
+        chunks = [(i, messages[i:i + EXPO_CHUNK]) for i in range(0, len(messages), EXPO_CHUNK)]
+        job.pendingChunks = len(chunks)
+        if not chunks:
+            self._finish(job)
+            return job
+        for offset, group in chunks:
+            await self._queue.put((job, offset, group))
+        self.stats["enqueued"] += len(messages)
+        return job
+
+    def job(self, job_id: str) -> Optional[PushJob]:
+        return self._jobs.get(job_id)
+
+    def status(self) -> dict:
+        return dict(self.stats, queued_chunks=self._queue.qsize() if self._queue else 0,
+                    workers=len(self._tasks), jobs=len(self._jobs))
+
+    def _remember(self, job: PushJob):
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.keepJobs:
+            self._jobs.popitem(last=False)
+
+    def _finish(self, job: PushJob):
+        job.finishedAt = time.time()
+        job.done.set()
+
+    # ----------------------------------------------------------------------
+    # 전송
+    # ----------------------------------------------------------------------
+    async def _worker(self, n: int):
+        while True:
+            job, offset, group = await self._queue.get()
+            results = None
+            try:
+                results = await self._sendChunk(group)
+            except asyncio.CancelledError:
+                # stop()에서 drain 시간을 넘긴 청크 — job을 기다리는 쪽이 멈추지 않도록 실패로 끝냄
+                results = [{"status": "error", "message": "dispatcher stopped"}] * len(group)
+                raise
+            except Exception as e:
+                logging.exception(f"[PushDispatcher] worker{n} 전송 실패: {e}")
+                results = [{"status": "error", "message": str(e)}] * len(group)
+            finally:
+                self._queue.task_done()
+                self._record(job, offset, group, results)
+
+    def _record(self, job: PushJob, offset: int, group: List[dict], results: List):
+        """청크 결과 기록 + receipt 추적. 여기서 오류가 나도 워커는 계속 돌고 job은 반드시 끝난다"""
+        try:
+            results = [r if isinstance(r, dict) else {"status": "error", "message": f"잘못된 응답 항목: {r!r}"[:200]}
+                       for r in results]
+            for i, r in enumerate(results):
+                job.results[offset + i] = r
+                self.stats["ok" if r.get("status") == "ok" else "failed"] += 1
+            self.stats["sent"] += len(group)
+            if self.receiptPoller:
+                self.receiptPoller.track(group, results)
+        except Exception as e:
+            logging.exception(f"[PushDispatcher] 청크 결과 기록 실패 (job {job.id}): {e}")
+        finally:
+            job.pendingChunks -= 1
+            if job.pendingChunks == 0:
+                self._finish(job)
+
+    def _backoff(self, attempt: int, resp: Optional[httpx.Response] = None) -> float:
+        if resp is not None:
+            retryAfter = resp.headers.get("retry-after")
+            if retryAfter and retryAfter.isdigit():
+                return float(retryAfter)
+        delay = self.baseDelay * (2 ** attempt)
+        return delay + random.uniform(0, delay / 2)
+
+    async def _sendChunk(self, group: List[dict]) -> List[dict]:
+        """청크 하나 전송 → 메시지 순서대로 결과 목록"""
+        lastError = None
+        for attempt in range(self.maxRetries + 1):
+            resp = None
+            try:
+                self.stats["requests"] += 1
+                resp = await self._client.post(self.url, json=group)
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    lastError = f"HTTP {resp.status_code}"
+                else:
+                    if resp.status_code >= 400:
+                        # 요청 자체가 잘못된 경우는 재시도해도 같으므로 바로 실패 처리
+                        return [{"status": "error", "message": f"HTTP {resp.status_code}: {resp.text[:200]}"}] * len(group)
+                    data = resp.json().get("data", [])
+                    if isinstance(data, dict):
+                        data = [data]
+                    return [data[i] if i < len(data) else {"status": "error", "message": "응답 누락"}
+                            for i in range(len(group))]
+            except httpx.HTTPError as e:
+                lastError = str(e) or type(e).__name__
+            if attempt < self.maxRetries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt, resp))
+        return [{"status": "error", "message": f"재시도 초과: {lastError}"}] * len(group)
+
+
+# 프로세스 전체 공용 디스패처
+pushDispatcher = PushDispatcher(
+    workers=int(os.environ.get("PUSH_WORKERS", "4")),
+    queueSize=int(os.environ.get("PUSH_QUEUE_SIZE", "1000")),
+    maxRetries=int(os.environ.get("PUSH_MAX_RETRIES", "5")),
+    receiptPoller=defaultReceiptPoller,
+)
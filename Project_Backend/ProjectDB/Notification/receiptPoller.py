@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from typing import List
+import httpx
+from token_utils import EXPO_RECEIPTS_URL
+from ProjectDB.Notification.notificationDAO import NotificationDAO
+
+# Expo getReceipts 한 요청당 최대 ticket id 수
+RECEIPT_BATCH = 1000
+# 이 오류는 앱 삭제/토큰 만료 → 즉시 토큰 삭제
+DEAD_TOKEN_ERRORS = ("DeviceNotRegistered",)
+
+class ReceiptPoller:
+    """
+    푸시 ticket → receipt 확인 백그라운드 작업.
+    - PushDispatcher가 받은 ticket(id, token)을 track()으로 넘기면
+      delay초 뒤부터 1000개 단위로 getReceipts를 호출해 최종 전달 결과를 확인
+    - DeviceNotRegistered 토큰은 Users.TOKEN에서 바로 지우고,
+      그 밖의 전달 실패는 토큰별로 세다가 maxFailures번이 되면 같이 지운다 (성공하면 0으로 초기화)
+    """
+
+    def __init__(self, url: str = EXPO_RECEIPTS_URL, delay: float = 900, interval: float = 60,
+                 maxAge: float = 86400, maxFailures: int = 5, timeout: float = 15):
+        self.url = url
+        self.delay = delay            # 전송 후 receipt를 조회하기까지 대기 (Expo 권장 ~15분)
+        self.interval = interval      # 폴링 주기
+        self.maxAge = maxAge          # 이 시간이 지나도 receipt가 없으면 포기
+        self.maxFailures = maxFailures
+        self.timeout = timeout
+        self.notifyDAO = NotificationDAO()
+        self._pending = OrderedDict()       # ticket_id -> (token, sentAt)  (보낸 순서)
+        self._failures = {}                 # token -> 연속 실패 횟수
+        self._latencies = deque(maxlen=1000)  # 전송 → receipt 확인까지 걸린 시간(초)
+        self._pollMs = deque(maxlen=200)      # getReceipts 요청 자체의 응답 시간(ms)
+        self._client = None
+        self._task = None
+        self.stats = {"tracked": 0, "checked": 0, "ok": 0, "error": 0, "expired": 0,
+                      "pruned": 0, "polls": 0, "poll_errors": 0}
+
+    # ----------------------------------------------------------------------
+    # 수명 주기
+    # ----------------------------------------------------------------------
+    async def start(self):
+        if self._task:
+            return
+        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if not self._task:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self._client.aclose()
+        self._client = None
+
+    # ----------------------------------------------------------------------
+    # PushDispatcher → ticket 등록
+    # ----------------------------------------------------------------------
+    def track(self, messages: List[dict], results: List[dict]):
+        now = time.time()
+        dead = []
+        for m, r in zip(messages, results):
+            token = m.get("to")
+            if r.get("status") == "ok" and r.get("id"):
+                self._pending[r["id"]] = (token, now)
+                self.stats["tracked"] += 1
+            elif (r.get("details") or {}).get("error") in DEAD_TOKEN_ERRORS:
+                # ticket 단계에서 이미 무효로 판정된 토큰
+                dead.append(token)
+        if dead:
+            asyncio.get_running_loop().create_task(self._prune(dead))
+
+    def forget(self, token: str):
+        """토큰이 새로 저장되면 실패 횟수 초기화"""
+        self._failures.pop(token, None)
+
+    # ----------------------------------------------------------------------
+    # 폴링
+    # ----------------------------------------------------------------------
+    async def _run(self):
+        while True:
+            try:
+                await self.pollOnce()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.exception(f"[ReceiptPoller] 폴링 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    def _due(self, now: float) -> List[str]:
+        due = []
+        for ticket_id, (_token, sentAt) in self._pending.items():
+            if sentAt > now - self.delay:
+                break   # 보낸 순서대로 들어 있으므로 뒤는 전부 아직
+            due.append(ticket_id)
+        return due
+
+    async def pollOnce(self) -> int:
+        """receipt를 조회할 때가 된 ticket을 전부 확인 → 확인한 개수"""
+        now = time.time()
+        due = self._due(now)
+        checked = 0
+        dead, failed = [], []
+        for i in range(0, len(due), RECEIPT_BATCH):
+            ids = due[i:i + RECEIPT_BATCH]
+            t0 = time.perf_counter()
+            try:
+                self.stats["polls"] += 1
+                resp = await self._client.post(self.url, json={"ids": ids})
+                resp.raise_for_status()
+                receipts = resp.json().get("data", {}) or {}
+            except (httpx.HTTPError, ValueError) as e:
+                self.stats["poll_errors"] += 1
+                logging.warning(f"[ReceiptPoller] getReceipts 실패: {e}")
+                break   # 다음 주기에 다시
+            finally:
+                self._pollMs.append((time.perf_counter() - t0) * 1000)
+
+            done = time.time()
+            for ticket_id in ids:
+                token, sentAt = self._pending[ticket_id]
+                receipt = receipts.get(ticket_id)
+                if receipt is None:
+                    # 아직 receipt가 없음 — 너무 오래됐으면 포기
+                    if sentAt < done - self.maxAge:
+                        del self._pending[ticket_id]
+                        self.stats["expired"] += 1
+                    continue
+                del self._pending[ticket_id]
+                checked += 1
+                self._latencies.append(done - sentAt)
+                if receipt.get("status") == "ok":
+                    self.stats["ok"] += 1
+                    self._failures.pop(token, None)
+                    continue
+                self.stats["error"] += 1
+                error = (receipt.get("details") or {}).get("error")
+                if error in DEAD_TOKEN_ERRORS:
+                    dead.append(token)
+                else:
+                    n = self._failures.get(token, 0) + 1
+                    self._failures[token] = n
+                    if n >= self.maxFailures:
+                        failed.append(token)
+        self.stats["checked"] += checked
+        if dead or failed:
+            await self._prune(dead + failed)
+        return checked
+
+    async def _prune(self, tokens: List[str]):
+        tokens = list(dict.fromkeys(t for t in tokens if t))
+        if not tokens:
+            return
+        n = await asyncio.to_thread(self.notifyDAO.clearExpoPushTokens, tokens)
+        for t in tokens:
+            self._failures.pop(t, None)
+        self.stats["pruned"] += n
+        logging.info(f"[ReceiptPoller] 무효 토큰 {len(tokens)}개 정리 (삭제 {n}행)")
+
+    # ----------------------------------------------------------------------
+    # 지표
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _percentile(values, p: float):
+        if not values:
+            return None
+        s = sorted(values)
+        return s[min(len(s) - 1, int(len(s) * p))]
+
+    def metrics(self) -> dict:
+        lat = list(self._latencies)
+        poll = list(self._pollMs)
+        return dict(
+            self.stats,
+            pending=len(self._pending),
+            failing_tokens=len(self._failures),
+            receipt_latency_sec={
+                "avg": round(sum(lat) / len(lat), 1) if lat else None,
+                "p95": self._percentile(lat, 0.95),
+                "max": max(lat) if lat else None,
+            },
+            poll_ms={
+                "avg": round(sum(poll) / len(poll), 1) if poll else None,
+                "p95": self._percentile(poll, 0.95),
+            },
+        )
+
+
+# 프로세스 전체 공용 receipt 폴러
+receiptPoller = ReceiptPoller(
+    delay=float(os.environ.get("PUSH_RECEIPT_DELAY", "900")),
+    interval=float(os.environ.get("PUSH_RECEIPT_INTERVAL", "60")),
+    maxFailures=int(os.environ.get("PUSH_TOKEN_MAX_FAILURES", "5")),
+)
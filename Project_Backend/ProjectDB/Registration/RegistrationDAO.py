@@ -1,39 +1,202 @@
 from __future__ import annotations
 import typing as t
 import os
-import decimal
+import asyncio
 from datetime import datetime
 import httpx
 import oracledb  # python-oracledb
 from fastapi.responses import JSONResponse
 from ProjectDB.SSY.ssyDBManager import SsyDBManager
+from ProjectDB.SSY.ssyAsyncDBManager import SsyAsyncDBManager
 from ProjectDB.SSY.ssyFileNameGenerator import SsyFileNameGenerator
+from ProjectDB.SSY.ssyRowMapper import SsyRowMapper
+from ProjectDB.SSY.ssyPageCursor import SsyPageCursor
+from ProjectDB.SSY.ssyGeoIndex import SsyGeoIndex
+from ProjectDB.SSY.ssyImageHash import SsyImageHash
+from ProjectDB.SSY.ssyDuplicateIndex import SsyDuplicateIndex
+from ProjectDB.SSY.ssyCache import responseCache
+from ProjectDB.SSY.ssyEventBroker import eventBroker
 from ProjectDB.Notification.notificationDAO import NotificationDAO
+from ProjectDB.Account.accountDAO import rankingBoard
 from token_utils import EXPO_PUSH_URL
 
 notifyDAO = NotificationDAO()
 
-# 모든 컬럼을 일괄 정규화(LOB→str, Datetime→문자열, Decimal→int/float, bytes→str) 해서 반환
-def _normalize_for_json(v):
-    # LOB -> str
-    if hasattr(v, "read"):
-        try:
-            v = v.read()
-        except Exception:
-            v = None
-    # bytes -> utf-8 str
-    if isinstance(v, (bytes, bytearray)):
-        try:
-            v = v.decode("utf-8", errors="ignore")
-        except Exception:
-            v = v.hex()
-    # datetime -> 문자열
-    if isinstance(v, datetime):
-        return v.strftime("%Y-%m-%d %H:%M:%S")
-    # Decimal -> int/float
-    if isinstance(v, decimal.Decimal):
-        return int(v) if v == v.to_integral_value() else float(v)
-    return v
+# 신고 위치 공간 인덱스 (서버 시작 시 loadReportIndex로 채우고, 등록/삭제 시 갱신)
+reportIndex = SsyGeoIndex()
+
+# 중복 신고 판별 (같은 파손을 여러 사람이 몇 시간 안에 신고하는 경우)
+#   스키마: migrations/0024_reports_dedup.sql (python migrate.py). 컬럼이 없으면 판별 없이 기존 INSERT로 등록
+#   REPORT_DEDUP=0이면 끔, REPORT_DEDUP_RADIUS_M(기본 30) 이내 / REPORT_DEDUP_WINDOW_HOURS(기본 6) 안에
+#   사진 dHash 차이가 REPORT_DEDUP_MAX_BITS(기본 10) 이하면 중복 → duplicate_of에 원본 report_id를 남기고
+#   점수 +10 / AI 분석 / 관리자·주변 알림을 하지 않는다 (ai_status는 '중복:#원본')
+REPORT_DEDUP = os.environ.get("REPORT_DEDUP", "1") == "1"
+reportDedup = SsyDuplicateIndex(
+    reportIndex,
+    radiusM=float(os.environ.get("REPORT_DEDUP_RADIUS_M", "30")),
+    windowSec=float(os.environ.get("REPORT_DEDUP_WINDOW_HOURS", "6")) * 3600,
+    maxBits=int(os.environ.get("REPORT_DEDUP_MAX_BITS", "10")),
+)
+
+# Reports의 실제 컬럼 (대문자). 처음 필요할 때 한 번 조회해서 마이그레이션 전 DB에서는 새 컬럼을 쓰지 않는다
+_SQL_REPORT_COLUMNS = "SELECT column_name FROM user_tab_columns WHERE table_name = 'REPORTS'"
+_DEDUP_COLUMNS = {"PHOTO_DHASH", "DUPLICATE_OF"}
+_reportColumns = None
+
+def _setReportColumns(rows):
+    global _reportColumns
+    _reportColumns = {r[0].upper() for r in rows}
+    if REPORT_DEDUP and not _DEDUP_COLUMNS <= _reportColumns:
+        print("WARN: Reports에 photo_dhash/duplicate_of 컬럼이 없어 중복 신고 판별을 끕니다 (python migrate.py 실행 필요)")
+
+def _dedupReady() -> bool:
+    return REPORT_DEDUP and _reportColumns is not None and _DEDUP_COLUMNS <= _reportColumns
+
+def _reportInsertSql(columns: t.List[str]) -> str:
+    """INSERT INTO Reports (...) RETURNING report_id — 바인드 이름은 p_컬럼명"""
+    return f"""
+        INSERT INTO Reports ({", ".join(columns)})
+        VALUES ({", ".join(":p_" + c for c in columns)})
+        RETURNING report_id INTO :out_report_id
+    """
+
+# 상태 포함 전체 목록 (sync/async 공용)
+# {where}/{fetch}는 SsyPageCursor.reportQuery로 채움 — 신고(report) 단위로 페이지를 자른 뒤 상태를 JOIN
+_SQL_ALL_REGISTRATIONS = """
+    SELECT
+        r.report_id,
+        r.user_id,
+        r.photo_url,
+        r.location_description,
+        r.latitude,
+        r.longitude,
+        r.report_date,
+        r.details,
+        r.is_normal,
+        r.repair_status,
+        m.status_id,
+        m.current_status,
+        m.manager_nickname,
+        m.manager_comments,
+        m.last_updated_date
+    FROM (
+        SELECT r.*
+        FROM Reports r
+        {where}
+        ORDER BY r.report_date DESC, r.report_id DESC
+        {fetch}
+    ) r
+    LEFT JOIN Maintenance_Status m
+      ON m.report_id = r.report_id
+    ORDER BY r.report_date DESC, r.report_id DESC
+"""
+
+def _registration_row(r):
+    return {
+        "report_id": r[0],
+        "user_id": r[1],
+        "photo_url": r[2],
+        "location_description": r[3],
+        "latitude": r[4],
+        "longitude": r[5],
+        "report_date": SsyRowMapper.dt2str(r[6]),
+        "details": SsyRowMapper.toText(r[7]),
+        "is_normal": int(r[8]) if r[8] is not None else None,
+        "repair_status": int(r[9]) if r[9] is not None else 0,
+        "maintenance": {
+            "status_id": r[10],
+            "current_status": r[11],
+            "manager_nickname": r[12],
+            "manager_comments": SsyRowMapper.toText(r[13]),
+            "last_updated_date": SsyRowMapper.dt2str(r[14]),
+        }
+    }
+
+# 사용자별 목록 + 상태 (sync/async 공용)
+_SQL_USER_REPORTS = """
+    SELECT
+        r.report_id,
+        r.user_id,
+        r.photo_url,
+        r.location_description,
+        r.latitude,
+        r.longitude,
+        r.report_date,
+        r.details,
+        r.is_normal,
+        r.repair_status,
+        m.current_status,
+        m.last_updated_date
+    FROM (
+        SELECT r.*
+        FROM Reports r
+        {where}
+        ORDER BY r.report_date DESC, r.report_id DESC
+        {fetch}
+    ) r
+    LEFT JOIN Maintenance_Status m
+      ON m.report_id = r.report_id
+    ORDER BY r.report_date DESC, r.report_id DESC
+"""
+
+def _user_report_row(r):
+    return {
+        "report_id": r[0],
+        "user_id": r[1],
+        "photo_url": r[2],
+        "location_description": r[3],
+        "latitude": r[4],
+        "longitude": r[5],
+        "report_date": SsyRowMapper.dt2str(r[6]),
+        "details": SsyRowMapper.toText(r[7]),
+        "is_normal": int(r[8]) if r[8] is not None else None,
+        "repair_status": int(r[9]) if r[9] is not None else 0,
+        "current_status": r[10],
+        "last_updated_date": SsyRowMapper.dt2str(r[11]),
+    }
+
+# AI 분석 상태 전이 (queued → processing → done / failed)
+#   스키마: migrations/0025_reports_ai_state.sql (기존 행은 ai_status 값으로 채움)
+# ai_status는 화면에 보이는 값(라벨 / 'processing' / 'failed:...') 그대로 두고, 전이 조건은 ai_state로 판단한다.
+# done은 끝 상태: 재시도/중복 job이 와도 결과와 점수(-10)를 다시 적용하지 않는다.
+# 블록마다 COMMIT까지 포함 → 전이 한 번 = DB 왕복 한 번
+_SQL_AI_BEGIN = """
+    BEGIN
+        UPDATE Reports SET ai_state = 'processing', ai_status = 'processing'
+         WHERE report_id = :rid AND NVL(ai_state, 'queued') <> 'done';
+        :o_n := SQL%ROWCOUNT;
+        COMMIT;
+    END;
+"""
+
+_SQL_AI_SAVE = """
+    BEGIN
+        UPDATE Reports
+           SET ai_state   = 'done',
+               ai_status  = :st,
+               caption_en = :cen,
+               caption_ko = :cko,
+               mask_url   = :murl,
+               is_normal  = CASE WHEN :normal = 1 THEN 1 ELSE is_normal END
+         WHERE report_id = :rid AND NVL(ai_state, 'queued') <> 'done'
+        RETURNING user_id INTO :o_uid;
+        :o_n := SQL%ROWCOUNT;
+        IF :o_n = 1 AND :normal = 1 THEN
+            UPDATE USERS SET SCORE = NVL(SCORE, 0) - 10 WHERE USER_ID = :o_uid
+            RETURNING SCORE INTO :o_score;
+        END IF;
+        COMMIT;
+    END;
+"""
+
+_SQL_AI_FAIL = """
+    BEGIN
+        UPDATE Reports SET ai_state = 'failed', ai_status = :st
+         WHERE report_id = :rid AND NVL(ai_state, 'queued') <> 'done';
+        :o_n := SQL%ROWCOUNT;
+        COMMIT;
+    END;
+"""
 
 class RegistrationDAO:
     def __init__(self):
@@ -48,9 +211,10 @@ class RegistrationDAO:
         3) 같은 트랜잭션에서 Maintenance_Status INSERT('접수')
         4) 같은 트랜잭션에서 Users(또는 Accounts) 점수 +1  
         5) 실패 시 롤백 + 파일 삭제
+        근처에서 최근 비슷한 사진으로 등록된 신고가 있으면(reportDedup) duplicate_of를 남기고 점수는 올리지 않음
+        → 응답의 duplicate_of를 보고 호출 쪽에서 AI 분석 / 알림을 건너뛴다
         """
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         filename = None
         file_path = None
 
@@ -78,87 +242,108 @@ class RegistrationDAO:
         # 2) DB INSERT
         # ------------------------------------------------------------------
         try:
-            con, cur = SsyDBManager.makeConCur()
+            async with SsyAsyncDBManager.conCur() as (con, cur):
 
-            # 날짜/시간 파싱
-            try:
-                parsed_report_date = datetime.strptime(report_date, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
+                # 날짜/시간 파싱
                 try:
-                    date_only = datetime.strptime(report_date, "%Y-%m-%d")
-                    now_time = datetime.now().time()
-                    parsed_report_date = datetime.combine(date_only.date(), now_time)
-                except ValueError as ve:
-                    error_msg = f"날짜 형식 오류: {report_date} - {ve}"
-                    print(f"ERROR: {error_msg}")
-                    return JSONResponse({"result": "신고 실패", "error": error_msg}, status_code=400, headers=h)
-
-            is_normal = 0   # 0=파손
-            repair_status = 0  # 0=대기
-
-            # RETURNING용 바인드 변수 (권장 타입 상수 사용)
-            out_report_id = cur.var(oracledb.DB_TYPE_NUMBER)
-
-            # 컬럼명과 다른 바인드 이름 사용 (p_*, out_*)
-            sql_reports = """
-                INSERT INTO Reports (
-                    user_id, photo_url, location_description, latitude, longitude,
-                    report_date, details, is_normal, repair_status
-                ) VALUES (
-                    :p_user_id, :p_photo_url, :p_location_description, :p_latitude, :p_longitude,
-                    :p_report_date, :p_details, :p_is_normal, :p_repair_status
-                )
-                RETURNING report_id INTO :out_report_id
-            """
-            cur.execute(sql_reports, {
-                "p_user_id": user_id,
-                "p_photo_url": photo_url_for_db,
-                "p_location_description": location_description,
-                "p_latitude": latitude,
-                "p_longitude": longitude,
-                "p_report_date": parsed_report_date,
-                "p_details": details,
-                "p_is_normal": is_normal,
-                "p_repair_status": repair_status,
-                "out_report_id": out_report_id,
-            })
-            report_id = int(out_report_id.getvalue()[0])
-
-            # Maintenance_Status INSERT (초기 상태 '접수')
-            sql_ms = """
-                INSERT INTO Maintenance_Status (
-                    status_id, report_id, current_status, damage_info_details, facility_type, manager_nickname, manager_comments, last_updated_date
-                ) VALUES (
-                    maintenance_status_seq.NEXTVAL, :p_report_id, '접수', NULL, NULL, NULL, NULL, SYSTIMESTAMP
-                )
-            """
-            cur.execute(sql_ms, {"p_report_id": report_id})
-
-            # 신고 성공 시 사용자 점수 +10 (동일 트랜잭션)
-            # USERS 테이블이 실제 테이블인 것이 맞다고 하셨으므로 그대로 사용
-            cur.execute("""
-                UPDATE USERS
-                SET SCORE = NVL(SCORE, 0) + 10
-                WHERE USER_ID = :p_uid
-            """, {"p_uid": user_id})
-
-            # 변경된 점수 조회
-            cur.execute("SELECT NVL(SCORE, 0) FROM USERS WHERE USER_ID = :p_uid", {"p_uid": user_id})
-            row = cur.fetchone()
-            new_score = int(row[0]) if row and row[0] is not None else None
-
-            con.commit()
-            print("INFO: 신고 등록 + 상태 초기화 + 점수 반영 커밋 성공.")
-            return JSONResponse({
-                "result": "신고 등록 성공",
-                "report_id": report_id,
-                "photo_url": photo_url_for_db,
-                "new_score": new_score
-            }, status_code=200, headers=h)
+                    parsed_report_date = datetime.strptime(report_date, "%Y-%m-%d %H:%M:%S")
+                except ValueError:
+                    try:
+                        date_only = datetime.strptime(report_date, "%Y-%m-%d")
+                        now_time = datetime.now().time()
+                        parsed_report_date = datetime.combine(date_only.date(), now_time)
+                    except ValueError as ve:
+                        error_msg = f"날짜 형식 오류: {report_date} - {ve}"
+                        print(f"ERROR: {error_msg}")
+                        return JSONResponse({"result": "신고 실패", "error": error_msg}, status_code=400, headers=h)
+
+                is_normal = 0   # 0=파손
+                repair_status = 0  # 0=대기
+
+                # 중복 신고 판별 (사진 해시 계산은 디코딩이 있으므로 스레드에서)
+                if REPORT_DEDUP and _reportColumns is None:
+                    await cur.execute(_SQL_REPORT_COLUMNS)
+                    _setReportColumns(await cur.fetchall())
+                dedup = _dedupReady()
+                photo_hash, duplicate_of, report_ts = None, None, parsed_report_date.timestamp()
+                if dedup:
+                    photo_hash = await asyncio.to_thread(SsyImageHash.dHash, content)
+                    dup = reportDedup.find(latitude, longitude, photo_hash, report_ts)
+                    if dup:
+                        duplicate_of = int(dup[0])
+                        print(f"INFO: 중복 신고 판정 → 원본 #{duplicate_of} (거리 {dup[1]:.0f}m, 해시 차이 {dup[2]})")
+
+                # RETURNING용 바인드 변수 (권장 타입 상수 사용)
+                out_report_id = cur.var(oracledb.DB_TYPE_NUMBER)
+
+                # 컬럼명과 다른 바인드 이름 사용 (p_*, out_*)
+                values = {
+                    "user_id": user_id,
+                    "photo_url": photo_url_for_db,
+                    "location_description": location_description,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "report_date": parsed_report_date,
+                    "details": details,
+                    "is_normal": is_normal,
+                    "repair_status": repair_status,
+                }
+                if dedup:
+                    values["photo_dhash"] = photo_hash
+                    values["duplicate_of"] = duplicate_of
+                    if duplicate_of:
+                        # 중복은 AI 분석을 하지 않으므로 밀린 분석(getPendingAIReports)에도 잡히지 않게 상태를 채워 둠
+                        values["ai_status"] = f"중복:#{duplicate_of}"
+                        if "AI_STATE" in _reportColumns:
+                            values["ai_state"] = "done"
+                binds = {f"p_{k}": v for k, v in values.items()}
+                binds["out_report_id"] = out_report_id
+                await cur.execute(_reportInsertSql(list(values)), binds)
+                report_id = int(out_report_id.getvalue()[0])
+
+                # Maintenance_Status INSERT (초기 상태 '접수')
+                sql_ms = """
+                    INSERT INTO Maintenance_Status (
+                        status_id, report_id, current_status, damage_info_details, facility_type, manager_nickname, manager_comments, last_updated_date
+                    ) VALUES (
+                        maintenance_status_seq.NEXTVAL, :p_report_id, '접수', NULL, NULL, NULL, NULL, SYSTIMESTAMP
+                    )
+                """
+                await cur.execute(sql_ms, {"p_report_id": report_id})
+
+                # 신고 성공 시 사용자 점수 +10 (동일 트랜잭션, 중복 신고는 제외)
+                # USERS 테이블이 실제 테이블인 것이 맞다고 하셨으므로 그대로 사용
+                # 변경된 점수는 RETURNING으로 같이 받음 (점수가 그대로인 중복 신고만 따로 조회)
+                if not duplicate_of:
+                    o_score = cur.var(oracledb.DB_TYPE_NUMBER)
+                    await cur.execute("""
+                        UPDATE USERS
+                        SET SCORE = NVL(SCORE, 0) + 10
+                        WHERE USER_ID = :p_uid
+                        RETURNING SCORE INTO :o_score
+                    """, {"p_uid": user_id, "o_score": o_score})
+                    scores = o_score.getvalue()
+                    new_score = int(scores[0]) if scores and scores[0] is not None else None
+                else:
+                    await cur.execute("SELECT NVL(SCORE, 0) FROM USERS WHERE USER_ID = :p_uid", {"p_uid": user_id})
+                    row = await cur.fetchone()
+                    new_score = int(row[0]) if row and row[0] is not None else None
+
+                await con.commit()
+                reportIndex.add(report_id, latitude, longitude)
+                reportDedup.add(report_id, photo_hash, report_ts, duplicate_of)
+                rankingBoard.setScore(user_id, new_score)
+                responseCache.invalidate("reports", "ranking")
+                print("INFO: 신고 등록 + 상태 초기화 + 점수 반영 커밋 성공.")
+                return JSONResponse({
+                    "result": "신고 등록 성공",
+                    "report_id": report_id,
+                    "photo_url": photo_url_for_db,
+                    "new_score": new_score,
+                    "duplicate_of": duplicate_of
+                }, status_code=200, headers=h)
 
         except Exception as e:
-            if con:
-                con.rollback()
             if filename and file_path and os.path.exists(file_path):
                 try:
                     os.remove(file_path)
@@ -169,238 +354,205 @@ class RegistrationDAO:
             error_msg = f"신고 등록 DB 오류 발생: {str(e)}"
             print(f"ERROR: {error_msg}")
             return JSONResponse({"result": "신고 실패", "error": error_msg}, status_code=500, headers=h)
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
 
     # ----------------------------------------------------------------------
-    # 상태 포함 전체 목록 조회
+    # 상태 포함 전체 목록 조회 (limit/cursor를 주면 keyset 페이지네이션)
     # ----------------------------------------------------------------------
-    def getAllRegistrations(self):
+    def _registrationPage(self, rows, limit):
+        if limit is None:
+            return {"result": "조회 성공", "data": [_registration_row(r) for r in rows]}
+        rows, next_cursor = SsyPageCursor.cutReportPage(rows, limit, dateIdx=6, idIdx=0)
+        return {"result": "조회 성공", "data": [_registration_row(r) for r in rows], "next_cursor": next_cursor}
+
+    def getAllRegistrations(self, limit: t.Optional[int] = None, cursor: t.Optional[str] = None):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT
-                    r.report_id,
-                    r.user_id,
-                    r.photo_url,
-                    r.location_description,
-                    r.latitude,
-                    r.longitude,
-                    r.report_date,
-                    r.details,
-                    r.is_normal,
-                    r.repair_status,
-                    m.status_id,
-                    m.current_status,
-                    m.manager_nickname,
-                    m.manager_comments,
-                    m.last_updated_date
-                FROM Reports r
-                LEFT JOIN Maintenance_Status m
-                  ON m.report_id = r.report_id
-                ORDER BY r.report_date DESC
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-
-            def lob_to_text(x):
-                if hasattr(x, 'read'):
-                    x = x.read()
-                    if isinstance(x, bytes):
-                        x = x.decode('utf-8', errors='ignore')
-                return x
-
-            def dt2str(x):
-                return x.strftime("%Y-%m-%d %H:%M:%S") if hasattr(x, "strftime") else None
-
-            result = []
-            for r in rows:
-                result.append({
-                    "report_id": r[0],
-                    "user_id": r[1],
-                    "photo_url": r[2],
-                    "location_description": r[3],
-                    "latitude": r[4],
-                    "longitude": r[5],
-                    "report_date": dt2str(r[6]),
-                    "details": lob_to_text(r[7]),
-                    "is_normal": int(r[8]) if r[8] is not None else None,
-                    "repair_status": int(r[9]) if r[9] is not None else 0,
-                    "maintenance": {
-                        "status_id": r[10],
-                        "current_status": r[11],
-                        "manager_nickname": r[12],
-                        "manager_comments": lob_to_text(r[13]),
-                        "last_updated_date": dt2str(r[14]),
-                    }
-                })
-            return {"result": "조회 성공", "data": result}
+            limit = SsyPageCursor.pageLimit(limit, cursor)
+            sql, params = SsyPageCursor.reportQuery(_SQL_ALL_REGISTRATIONS, cursor, limit)
+            with SsyDBManager.conCur() as (con, cur):
+                if limit is not None:
+                    SsyPageCursor.tune(cur, limit)
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+                return self._registrationPage(rows, limit)
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            return {"result": "조회 실패", "error": str(e)}
+
+    async def getAllRegistrationsAsync(self, limit: t.Optional[int] = None, cursor: t.Optional[str] = None):
+        try:
+            limit = SsyPageCursor.pageLimit(limit, cursor)
+            sql, params = SsyPageCursor.reportQuery(_SQL_ALL_REGISTRATIONS, cursor, limit)
+            async with SsyAsyncDBManager.conCur() as (con, cur):
+                if limit is not None:
+                    SsyPageCursor.tune(cur, limit)
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                return self._registrationPage(rows, limit)
         except Exception as e:
             print(f"ERROR: {str(e)}")
             return {"result": "조회 실패", "error": str(e)}
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
 
     # ----------------------------------------------------------------------
     # 지도/마커용
     # ----------------------------------------------------------------------
     def getAllDamageReportLocations(self):
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-            SELECT r.report_id, r.latitude, r.longitude, r.location_description,
-                   r.details, r.photo_url, r.report_date, r.user_id, r.repair_status
-            FROM Reports r
-            WHERE r.latitude IS NOT NULL AND r.longitude IS NOT NULL
-            ORDER BY r.report_date DESC
-            """
-            cur.execute(sql)
-            results = cur.fetchall()
-
-            def lob_to_text(x):
-                if hasattr(x, 'read'):
-                    x = x.read()
-                    if isinstance(x, bytes):
-                        x = x.decode('utf-8', errors='ignore')
-                return x
-
-            processed_results = []
-            for row in results:
-                processed_results.append({
-                    "report_id": row[0],
-                    "latitude": row[1],
-                    "longitude": row[2],
-                    "address": row[3] or "주소 없음",
-                    "details": lob_to_text(row[4]) or "내용 없음",
-                    "photo_url": row[5],
-                    "date": row[6].strftime("%Y-%m-%d") if row[6] else "날짜 없음",
-                    "nickname": row[7] or "익명",
-                    "repair_status": int(row[8]) if row[8] is not None else 0,
-                })
-            return processed_results
+            with SsyDBManager.conCur() as (con, cur):
+                sql = """
+                SELECT r.report_id, r.latitude, r.longitude, r.location_description,
+                       r.details, r.photo_url, r.report_date, r.user_id, r.repair_status
+                FROM Reports r
+                WHERE r.latitude IS NOT NULL AND r.longitude IS NOT NULL
+                ORDER BY r.report_date DESC
+                """
+                cur.execute(sql)
+                results = cur.fetchall()
+
+                processed_results = []
+                for row in results:
+                    processed_results.append({
+                        "report_id": row[0],
+                        "latitude": row[1],
+                        "longitude": row[2],
+                        "address": row[3] or "주소 없음",
+                        "details": SsyRowMapper.toText(row[4]) or "내용 없음",
+                        "photo_url": row[5],
+                        "date": SsyRowMapper.dt2str(row[6], "%Y-%m-%d") or "날짜 없음",
+                        "nickname": row[7] or "익명",
+                        "repair_status": int(row[8]) if row[8] is not None else 0,
+                    })
+                return processed_results
 
         except Exception as e:
             print(f"ERROR in getAllDamageReportLocations: {e}")
             return None
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
+
+    # ----------------------------------------------------------------------
+    # 주변 신고 조회용 공간 인덱스
+    # ----------------------------------------------------------------------
+    def loadReportIndex(self):
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                cur.arraysize = 5000
+                cur.execute("""
+                    SELECT report_id, latitude, longitude
+                    FROM Reports
+                    WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+                """)
+                reportIndex.load(cur)
+                print(f"INFO: 신고 공간 인덱스 로드 완료 ({len(reportIndex)}건)")
+                if REPORT_DEDUP and _reportColumns is None:
+                    cur.execute(_SQL_REPORT_COLUMNS)
+                    _setReportColumns(cur.fetchall())
+                if _dedupReady():
+                    # 중복 판별은 최근 window 안의 신고만 필요
+                    cur.execute("""
+                        SELECT report_id, photo_dhash, report_date, duplicate_of
+                        FROM Reports
+                        WHERE photo_dhash IS NOT NULL AND report_date > SYSDATE - :p_hours / 24
+                    """, {"p_hours": reportDedup.windowSec / 3600})
+                    reportDedup.load((r[0], r[1], r[2].timestamp(), r[3]) for r in cur)
+                    print(f"INFO: 중복 신고 인덱스 로드 완료 ({len(reportDedup)}건)")
+                return len(reportIndex)
+        except Exception as e:
+            print(f"ERROR in loadReportIndex: {e}")
+            return 0
+
+    def getNearbyReports(self, lat: float, lng: float, radius_m: float, limit: int = 100):
+        # DB를 거치지 않고 인덱스에서 바로 조회
+        h = {"Access-Control-Allow-Origin": "*"}
+        found = reportIndex.nearby(lat, lng, radius_m, limit)
+        result = []
+        for report_id, dist in found:
+            plat, plng = reportIndex.get(report_id) or (None, None)
+            result.append({
+                "report_id": report_id,
+                "latitude": plat,
+                "longitude": plng,
+                "distance_m": round(dist, 1),
+            })
+        return JSONResponse({"result": "조회 성공", "count": len(result), "reports": result}, headers=h)
 
     # ----------------------------------------------------------------------
     # 사용자별 목록 + 상태 동시 조회
     # ----------------------------------------------------------------------
-    def getUserReports(self, user_id):
+    def _userReportPage(self, rows, limit):
+        if limit is None:
+            return {"result": "조회 성공", "reports": [_user_report_row(r) for r in rows]}
+        rows, next_cursor = SsyPageCursor.cutReportPage(rows, limit, dateIdx=6, idIdx=0)
+        return {"result": "조회 성공", "reports": [_user_report_row(r) for r in rows], "next_cursor": next_cursor}
+
+    def getUserReports(self, user_id, limit: t.Optional[int] = None, cursor: t.Optional[str] = None):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT
-                    r.report_id,
-                    r.user_id,
-                    r.photo_url,
-                    r.location_description,
-                    r.latitude,
-                    r.longitude,
-                    r.report_date,
-                    r.details,
-                    r.is_normal,
-                    r.repair_status,
-                    m.current_status,
-                    m.last_updated_date
-                FROM Reports r
-                LEFT JOIN Maintenance_Status m
-                  ON m.report_id = r.report_id
-                WHERE r.user_id = :user_id
-                ORDER BY r.report_date DESC
-            """
-            cur.execute(sql, {"user_id": user_id})
-            rows = cur.fetchall()
-
-            def lob_to_text(x):
-                if hasattr(x, "read"):
-                    x = x.read()
-                    if isinstance(x, bytes):
-                        x = x.decode("utf-8", errors="ignore")
-                return x
-
-            def dt2str(x):
-                return x.strftime("%Y-%m-%d %H:%M:%S") if hasattr(x, "strftime") else None
-
-            result = []
-            for r in rows:
-                result.append({
-                    "report_id": r[0],
-                    "user_id": r[1],
-                    "photo_url": r[2],
-                    "location_description": r[3],
-                    "latitude": r[4],
-                    "longitude": r[5],
-                    "report_date": dt2str(r[6]),
-                    "details": lob_to_text(r[7]),
-                    "is_normal": int(r[8]) if r[8] is not None else None,
-                    "repair_status": int(r[9]) if r[9] is not None else 0,
-                    "current_status": r[10],
-                    "last_updated_date": dt2str(r[11]),
-                })
-            return {"result": "조회 성공", "reports": result}
+            limit = SsyPageCursor.pageLimit(limit, cursor)
+            sql, params = SsyPageCursor.reportQuery(_SQL_USER_REPORTS, cursor, limit,
+                                                    filters=["r.user_id = :user_id"], params={"user_id": user_id})
+            with SsyDBManager.conCur() as (con, cur):
+                if limit is not None:
+                    SsyPageCursor.tune(cur, limit)
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+                return self._userReportPage(rows, limit)
 
         except Exception as e:
             print(f"ERROR in getUserReports: {str(e)}")
             return {"result": "조회 실패", "error": str(e)}
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
+
+    async def getUserReportsAsync(self, user_id, limit: t.Optional[int] = None, cursor: t.Optional[str] = None):
+        try:
+            limit = SsyPageCursor.pageLimit(limit, cursor)
+            sql, params = SsyPageCursor.reportQuery(_SQL_USER_REPORTS, cursor, limit,
+                                                    filters=["r.user_id = :user_id"], params={"user_id": user_id})
+            async with SsyAsyncDBManager.conCur() as (con, cur):
+                if limit is not None:
+                    SsyPageCursor.tune(cur, limit)
+                await cur.execute(sql, params)
+                rows = await cur.fetchall()
+                return self._userReportPage(rows, limit)
+
+        except Exception as e:
+            print(f"ERROR in getUserReportsAsync: {str(e)}")
+            return {"result": "조회 실패", "error": str(e)}
 
     # ----------------------------------------------------------------------
     # 유저 신고 삭제/단건 조회
     # ----------------------------------------------------------------------
     def get_report_by_id(self, report_id: int):
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            cur.execute("SELECT * FROM REPORTS WHERE REPORT_ID = :id", {"id": report_id})
-            row = cur.fetchone()
-            if row:
-                return {
-                    "report_id": row[0],
-                    "user_id": row[1],
-                    "location_description": row[2],
-                }
-            return None
+            with SsyDBManager.conCur() as (con, cur):
+                cur.execute("SELECT * FROM REPORTS WHERE REPORT_ID = :id", {"id": report_id})
+                row = cur.fetchone()
+                if row:
+                    return {
+                        "report_id": row[0],
+                        "user_id": row[1],
+                        "location_description": row[2],
+                    }
+                return None
         except Exception as e:
             print("DB 오류:", e)
             return None
-        finally:
-            if con and cur:
-                SsyDBManager.closeConCur(con, cur)
 
     def delete_report_by_id(self, report_id: int):
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
+            with SsyDBManager.conCur() as (con, cur):
 
-            # 1) 자식 테이블 먼저 삭제
-            cur.execute("DELETE FROM Maintenance_Status WHERE report_id = :id", {"id": report_id})
+                # 1) 자식 테이블 먼저 삭제
+                cur.execute("DELETE FROM Maintenance_Status WHERE report_id = :id", {"id": report_id})
 
-            # 2) 부모 테이블 삭제
-            cur.execute("DELETE FROM Reports WHERE report_id = :id", {"id": report_id})
+                # 2) 부모 테이블 삭제
+                cur.execute("DELETE FROM Reports WHERE report_id = :id", {"id": report_id})
 
-            con.commit()
-            return True
+                con.commit()
+                reportIndex.remove(report_id)
+                reportDedup.remove(report_id)
+                responseCache.invalidate("reports")
+                return True
         except Exception as e:
-            if con:
-                con.rollback()
             print("삭제 실패:", e)
             return False
-        finally:
-            if con and cur:
-                SsyDBManager.closeConCur(con, cur)
 
     # ----------------------------------------------------------------------
     # 수리 상태 변경 API용 메서드
@@ -413,171 +565,251 @@ class RegistrationDAO:
         if repair_status not in (0, 1):
             return JSONResponse({"result": "bad request", "error": "repair_status must be 0 or 1"},
                                 status_code=400, headers=h)
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            cur.execute("""
-                UPDATE Reports
-                SET repair_status = :st
-                WHERE report_id = :rid
-            """, {"st": repair_status, "rid": report_id})
-            if cur.rowcount == 0:
-                return JSONResponse({"result": "not found"}, status_code=404, headers=h)
-            con.commit()
-            return JSONResponse({"result": "ok", "report_id": report_id, "repair_status": repair_status}, headers=h)
+            with SsyDBManager.conCur() as (con, cur):
+                cur.execute("""
+                    UPDATE Reports
+                    SET repair_status = :st
+                    WHERE report_id = :rid
+                """, {"st": repair_status, "rid": report_id})
+                if cur.rowcount == 0:
+                    return JSONResponse({"result": "not found"}, status_code=404, headers=h)
+                con.commit()
+                responseCache.invalidate("reports")
+                return JSONResponse({"result": "ok", "report_id": report_id, "repair_status": repair_status}, headers=h)
         except Exception as e:
-            if con: con.rollback()
             return JSONResponse({"result": "DB 오류", "error": str(e)}, status_code=500, headers=h)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
+
+    # 조건부 응답(ETag)용 버전: Reports / Maintenance_Status 각각 행 수 + MAX(ORA_ROWSCN)
+    # (행을 가져오지 않고 집계 한 줄만 읽음, 조회 실패 시 None)
+    def getReportsVersion(self):
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                cur.execute("""
+                    SELECT (SELECT COUNT(*) FROM Reports),
+                           (SELECT MAX(ORA_ROWSCN) FROM Reports),
+                           (SELECT COUNT(*) FROM Maintenance_Status),
+                           (SELECT MAX(ORA_ROWSCN) FROM Maintenance_Status)
+                    FROM dual
+                """)
+                return ":".join(str(v) for v in cur.fetchone())
+        except Exception as e:
+            print(f"ERROR in getReportsVersion: {e}")
+            return None
+
+    # 신고 한 건의 버전 (없는 신고면 None → ETag 없이 일반 조회)
+    def getReportVersion(self, report_id: int):
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                cur.execute("SELECT ORA_ROWSCN FROM Reports WHERE report_id = :rid", {"rid": report_id})
+                row = cur.fetchone()
+                return str(row[0]) if row else None
+        except Exception as e:
+            print(f"ERROR in getReportVersion: {e}")
+            return None
 
     # (아래 두 개는 프로젝트에 이미 중복 정의가 있었는데, REPORTS 기준 버전만 남기는 것을 권장)
-    def getAllReportsForAdmin(self):
+    def getAllReportsForAdmin(self, limit: t.Optional[int] = None, cursor: t.Optional[str] = None):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT REPORT_ID, LOCATION_DESCRIPTION, REPORT_DATE, USER_ID, 
-                       IS_NORMAL, REPAIR_STATUS, PHOTO_URL
-                FROM REPORTS 
-                ORDER BY REPORT_DATE DESC
-            """
-            cur.execute(sql)
-            report_list = []
-            for r_id, loc, date, u_id, is_norm, rep_stat, p_url in cur:
-                report_list.append({
-                    "id": r_id,
-                    "location": loc,
-                    "date": date.strftime("%Y-%m-%d") if date else None,
-                    "user_id": u_id,
-                    "is_normal": is_norm,
-                    "repair_status": rep_stat,
-                    "photo_url": p_url
-                })
-            return JSONResponse(report_list, headers=h)
+            limit = SsyPageCursor.pageLimit(limit, cursor)
+            sql, params = SsyPageCursor.reportQuery("""
+                SELECT r.REPORT_ID, r.LOCATION_DESCRIPTION, r.REPORT_DATE, r.USER_ID, 
+                       r.IS_NORMAL, r.REPAIR_STATUS, r.PHOTO_URL
+                FROM REPORTS r
+                {where}
+                ORDER BY r.REPORT_DATE DESC, r.REPORT_ID DESC
+                {fetch}
+            """, cursor, limit)
+            with SsyDBManager.conCur() as (con, cur):
+                if limit is not None:
+                    SsyPageCursor.tune(cur, limit)
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+                next_cursor = None
+                if limit is not None:
+                    rows, next_cursor = SsyPageCursor.cutReportPage(rows, limit, dateIdx=2, idIdx=0)
+                report_list = []
+                for r_id, loc, date, u_id, is_norm, rep_stat, p_url in rows:
+                    report_list.append({
+                        "id": r_id,
+                        "location": loc,
+                        "date": SsyRowMapper.dt2str(date, "%Y-%m-%d"),
+                        "user_id": u_id,
+                        "is_normal": is_norm,
+                        "repair_status": rep_stat,
+                        "photo_url": p_url
+                    })
+                # 배열 응답 형태를 유지하기 위해 다음 커서는 헤더로 전달
+                if next_cursor:
+                    h.update({"X-Next-Cursor": next_cursor, "Access-Control-Expose-Headers": "X-Next-Cursor"})
+                return JSONResponse(report_list, headers=h)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400, headers=h)
         except Exception as e:
             print(f"ERROR in getAllReportsForAdmin: {e}") 
             return JSONResponse({"error": f"DB 오류: {e}"}, status_code=500, headers=h)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
 
     def getReportDetailsById(self, report_id):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = "SELECT * FROM REPORTS WHERE REPORT_ID = :1"
-            cur.execute(sql, [report_id])
-            column_names = [desc[0].lower() for desc in cur.description]
-            row = cur.fetchone()
-
-            if not row:
-                return JSONResponse({"error": "Report not found"}, status_code=404, headers=h)
+            with SsyDBManager.conCur() as (con, cur):
+                sql = "SELECT * FROM REPORTS WHERE REPORT_ID = :1"
+                cur.execute(sql, [report_id])
+                # 모든 컬럼을 컬럼 타입 기준으로 JSON 직렬화 가능 타입으로 변환
+                data = SsyRowMapper.fetchOneDict(cur)
 
-            # 모든 컬럼을 JSON 직렬화 가능 타입으로 변환
-            data = {col: _normalize_for_json(val) for col, val in zip(column_names, row)}
-            return JSONResponse(data, headers=h)
+                if not data:
+                    return JSONResponse({"error": "Report not found"}, status_code=404, headers=h)
+                return JSONResponse(data, headers=h)
 
         except Exception as e:
             print(f"ERROR in getReportDetailsById: {e}")
             return JSONResponse({"error": f"DB 오류: {e}"}, status_code=500, headers=h)
-        finally:
-            if cur:
-                SsyDBManager.closeConCur(con, cur)
 
     def updateReportStatuses(self, report_id, is_normal, repair_status):
         h = {"Access-Control-Allow-Origin": "*"}
-        con, cur = None, None
         try:
-            con, cur = SsyDBManager.makeConCur()
-            sql = """
-                SELECT IS_NORMAL FROM REPORTS WHERE REPORT_ID = :report_id
-            """
-            cur.execute(sql, {"report_id": report_id})
-            row = cur.fetchone()
-            if row and row[0] == 0 and is_normal == 1:
+            with SsyDBManager.conCur() as (con, cur):
                 sql = """
-                    UPDATE USERS 
-                    SET SCORE = NVL(SCORE, 0) - 10
-                    WHERE USER_ID = (SELECT USER_ID FROM REPORTS WHERE REPORT_ID = :report_id)
+                    SELECT IS_NORMAL FROM REPORTS WHERE REPORT_ID = :report_id
                 """
                 cur.execute(sql, {"report_id": report_id})
-            elif row and row[0] == 1 and is_normal == 0:
+                row = cur.fetchone()
+                # 변경된 사용자/점수는 RETURNING으로 받아 랭킹 인덱스에 반영
+                o_uid, o_score = cur.var(str), cur.var(int)
+                scored = False
+                if row and row[0] == 0 and is_normal == 1:
+                    sql = """
+                        UPDATE USERS 
+                        SET SCORE = NVL(SCORE, 0) - 10
+                        WHERE USER_ID = (SELECT USER_ID FROM REPORTS WHERE REPORT_ID = :report_id)
+                        RETURNING USER_ID, SCORE INTO :o_uid, :o_score
+                    """
+                    cur.execute(sql, {"report_id": report_id, "o_uid": o_uid, "o_score": o_score})
+                    scored = cur.rowcount > 0
+                elif row and row[0] == 1 and is_normal == 0:
+                    sql = """
+                        UPDATE USERS 
+                        SET SCORE = NVL(SCORE, 0) + 10
+                        WHERE USER_ID = (SELECT USER_ID FROM REPORTS WHERE REPORT_ID = :report_id)
+                        RETURNING USER_ID, SCORE INTO :o_uid, :o_score
+                    """
+                    cur.execute(sql, {"report_id": report_id, "o_uid": o_uid, "o_score": o_score})
+                    scored = cur.rowcount > 0
+            
                 sql = """
-                    UPDATE USERS 
-                    SET SCORE = NVL(SCORE, 0) + 10
-                    WHERE USER_ID = (SELECT USER_ID FROM REPORTS WHERE REPORT_ID = :report_id)
+                    UPDATE REPORTS 
+                    SET IS_NORMAL = :is_normal, REPAIR_STATUS = :repair_status
+                    WHERE REPORT_ID = :report_id
                 """
-                cur.execute(sql, {"report_id": report_id})
-            
-            sql = """
-                UPDATE REPORTS 
-                SET IS_NORMAL = :is_normal, REPAIR_STATUS = :repair_status
-                WHERE REPORT_ID = :report_id
-            """
-            cur.execute(sql, {"is_normal": is_normal, "repair_status": repair_status, "report_id": report_id})
-            con.commit()
-
-            if cur.rowcount > 0:
-                return JSONResponse({'result': 'success'}, headers=h)
-            else:
-                return JSONResponse({'error': 'Update failed or report not found'}, status_code=404, headers=h)
+                cur.execute(sql, {"is_normal": is_normal, "repair_status": repair_status, "report_id": report_id})
+                con.commit()
+                if scored:
+                    rankingBoard.setScore(o_uid.getvalue()[0], o_score.getvalue()[0])
+                responseCache.invalidate("reports", "ranking")
+
+                if cur.rowcount > 0:
+                    return JSONResponse({'result': 'success'}, headers=h)
+                else:
+                    return JSONResponse({'error': 'Update failed or report not found'}, status_code=404, headers=h)
         except Exception as e:
             return JSONResponse({'error': f"DB 오류: {e}"}, status_code=500, headers=h)
-        finally:
-            if cur and con: SsyDBManager.closeConCur(con, cur)
 
-    # 4. 신고 상태 업데이트 (ai_status만 변경)
-    def updateAIStatus(self, report_id: int, status: str):
-        con, cur = None, None
-        try:
-            con, cur = SsyDBManager.makeConCur()
-            cur.execute(
-                "UPDATE Reports SET ai_status=:st WHERE report_id=:rid",
-                {"st": status, "rid": report_id}
-            )
-            con.commit()
-
-        except Exception as e:
-            if con: con.rollback()
-            print("updateAIStatus error:", e)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
-
-    # 5. AI 결과 업데이트
-    def updateAIResults(self, report_id: int, ai_status: str,
-                        caption_en: t.Optional[str], caption_ko: t.Optional[str],
-                        mask_url: t.Optional[str]) -> None:
-        con, cur = None, None
+    # 4. AI 분석이 밀린 신고 (ai_state가 queued, include_failed면 failed도) → [(report_id, photo_url), ...]
+    # 방금 등록되어 job이 처리 중일 수 있는 신고는 older_than_min분 지난 것만
+    def getPendingAIReports(self, limit: int = 100, include_failed: bool = False, older_than_min: int = 10):
         try:
-            con, cur = SsyDBManager.makeConCur()
-           
-            cur.execute("""
-                UPDATE Reports
-                   SET ai_status = :st,
-                       caption_en = :cen,
-                       caption_ko = :cko,
-                       mask_url   = :murl
-                 WHERE report_id = :rid
-            """, {
-                "st": ai_status,
-                "cen": caption_en,
-                "cko": caption_ko,
-                "murl": mask_url,
-                "rid": report_id
-            })
-            # ai_status가 '정상'으로 끝나면 is_normal을 1로 변경
-            if ai_status and ai_status.strip().endswith("정상"):
-                cur.execute("""
-                    UPDATE Reports SET is_normal=1 WHERE report_id=:rid
-                """, {"rid": report_id})
+            with SsyDBManager.conCur() as (con, cur):
                 cur.execute("""
-                    UPDATE USERS SET SCORE = NVL(SCORE, 0) - 10 WHERE USER_ID = (SELECT USER_ID FROM REPORTS WHERE REPORT_ID = :rid)
-                """,{"rid": report_id})
+                    SELECT report_id, photo_url
+                    FROM Reports
+                    WHERE (NVL(ai_state, 'queued') = 'queued' OR (:p_failed = 1 AND ai_state = 'failed'))
+                      AND report_date < SYSDATE - :p_min / 1440
+                    ORDER BY report_id
+                    FETCH FIRST :p_lim ROWS ONLY
+                """, {"p_failed": 1 if include_failed else 0, "p_min": older_than_min, "p_lim": int(limit)})
+                return [(int(r[0]), r[1]) for r in cur.fetchall()]
+        except Exception as e:
+            print("getPendingAIReports error:", e)
+            return []
+
+    # 5. AI 분석 상태 전이 (ImageAiDAO에서 사용, 신고 한 건당 커넥션 1개 / 트랜잭션 1개 / 왕복 1번씩)
+    #   beginAIAnalysis → (AI 호출) → saveAIResult 또는 saveAIFailure
+    #   DB 오류는 그대로 던진다 (job 워커가 재시도, done 조건 덕분에 재시도해도 안전)
+    def beginAIAnalysis(self, report_id: int) -> bool:
+        """processing으로 전이. 이미 done이면 False (분석할 필요 없음)"""
+        with SsyDBManager.conCur() as (con, cur):
+            o_n = cur.var(int)
+            cur.execute(_SQL_AI_BEGIN, {"rid": report_id, "o_n": o_n})
+            started = bool(o_n.getvalue())
+        if started:
+            responseCache.invalidate("reports")
+            eventBroker.publish(f"report:{report_id}", {"type": "ai_status", "report_id": report_id, "ai_status": "processing"})
+        return started
+
+    def beginAIAnalysisBatch(self, report_ids: t.List[int]) -> t.Set[int]:
+        """여러 건을 한 번에 processing으로 (executemany 1번 + commit 1번) → 전이된 report_id 집합"""
+        if not report_ids:
+            return set()
+        with SsyDBManager.conCur() as (con, cur):
+            cur.executemany("""
+                UPDATE Reports SET ai_state = 'processing', ai_status = 'processing'
+                 WHERE report_id = :rid AND NVL(ai_state, 'queued') <> 'done'
+            """, [{"rid": rid} for rid in report_ids], arraydmlrowcounts=True)
+            counts = cur.getarraydmlrowcounts()
             con.commit()
+        started = {rid for rid, n in zip(report_ids, counts) if n}
+        if started:
+            responseCache.invalidate("reports")
+            for rid in started:
+                eventBroker.publish(f"report:{rid}", {"type": "ai_status", "report_id": rid, "ai_status": "processing"})
+        return started
+
+    def saveAIResult(self, report_id: int, ai_status: str, caption_en: t.Optional[str],
+                     caption_ko: t.Optional[str], mask_url: t.Optional[str]) -> bool:
+        """
+        결과 컬럼 + ai_state='done' + ('정상'이면) is_normal=1, 신고자 점수 -10 을 한 블록/한 트랜잭션으로.
+        이미 done이면 아무것도 바꾸지 않고 False
+        """
+        normal = 1 if ai_status and ai_status.strip().endswith("정상") else 0
+        with SsyDBManager.conCur() as (con, cur):
+            o_n, o_uid, o_score = cur.var(int), cur.var(str), cur.var(int)
+            cur.execute(_SQL_AI_SAVE, {
+                "rid": report_id, "st": ai_status, "cen": caption_en, "cko": caption_ko, "murl": mask_url,
+                "normal": normal, "o_n": o_n, "o_uid": o_uid, "o_score": o_score,
+            })
+            saved = bool(o_n.getvalue())
+        if not saved:
+            return False
+        event = {
+            "type": "ai_result",
+            "report_id": report_id,
+            "ai_status": ai_status,
+            "caption_en": caption_en,
+            "caption_ko": caption_ko,
+            "mask_url": mask_url,
+        }
+        if normal and o_score.getvalue() is not None:
+            rankingBoard.setScore(o_uid.getvalue(), o_score.getvalue())
+            # 워커 프로세스에서 바뀐 점수를 웹 서버 랭킹 보드에도 반영하도록 같이 보냄
+            event["user_id"], event["score"] = o_uid.getvalue(), o_score.getvalue()
+        responseCache.invalidate("reports", "ranking")
+        eventBroker.publish(f"report:{report_id}", event)
+        eventBroker.publish(f"report:{report_id}", {"type": "ai_status", "report_id": report_id, "ai_status": ai_status})
+        return True
+
+    def saveAIFailure(self, report_id: int, status: str) -> bool:
+        """failed로 전이 (이미 done이면 결과를 덮어쓰지 않음). 실패 기록 자체의 오류는 로그만"""
+        try:
+            with SsyDBManager.conCur() as (con, cur):
+                o_n = cur.var(int)
+                cur.execute(_SQL_AI_FAIL, {"rid": report_id, "st": status, "o_n": o_n})
+                failed = bool(o_n.getvalue())
         except Exception as e:
-            if con: con.rollback()
-            print("updateAIResults error:", e)
-        finally:
-            if cur: SsyDBManager.closeConCur(con, cur)
\ No newline at end of file
+            print("saveAIFailure error:", e)
+            return False
+        if failed:
+            responseCache.invalidate("reports")
+            eventBroker.publish(f"report:{report_id}", {"type": "ai_status", "report_id": report_id, "ai_status": status})
+        return failed
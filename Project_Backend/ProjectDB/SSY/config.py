@@ -1,2 +1,23 @@
+import os
+
 # Oracle DB 접속 정보
-ORACLE_URL = "Ssy/qwer1234@180.80.107.6:9876/xe"
\ No newline at end of file
+ORACLE_URL = "Ssy/qwer1234@180.80.107.6:9876/xe"
+
+# 커넥션 풀 설정 (환경변수로 덮어쓰기 가능)
+POOL_MIN = int(os.environ.get("DB_POOL_MIN", "2"))
+POOL_MAX = int(os.environ.get("DB_POOL_MAX", "10"))
+POOL_INCREMENT = int(os.environ.get("DB_POOL_INCREMENT", "1"))
+# 커넥션별 statement cache 크기
+STMT_CACHE_SIZE = int(os.environ.get("DB_STMT_CACHE_SIZE", "40"))
+# 풀에서 꺼낼 때 ping 주기(초). 0이면 acquire 할 때마다 ping
+POOL_PING_INTERVAL = int(os.environ.get("DB_POOL_PING_INTERVAL", "0"))
+# 풀이 가득 찼을 때 커넥션을 기다리는 최대 시간(ms). 넘으면 acquire가 오류 → 요청이 무한정 쌓이지 않음
+POOL_WAIT_TIMEOUT_MS = int(os.environ.get("DB_POOL_WAIT_TIMEOUT_MS", "5000"))
+
+# jobWorker → 웹 서버 이벤트 전달 (SSE / 응답 캐시 무효화 / 랭킹 점수, 웹 서버의 /events.publish)
+#   EVENT_FORWARD_URL  워커가 보낼 주소 (기본 같은 호스트의 웹 서버). "off"면 전달하지 않음
+#   EVENT_FORWARD_KEY  워커와 웹 서버에 같은 값으로 설정하는 공유 키.
+#                      비워 두면 웹 서버는 loopback(127.0.0.1/::1)에서 온 요청만 받고,
+#                      워커는 loopback이 아닌 주소로 보내려 하면 시작하지 않는다
+EVENT_FORWARD_URL = os.environ.get("EVENT_FORWARD_URL", "http://127.0.0.1:8000/events.publish")
+EVENT_FORWARD_KEY = os.environ.get("EVENT_FORWARD_KEY") or None
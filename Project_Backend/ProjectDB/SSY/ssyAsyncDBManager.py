@@ -0,0 +1,64 @@
+from contextlib import asynccontextmanager
+import oracledb
+from ProjectDB.SSY import config
+from ProjectDB.SSY.ssyDBManager import SsyDBManager  # noqa: F401  (fetch_lobs=False 기본값 적용)
+
+class SsyAsyncDBManager:
+    """
+    python-oracledb async API(thin 모드) 기반 DB 매니저.
+    async def 엔드포인트에서 쿼리가 실행되는 동안 이벤트 루프를 막지 않도록 사용한다.
+    """
+    # 이벤트 루프 안에서만 만들 수 있으므로 최초 사용 시 생성
+    _pool = None
+
+    @staticmethod
+    def getPool():
+        if SsyAsyncDBManager._pool is None:
+            SsyAsyncDBManager._pool = oracledb.create_pool_async(
+                dsn=config.ORACLE_URL,
+                min=config.POOL_MIN,
+                max=config.POOL_MAX,
+                increment=config.POOL_INCREMENT,
+                stmtcachesize=config.STMT_CACHE_SIZE,
+                ping_interval=config.POOL_PING_INTERVAL,
+                getmode=oracledb.POOL_GETMODE_WAIT,
+                wait_timeout=config.POOL_WAIT_TIMEOUT_MS,
+            )
+        return SsyAsyncDBManager._pool
+
+    @staticmethod
+    async def closePool():
+        if SsyAsyncDBManager._pool is not None:
+            pool, SsyAsyncDBManager._pool = SsyAsyncDBManager._pool, None
+            await pool.close(force=True)
+
+    @staticmethod
+    async def makeConCur():
+        con = await SsyAsyncDBManager.getPool().acquire()
+        cur = con.cursor()
+        return con, cur
+
+    @staticmethod
+    async def closeConCur(con, cur):
+        cur.close()
+        await con.close()
+
+    @staticmethod
+    @asynccontextmanager
+    async def conCur():
+        """
+        async with SsyAsyncDBManager.conCur() as (con, cur):
+            await cur.execute(...)
+        예외로 빠져나오면 커밋하지 않은 변경은 롤백한다.
+        """
+        con, cur = await SsyAsyncDBManager.makeConCur()
+        try:
+            yield con, cur
+        except BaseException:
+            try:
+                await con.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            await SsyAsyncDBManager.closeConCur(con, cur)
@@ -0,0 +1,204 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from fastapi.responses import Response
+
+_MISS = object()
+
+class SsyMemoryCacheBackend:
+    """프로세스 내 LRU + TTL 저장소"""
+
+    def __init__(self, maxEntries: int = 1024):
+        self.maxEntries = maxEntries
+        self._data = OrderedDict()    # key -> (만료시각, value)
+        self._gens = {}               # namespace -> 세대 번호
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISS
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return _MISS
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxEntries:
+                self._data.popitem(last=False)
+
+    def generation(self, namespace: str) -> int:
+        return self._gens.get(namespace, 0)
+
+    def bump(self, namespace: str):
+        with self._lock:
+            self._gens[namespace] = self._gens.get(namespace, 0) + 1
+
+    def size(self) -> int:
+        return len(self._data)
+
+
+class SsyRedisCacheBackend:
+    """
+    Redis(또는 로컬 Redis 호환 서버) 저장소. 여러 워커 프로세스가 같은 캐시/무효화 세대를 공유한다.
+    redis 패키지가 있을 때만 사용 (CACHE_REDIS_URL 설정 시)
+    """
+
+    def __init__(self, url: str, prefix: str = "ssy:cache:"):
+        import redis  # 선택 의존성
+        self._r = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self._r.get(self.prefix + key)
+        return _MISS if raw is None else pickle.loads(raw)
+
+    def set(self, key, value, ttl: float):
+        self._r.set(self.prefix + key, pickle.dumps(value), px=int(ttl * 1000))
+
+    def generation(self, namespace: str) -> int:
+        return int(self._r.get(self.prefix + "gen:" + namespace) or 0)
+
+    def bump(self, namespace: str):
+        self._r.incr(self.prefix + "gen:" + namespace)
+
+    def size(self) -> int:
+        return -1
+
+
+class SsyCache:
+    """
+    읽기 위주 엔드포인트용 응답 캐시.
+    - namespace(예: "notices", "reports", "ranking") + key(파라미터) 단위로 저장
+    - 쓰기 경로(DAO)에서 invalidate(namespace)를 호출하면 해당 namespace의 세대가 바뀌어
+      이전 항목은 더 이상 조회되지 않고 LRU/TTL로 자연히 밀려난다
+    """
+
+    def __init__(self, backend=None, ttl: float = 30):
+        self.backend = backend or SsyMemoryCacheBackend()
+        self.ttl = ttl
+        self.hits = {}
+        self.misses = {}
+        self.invalidations = {}
+
+    def _key(self, namespace: str, key) -> str:
+        return f"{namespace}:{self.backend.generation(namespace)}:{key}"
+
+    def _getRaw(self, namespace: str, fullKey: str):
+        value = self.backend.get(fullKey)
+        counter = self.misses if value is _MISS else self.hits
+        counter[namespace] = counter.get(namespace, 0) + 1
+        return value
+
+    def get(self, namespace: str, key):
+        return self._getRaw(namespace, self._key(namespace, key))
+
+    def set(self, namespace: str, key, value, ttl: float = None):
+        self.backend.set(self._key(namespace, key), value, ttl or self.ttl)
+
+    def invalidate(self, *namespaces: str):
+        for ns in namespaces:
+            try:
+                self.backend.bump(ns)
+                self.invalidations[ns] = self.invalidations.get(ns, 0) + 1
+            except Exception as e:
+                print(f"[SsyCache] invalidate 실패({ns}): {e}")
+
+    # --- 응답 저장/복원: JSONResponse는 200일 때만, dict는 error가 없을 때만 저장 ---
+    @staticmethod
+    def _freeze(value):
+        if isinstance(value, Response):
+            if value.status_code != 200:
+                return _MISS
+            headers = {k: v for k, v in value.headers.items() if k.lower() != "content-length"}
+            return ("response", value.body, headers, value.media_type)
+        if isinstance(value, dict) and "error" in value:
+            return _MISS
+        if value is None:
+            return _MISS
+        return ("value", value)
+
+    @staticmethod
+    def _thaw(frozen):
+        if frozen[0] == "response":
+            _, body, headers, media_type = frozen
+            return Response(content=body, headers=headers, media_type=media_type)
+        return frozen[1]
+
+    # 세대가 들어간 전체 키는 loader 호출 "전에" 정해 둔다.
+    # 읽는 도중 쓰기 경로가 invalidate()하면 결과는 이전 세대 키에 저장되어 다시 조회되지 않는다
+    # (읽기가 끝난 뒤의 세대로 저장하면 바뀌기 전 데이터가 새 세대에 남는다)
+    def _lookup(self, namespace: str, key):
+        try:
+            fullKey = self._key(namespace, key)
+        except Exception as e:
+            print(f"[SsyCache] get 실패({namespace}): {e}")
+            return None, _MISS
+        try:
+            return fullKey, self._getRaw(namespace, fullKey)
+        except Exception as e:
+            print(f"[SsyCache] get 실패({namespace}): {e}")
+            return fullKey, _MISS
+
+    def _store(self, namespace: str, fullKey, value, ttl):
+        if fullKey is None:
+            return
+        frozen = self._freeze(value)
+        if frozen is _MISS:
+            return
+        try:
+            self.backend.set(fullKey, frozen, ttl or self.ttl)
+        except Exception as e:
+            print(f"[SsyCache] set 실패({namespace}): {e}")
+
+    def getOrLoad(self, namespace: str, key, loader, ttl: float = None):
+        fullKey, frozen = self._lookup(namespace, key)
+        if frozen is not _MISS:
+            return self._thaw(frozen)
+        value = loader()
+        self._store(namespace, fullKey, value, ttl)
+        return value
+
+    async def getOrLoadAsync(self, namespace: str, key, loader, ttl: float = None):
+        fullKey, frozen = self._lookup(namespace, key)
+        if frozen is not _MISS:
+            return self._thaw(frozen)
+        value = await loader()
+        self._store(namespace, fullKey, value, ttl)
+        return value
+
+    def stats(self) -> dict:
+        namespaces = set(self.hits) | set(self.misses) | set(self.invalidations)
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": self.backend.size(),
+            "namespaces": {
+                ns: {
+                    "hits": self.hits.get(ns, 0),
+                    "misses": self.misses.get(ns, 0),
+                    "invalidations": self.invalidations.get(ns, 0),
+                }
+                for ns in sorted(namespaces)
+            },
+        }
+
+
+def _makeBackend():
+    url = os.environ.get("CACHE_REDIS_URL")
+    if url:
+        try:
+            return SsyRedisCacheBackend(url)
+        except Exception as e:
+            print(f"[SsyCache] Redis 백엔드 사용 불가, 메모리 캐시로 대체: {e}")
+    return SsyMemoryCacheBackend(int(os.environ.get("CACHE_MAX_ENTRIES", "1024")))
+
+# 프로세스 전체 공용 응답 캐시
+responseCache = SsyCache(_makeBackend(), ttl=float(os.environ.get("CACHE_TTL", "30")))
@@ -1,13 +1,69 @@
-from oracledb import connect
+import threading
+from contextlib import contextmanager
+import oracledb
 from ProjectDB.SSY import config
 
+# CLOB/BLOB을 LOB locator 대신 str/bytes로 바로 받아온다 (행마다 LOB.read() 왕복 제거)
+oracledb.defaults.fetch_lobs = False
+
 class SsyDBManager:
+    # 프로세스 전체에서 공유하는 세션 풀 (최초 사용 시 생성)
+    _pool = None
+    _poolLock = threading.Lock()
+
+    @staticmethod
+    def getPool():
+        if SsyDBManager._pool is None:
+            with SsyDBManager._poolLock:
+                if SsyDBManager._pool is None:
+                    SsyDBManager._pool = oracledb.create_pool(
+                        dsn=config.ORACLE_URL,
+                        min=config.POOL_MIN,
+                        max=config.POOL_MAX,
+                        increment=config.POOL_INCREMENT,
+                        stmtcachesize=config.STMT_CACHE_SIZE,
+                        ping_interval=config.POOL_PING_INTERVAL,
+                        getmode=oracledb.POOL_GETMODE_WAIT,
+                        wait_timeout=config.POOL_WAIT_TIMEOUT_MS,
+                    )
+        return SsyDBManager._pool
+
+    @staticmethod
+    def closePool():
+        with SsyDBManager._poolLock:
+            if SsyDBManager._pool is not None:
+                SsyDBManager._pool.close(force=True)
+                SsyDBManager._pool = None
+
     @staticmethod
     def makeConCur():
-        con = connect(config.ORACLE_URL)
+        con = SsyDBManager.getPool().acquire()
         cur = con.cursor()
         return con, cur
+
     @staticmethod
     def closeConCur(con, cur):
+        # 풀 커넥션의 close()는 실제 종료가 아니라 풀로 반납
         cur.close()
-        con.close()
\ No newline at end of file
+        con.close()
+
+    @staticmethod
+    @contextmanager
+    def conCur():
+        """
+        with SsyDBManager.conCur() as (con, cur):
+            cur.execute(...)
+        블록이 끝나면 커서를 닫고 커넥션을 풀로 반납한다.
+        예외로 빠져나오면 커밋하지 않은 변경은 롤백한다.
+        """
+        con, cur = SsyDBManager.makeConCur()
+        try:
+            yield con, cur
+        except BaseException:
+            try:
+                con.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            SsyDBManager.closeConCur(con, cur)
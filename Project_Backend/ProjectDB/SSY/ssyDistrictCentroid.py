@@ -0,0 +1,105 @@
+from ProjectDB.SSY.ssyGeoIndex import SsyGeoIndex
+
+# 시/도 이름 표기 통일
+_CITY_ALIASES = {
+    "서울": "서울특별시", "서울시": "서울특별시", "서울특별시": "서울특별시",
+    "부산": "부산광역시", "부산시": "부산광역시", "부산광역시": "부산광역시",
+    "인천": "인천광역시", "인천시": "인천광역시", "인천광역시": "인천광역시",
+    "경기": "경기도", "경기도": "경기도",
+}
+
+# 시/도 중심점 (구/시 단위를 못 찾았을 때)
+_CITY_CENTROIDS = {
+    "서울특별시": (37.5665, 126.9780),
+    "부산광역시": (35.1796, 129.0756),
+    "인천광역시": (37.4563, 126.7052),
+    "경기도": (37.2752, 127.0095),
+}
+
+# 구/시/군 중심점 (오프라인 표, 필요한 지역은 여기에 추가)
+_DISTRICT_CENTROIDS = {
+    "서울특별시": {
+        "종로구": (37.5735, 126.9790), "중구": (37.5641, 126.9979), "용산구": (37.5326, 126.9905),
+        "성동구": (37.5634, 127.0369), "광진구": (37.5385, 127.0823), "동대문구": (37.5744, 127.0396),
+        "중랑구": (37.6063, 127.0927), "성북구": (37.5894, 127.0167), "강북구": (37.6396, 127.0257),
+        "도봉구": (37.6688, 127.0471), "노원구": (37.6542, 127.0568), "은평구": (37.6027, 126.9291),
+        "서대문구": (37.5791, 126.9368), "마포구": (37.5663, 126.9019), "양천구": (37.5170, 126.8665),
+        "강서구": (37.5509, 126.8495), "구로구": (37.4955, 126.8875), "금천구": (37.4569, 126.8955),
+        "영등포구": (37.5264, 126.8962), "동작구": (37.5124, 126.9393), "관악구": (37.4784, 126.9516),
+        "서초구": (37.4837, 127.0324), "강남구": (37.5172, 127.0473), "송파구": (37.5145, 127.1059),
+        "강동구": (37.5301, 127.1238),
+    },
+    "부산광역시": {
+        "중구": (35.1064, 129.0324), "서구": (35.0979, 129.0243), "동구": (35.1294, 129.0454),
+        "영도구": (35.0911, 129.0679), "부산진구": (35.1629, 129.0532), "동래구": (35.2049, 129.0837),
+        "남구": (35.1366, 129.0843), "북구": (35.1972, 128.9903), "해운대구": (35.1631, 129.1636),
+        "사하구": (35.1044, 128.9747), "금정구": (35.2429, 129.0922), "강서구": (35.2122, 128.9805),
+        "연제구": (35.1762, 129.0799), "수영구": (35.1455, 129.1131), "사상구": (35.1527, 128.9913),
+        "기장군": (35.2446, 129.2222),
+    },
+    "인천광역시": {
+        "중구": (37.4737, 126.6216), "동구": (37.4739, 126.6432), "미추홀구": (37.4636, 126.6503),
+        "연수구": (37.4101, 126.6783), "남동구": (37.4469, 126.7314), "부평구": (37.5070, 126.7219),
+        "계양구": (37.5372, 126.7376), "서구": (37.5456, 126.6760), "강화군": (37.7468, 126.4880),
+        "옹진군": (37.4465, 126.6367),
+    },
+    "경기도": {
+        "수원시": (37.2636, 127.0286), "성남시": (37.4201, 127.1265), "고양시": (37.6584, 126.8320),
+        "용인시": (37.2411, 127.1776), "부천시": (37.5034, 126.7660), "안산시": (37.3219, 126.8309),
+        "안양시": (37.3943, 126.9568), "남양주시": (37.6360, 127.2165), "화성시": (37.1995, 126.8315),
+        "평택시": (36.9921, 127.1129), "의정부시": (37.7381, 127.0338), "시흥시": (37.3800, 126.8029),
+        "파주시": (37.7600, 126.7800), "김포시": (37.6153, 126.7156), "광명시": (37.4786, 126.8646),
+        "광주시": (37.4295, 127.2550), "군포시": (37.3617, 126.9352), "하남시": (37.5393, 127.2148),
+        "오산시": (37.1498, 127.0772), "이천시": (37.2720, 127.4350), "안성시": (37.0080, 127.2797),
+        "의왕시": (37.3447, 126.9683), "양주시": (37.7853, 127.0458), "구리시": (37.5943, 127.1296),
+        "포천시": (37.8949, 127.2002), "여주시": (37.2983, 127.6374), "동두천시": (37.9036, 127.0606),
+        "과천시": (37.4292, 126.9876), "가평군": (37.8315, 127.5105), "양평군": (37.4917, 127.4876),
+        "연천군": (38.0966, 127.0748),
+    },
+}
+
+class SsyDistrictCentroid:
+    """
+    주소 문자열 → 구/시/군 중심 좌표 (외부 API 없이 표 조회).
+    district 키는 "서울특별시 강남구", "경기도 수원시" 형태
+    """
+
+    @staticmethod
+    def parse(address):
+        """주소 → (시/도, 구/시/군 또는 None). 표에 없는 시/도면 (None, None)"""
+        if not address:
+            return None, None
+        parts = address.split()
+        if not parts:
+            return None, None
+        city = _CITY_ALIASES.get(parts[0])
+        if not city:
+            return None, None
+        table = _DISTRICT_CENTROIDS.get(city, {})
+        for token in parts[1:3]:
+            if token in table:
+                return city, token
+        return city, None
+
+    @staticmethod
+    def geocode(address):
+        """주소 → (lat, lng, district 키) 또는 None"""
+        city, district = SsyDistrictCentroid.parse(address)
+        if not city:
+            return None
+        if district:
+            lat, lng = _DISTRICT_CENTROIDS[city][district]
+            return lat, lng, f"{city} {district}"
+        lat, lng = _CITY_CENTROIDS[city]
+        return lat, lng, city
+
+    @staticmethod
+    def nearest(lat: float, lng: float, maxM: float = 15000):
+        """좌표에서 가장 가까운 구/시/군 중심의 district 키 (maxM 밖이면 None)"""
+        best, bestD = None, maxM
+        for city, table in _DISTRICT_CENTROIDS.items():
+            for district, (dlat, dlng) in table.items():
+                d = SsyGeoIndex.distanceM(lat, lng, dlat, dlng)
+                if d < bestD:
+                    best, bestD = f"{city} {district}", d
+        return best
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Optional, Tuple
+from ProjectDB.SSY.ssyGeoIndex import SsyGeoIndex
+from ProjectDB.SSY.ssyImageHash import SsyImageHash
+
+class SsyDuplicateIndex:
+    """
+    중복 신고 판별: 최근 windowSec 안에 radiusM 이내에서 등록된 신고 중
+    사진 해시(dHash) 차이가 maxBits 이하인 것이 있으면 그 신고(의 원본)를 돌려준다.
+    - 위치 후보는 신고 공간 인덱스(geoIndex)에서 찾고, 여기에는 key → (해시, 시각, 원본 key)만 보관
+    - 중복으로 판정된 신고도 보관하되 원본 key를 가리키게 해서, 중복의 중복도 같은 원본으로 모인다
+    """
+
+    def __init__(self, geoIndex: SsyGeoIndex, radiusM: float = 30, windowSec: float = 6 * 3600, maxBits: int = 10):
+        self.geoIndex = geoIndex
+        self.radiusM = radiusM
+        self.windowSec = windowSec
+        self.maxBits = maxBits
+        self._entries = {}      # key -> (hash, ts, rootKey)
+        self._lock = threading.Lock()
+        self._adds = 0
+        self.stats = {"checked": 0, "duplicates": 0, "no_hash": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, key, photoHash: Optional[str], ts: float, rootKey=None):
+        if not photoHash:
+            return
+        with self._lock:
+            self._entries[key] = (photoHash, ts, rootKey if rootKey is not None else key)
+            self._adds += 1
+        if self._adds % 500 == 0:
+            self.prune()
+
+    def remove(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def load(self, items):
+        """(key, hash, ts, rootKey) 목록으로 통째로 다시 만든다"""
+        with self._lock:
+            self._entries = {}
+        for key, photoHash, ts, rootKey in items:
+            self.add(key, photoHash, ts, rootKey)
+
+    def prune(self, now: Optional[float] = None):
+        cutoff = (now or time.time()) - self.windowSec
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e[1] < cutoff]:
+                del self._entries[key]
+
+    def find(self, lat: float, lng: float, photoHash: Optional[str], ts: float) -> Optional[Tuple[object, float, int]]:
+        """→ (원본 key, 거리m, 해시 차이) 또는 None. 가장 비슷한 것, 같으면 가장 가까운 것"""
+        self.stats["checked"] += 1
+        if not photoHash:
+            self.stats["no_hash"] += 1
+            return None
+        best = None
+        for key, dist in self.geoIndex.nearby(lat, lng, self.radiusM):
+            e = self._entries.get(key)
+            if e is None or abs(ts - e[1]) > self.windowSec:
+                continue
+            bits = SsyImageHash.distance(photoHash, e[0])
+            if bits <= self.maxBits and (best is None or (bits, dist) < (best[2], best[1])):
+                best = (e[2], dist, bits)
+        if best:
+            self.stats["duplicates"] += 1
+        return best
+
+    def status(self) -> dict:
+        return dict(self.stats, entries=len(self._entries), radius_m=self.radiusM,
+                    window_hours=round(self.windowSec / 3600, 2), max_bits=self.maxBits)
@@ -0,0 +1,63 @@
+import hashlib
+from fastapi.responses import Response
+
+class SsyETag:
+    """
+    조건부 응답(ETag / If-None-Match) 유틸.
+    - 버전 문자열(테이블별 행 수 + MAX(ORA_ROWSCN) 등)과 요청 파라미터로 weak ETag를 만든다
+    - 클라이언트가 보낸 If-None-Match와 같으면 행 조회/JSON 직렬화 없이 304를 돌려준다
+    """
+
+    @staticmethod
+    def make(*parts) -> str:
+        raw = "|".join("" if p is None else str(p) for p in parts)
+        return 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+    @staticmethod
+    def matches(ifNoneMatch, etag: str) -> bool:
+        if not ifNoneMatch or not etag:
+            return False
+        if ifNoneMatch.strip() == "*":
+            return True
+        # weak 비교: W/ 접두사는 무시
+        bare = etag[2:] if etag.startswith("W/") else etag
+        for tag in ifNoneMatch.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag == bare:
+                return True
+        return False
+
+    @staticmethod
+    def _expose(headers, name: str):
+        exposed = headers.get("Access-Control-Expose-Headers")
+        if not exposed:
+            headers["Access-Control-Expose-Headers"] = name
+        elif name.lower() not in [x.strip().lower() for x in exposed.split(",")]:
+            headers["Access-Control-Expose-Headers"] = exposed + ", " + name
+
+    @staticmethod
+    def notModified(etag: str) -> Response:
+        h = {"Access-Control-Allow-Origin": "*", "ETag": etag}
+        SsyETag._expose(h, "ETag")
+        return Response(status_code=304, headers=h)
+
+    @staticmethod
+    def attach(result, response: Response, etag: str):
+        """
+        정상 응답에 ETag 헤더를 붙인다.
+        result가 Response면 그 헤더에, dict 등이면 FastAPI가 주입한 response에 붙인다.
+        (오류 응답에는 붙이지 않음)
+        """
+        if isinstance(result, Response):
+            if result.status_code != 200:
+                return result
+            target = result
+        else:
+            if isinstance(result, dict) and "error" in result:
+                return result
+            target = response
+        target.headers["ETag"] = etag
+        SsyETag._expose(target.headers, "ETag")
+        return result
@@ -0,0 +1,174 @@
+import asyncio
+import ipaddress
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+import httpx
+
+def isLoopback(host: str) -> bool:
+    """127.0.0.0/8, ::1, localhost"""
+    if not host:
+        return False
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+class SsySubscription:
+    """구독자 하나 (SSE 연결 하나) — 이벤트 루프의 asyncio.Queue로 이벤트를 받는다"""
+
+    def __init__(self, topics, loop, queueSize: int):
+        self.topics = set(topics)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queueSize)
+        self.dropped = 0
+
+    def _offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 느린 클라이언트 때문에 메모리가 늘지 않도록 버림
+            self.dropped += 1
+
+    async def get(self, timeout: float):
+        """timeout 안에 이벤트가 없으면 None (heartbeat용)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class SsyEventBroker:
+    """
+    in-process pub/sub.
+    - 토픽 예: "code:USER_ALL", "code:NAME_KIM", "report:123"
+    - publish()는 DAO(스레드풀)에서도 호출되므로 call_soon_threadsafe로 구독자 루프에 넘긴다
+    - 구독자가 없는 별도 프로세스(jobWorker)는 forwardTo()로 웹 서버의 /events.publish에 이벤트를 넘긴다
+      (전송은 전용 스레드 하나가 순서대로 → publish를 부른 DAO/이벤트 루프는 HTTP 왕복을 기다리지 않음)
+    """
+
+    def __init__(self, queueSize: int = 100):
+        self.queueSize = queueSize
+        self._subs = {}                 # topic -> {SsySubscription}
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self.stats = {"published": 0, "delivered": 0, "forwarded": 0, "forward_errors": 0, "forward_dropped": 0}
+        self._statsLock = threading.Lock()
+        self._forwardUrl = None
+        self._forwardKey = None
+        self._client = None
+        self._outbox = None
+        self._sender = None
+
+    def _count(self, key: str, n: int = 1):
+        with self._statsLock:
+            self.stats[key] += n
+
+    def forwardTo(self, url: str, key: str = None, timeout: float = 2, queueSize: int = 10000):
+        # 공유 키가 없으면 받는 쪽도 loopback 요청만 받으므로, 다른 호스트로 보내면 전부 403 → 시작할 때 바로 알림
+        if not key and not isLoopback(urlsplit(url).hostname):
+            raise ValueError(f"EVENT_FORWARD_KEY 없이 loopback이 아닌 주소로 이벤트를 보낼 수 없습니다: {url}")
+        self._forwardUrl = url
+        self._forwardKey = key
+        self._client = httpx.Client(timeout=timeout)
+        self._outbox = queue.Queue(maxsize=queueSize)
+        self._sender = threading.Thread(target=self._sendLoop, name="event-forward", daemon=True)
+        self._sender.start()
+
+    def stopForwarding(self, timeout: float = 5):
+        """남은 이벤트를 timeout 안에서 마저 보내고 전송 스레드 종료"""
+        if self._sender is None:
+            return
+        try:
+            self._outbox.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._sender.join(timeout)
+        self._client.close()
+        self._forwardUrl, self._sender = None, None
+
+    def _forward(self, topic: str, event: dict):
+        try:
+            self._outbox.put_nowait((topic, event))
+        except queue.Full:
+            # 웹 서버가 오래 응답하지 않는 경우: 워커 메모리가 늘지 않도록 버림
+            self._count("forward_dropped")
+
+    def _sendLoop(self):
+        while True:
+            item = self._outbox.get()
+            if item is None:
+                return
+            self._send(*item)
+
+    def _send(self, topic: str, event: dict):
+        # 실패해도 원래 작업(DB 반영)은 끝난 뒤이므로 기록만 남긴다
+        try:
+            resp = self._client.post(self._forwardUrl, json={"topic": topic, "event": event},
+                                     headers={"X-Event-Key": self._forwardKey or ""})
+            resp.raise_for_status()
+            self._count("forwarded")
+        except httpx.HTTPError as e:
+            self._count("forward_errors")
+            logging.warning(f"[EventBroker] 이벤트 전달 실패 {topic}: {e}")
+
+    def subscribe(self, topics) -> SsySubscription:
+        sub = SsySubscription(topics, asyncio.get_running_loop(), self.queueSize)
+        with self._lock:
+            for t in sub.topics:
+                self._subs.setdefault(t, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: SsySubscription):
+        with self._lock:
+            for t in sub.topics:
+                subs = self._subs.get(t)
+                if subs:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subs[t]
+
+    def publish(self, topic: str, event: dict):
+        with self._lock:
+            subs = list(self._subs.get(topic, ()))
+        self._count("published")
+        if self._forwardUrl:
+            self._forward(topic, event)
+        if not subs:
+            return 0
+        event = dict(event, id=next(self._seq), topic=topic, ts=time.time())
+        delivered = 0
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._offer, event)
+                delivered += 1
+            except RuntimeError:
+                # 루프가 이미 닫힌 연결
+                self.unsubscribe(sub)
+        self._count("delivered", delivered)
+        return len(subs)
+
+    def status(self) -> dict:
+        with self._lock:
+            connections = len({s for subs in self._subs.values() for s in subs})
+            topics = len(self._subs)
+        with self._statsLock:
+            stats = dict(self.stats)
+        return dict(stats, topics=topics, connections=connections,
+                    forward_queue=self._outbox.qsize() if self._outbox is not None else None)
+
+    @staticmethod
+    def sse(event: dict) -> str:
+        """SSE 한 프레임"""
+        data = json.dumps(event, ensure_ascii=False, default=str)
+        return f"id: {event.get('id', '')}\nevent: {event.get('type', 'message')}\ndata: {data}\n\n"
+
+
+# 프로세스 전체 공용 브로커
+eventBroker = SsyEventBroker()
@@ -0,0 +1,101 @@
+import math
+import threading
+
+EARTH_RADIUS_M = 6371008.8
+
+class SsyGeoIndex:
+    """
+    위도/경도 격자(bucket) 기반 in-process 공간 인덱스.
+    - key(report_id 등) → (lat, lng) 를 cellDeg 크기의 칸에 나눠 보관
+    - nearby()는 반경을 덮는 칸들만 훑으므로 전체 개수와 무관하게 주변 밀도에만 비례
+    """
+
+    def __init__(self, cellDeg: float = 0.005):
+        self.cellDeg = cellDeg                 # 0.005도 ≈ 위도 방향 550m
+        self._cells = {}                       # (gy, gx) -> {key: (lat, lng)}
+        self._points = {}                      # key -> (lat, lng, (gy, gx))
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, key):
+        return key in self._points
+
+    def _cellOf(self, lat: float, lng: float):
+        return (math.floor(lat / self.cellDeg), math.floor(lng / self.cellDeg))
+
+    def add(self, key, lat: float, lng: float):
+        if lat is None or lng is None:
+            return
+        lat, lng = float(lat), float(lng)
+        with self._lock:
+            self.remove(key)
+            cell = self._cellOf(lat, lng)
+            self._cells.setdefault(cell, {})[key] = (lat, lng)
+            self._points[key] = (lat, lng, cell)
+
+    def remove(self, key):
+        with self._lock:
+            old = self._points.pop(key, None)
+            if old is None:
+                return False
+            bucket = self._cells.get(old[2])
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._cells[old[2]]
+            return True
+
+    def load(self, items):
+        """(key, lat, lng) 목록으로 인덱스를 통째로 다시 만든다"""
+        with self._lock:
+            self._cells = {}
+            self._points = {}
+            for key, lat, lng in items:
+                self.add(key, lat, lng)
+
+    def get(self, key):
+        p = self._points.get(key)
+        return (p[0], p[1]) if p else None
+
+    @staticmethod
+    def distanceM(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+        # haversine
+        p1, p2 = math.radians(lat1), math.radians(lat2)
+        dp = p2 - p1
+        dl = math.radians(lng2 - lng1)
+        a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+        return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+    def nearby(self, lat: float, lng: float, radiusM: float, limit: int = None):
+        """
+        (lat, lng)에서 radiusM 이내의 [(key, 거리m), ...] 를 가까운 순으로 반환
+        """
+        # 반경 원을 덮는 위경도 범위 (distanceM과 같은 구면 기준)
+        # 경도 폭은 중심 위도가 아니라 원 전체에서의 최대값 asin(sin(r/R) / cos(lat))을 써야 가장자리 점이 빠지지 않는다
+        angular = radiusM / EARTH_RADIUS_M
+        dLat = math.degrees(angular)
+        cosLat = math.cos(math.radians(lat))
+        dLng = 180.0 if cosLat <= math.sin(angular) else math.degrees(math.asin(math.sin(angular) / cosLat))
+        south, north = lat - dLat, lat + dLat
+        west, east = lng - dLng, lng + dLng
+        gy0, gx0 = self._cellOf(south, west)
+        gy1, gx1 = self._cellOf(north, east)
+
+        found = []
+        with self._lock:
+            for gy in range(gy0, gy1 + 1):
+                for gx in range(gx0, gx1 + 1):
+                    bucket = self._cells.get((gy, gx))
+                    if not bucket:
+                        continue
+                    for key, (plat, plng) in bucket.items():
+                        # bounding box로 먼저 거르고 남은 것만 거리 계산
+                        if plat < south or plat > north or plng < west or plng > east:
+                            continue
+                        d = self.distanceM(lat, lng, plat, plng)
+                        if d <= radiusM:
+                            found.append((key, d))
+        found.sort(key=lambda kd: kd[1])
+        return found[:limit] if limit else found
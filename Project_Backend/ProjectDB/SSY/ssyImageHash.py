@@ -0,0 +1,36 @@
+from io import BytesIO
+from typing import Optional
+
+class SsyImageHash:
+    """
+    사진 지각 해시(dHash, 64비트).
+    - 흑백 9x8로 줄인 뒤 가로로 이웃한 픽셀 밝기 비교 → 비트
+    - 재압축/크기 변경/약간의 밝기 차이에는 거의 그대로, 다른 사진은 크게 달라짐
+    - 두 해시의 다른 비트 수(distance)가 작을수록 비슷한 사진
+    Pillow가 없거나 이미지가 아니면 None
+    """
+
+    @staticmethod
+    def dHash(content: bytes) -> Optional[str]:
+        try:
+            from PIL import Image, ImageOps  # 선택 의존성
+        except ImportError:
+            return None
+        try:
+            img = Image.open(BytesIO(content))
+            # JPEG는 디코딩 단계에서 미리 축소 (원본 해상도로 다 풀지 않음)
+            img.draft("L", (64, 64))
+            img = ImageOps.exif_transpose(img).convert("L").resize((9, 8), Image.BILINEAR)
+            px = img.tobytes()
+        except Exception:
+            return None
+        bits = 0
+        for y in range(8):
+            row = px[y * 9:(y + 1) * 9]
+            for x in range(8):
+                bits = (bits << 1) | (row[x] > row[x + 1])
+        return f"{bits:016x}"
+
+    @staticmethod
+    def distance(a: str, b: str) -> int:
+        return bin(int(a, 16) ^ int(b, 16)).count("1")
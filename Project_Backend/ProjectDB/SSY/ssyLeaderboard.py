@@ -0,0 +1,112 @@
+import bisect
+import threading
+
+class SsyLeaderboard:
+    """
+    점수 랭킹 in-memory 인덱스.
+    - (-score, user_id) 정렬 리스트를 유지하므로 순위/구간 조회는 이진 탐색(O(log n))
+    - 순위는 RANK() OVER (ORDER BY score DESC)와 같은 규칙 (동점은 같은 순위, 다음 순위는 건너뜀)
+    - 점수 변경 시 해당 사용자 한 명만 빼고 다시 끼워 넣는다
+    """
+
+    def __init__(self):
+        self._keys = []          # [(-score, user_id), ...] 오름차순 = 점수 내림차순
+        self._scores = {}        # user_id -> score
+        self._info = {}          # user_id -> {"nickname", "profile_pic_url"}
+        self._lock = threading.RLock()
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, user_id):
+        return user_id in self._scores
+
+    def load(self, rows):
+        """(user_id, score, nickname, profile_pic_url) 목록으로 통째로 다시 만든다"""
+        with self._lock:
+            self._scores = {}
+            self._info = {}
+            for user_id, score, nickname, profile in rows:
+                self._scores[user_id] = int(score or 0)
+                self._info[user_id] = {"nickname": nickname, "profile_pic_url": profile}
+            self._keys = sorted((-s, u) for u, s in self._scores.items())
+            self.loaded = True
+
+    def setScore(self, user_id, score):
+        if user_id is None or score is None:
+            return
+        score = int(score)
+        with self._lock:
+            old = self._scores.get(user_id)
+            if old == score:
+                return
+            if old is not None:
+                i = bisect.bisect_left(self._keys, (-old, user_id))
+                if i < len(self._keys) and self._keys[i] == (-old, user_id):
+                    del self._keys[i]
+            bisect.insort(self._keys, (-score, user_id))
+            self._scores[user_id] = score
+            self._info.setdefault(user_id, {"nickname": None, "profile_pic_url": None})
+
+    def setInfo(self, user_id, nickname=None, profile_pic_url=None):
+        with self._lock:
+            if user_id not in self._scores:
+                return
+            info = self._info[user_id]
+            if nickname:
+                info["nickname"] = nickname
+            if profile_pic_url is not None:
+                info["profile_pic_url"] = profile_pic_url
+
+    def remove(self, user_id):
+        with self._lock:
+            old = self._scores.pop(user_id, None)
+            self._info.pop(user_id, None)
+            if old is None:
+                return False
+            i = bisect.bisect_left(self._keys, (-old, user_id))
+            if i < len(self._keys) and self._keys[i] == (-old, user_id):
+                del self._keys[i]
+            return True
+
+    def scoreOf(self, user_id):
+        return self._scores.get(user_id)
+
+    def rankOf(self, user_id):
+        """정확한 순위 (1부터). 없는 사용자면 None"""
+        with self._lock:
+            score = self._scores.get(user_id)
+            if score is None:
+                return None
+            # 나보다 점수가 높은 사람 수 + 1
+            return bisect.bisect_left(self._keys, (-score,)) + 1
+
+    def _entry(self, i):
+        negScore, user_id = self._keys[i]
+        info = self._info.get(user_id, {})
+        return {
+            "profile_pic_url": info.get("profile_pic_url"),
+            "user_id": user_id,
+            "nickname": info.get("nickname"),
+            "score": -negScore,
+            "rank": bisect.bisect_left(self._keys, (negScore,)) + 1,
+        }
+
+    def _range(self, start, end):
+        with self._lock:
+            start = max(0, start)
+            end = min(len(self._keys), end)
+            return [self._entry(i) for i in range(start, end)]
+
+    def top(self, n: int = 100):
+        return self._range(0, n)
+
+    def around(self, user_id, k: int = 5):
+        """내 위아래 k명씩 (내가 없으면 빈 목록)"""
+        with self._lock:
+            score = self._scores.get(user_id)
+            if score is None:
+                return []
+            i = bisect.bisect_left(self._keys, (-score, user_id))
+            return self._range(i - k, i + k + 1)
@@ -0,0 +1,131 @@
+import base64
+import json
+from datetime import datetime
+
+class SsyPageCursor:
+    """
+    목록 API용 keyset(커서) 페이지네이션 유틸.
+    (report_date, report_id) 내림차순 기준으로 "마지막으로 본 행" 다음부터 조회한다.
+    next_cursor는 클라이언트 입장에서 불투명한 문자열(base64url JSON)이다.
+    """
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 500
+
+    @staticmethod
+    def encode(values: dict) -> str:
+        raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> dict:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if not isinstance(values, dict):
+                raise ValueError
+            return values
+        except Exception:
+            raise ValueError("잘못된 cursor 값입니다.")
+
+    @staticmethod
+    def clampLimit(limit) -> int:
+        if limit is None:
+            return SsyPageCursor.DEFAULT_LIMIT
+        return max(1, min(int(limit), SsyPageCursor.MAX_LIMIT))
+
+    @staticmethod
+    def tune(cur, limit: int):
+        # 한 페이지(+다음 페이지 존재 확인용 1행)를 한 번의 왕복으로 가져오도록 설정
+        cur.arraysize = limit + 1
+        cur.prefetchrows = limit + 2
+
+    # ----------------------------------------------------------------------
+    # (report_date, report_id) 기준
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def reportKeyset(cursor, alias: str = "r"):
+        """
+        cursor 문자열 → (WHERE 조건 SQL, 바인드 dict).
+        cursor가 없으면 ("", {}) — 첫 페이지
+        """
+        if not cursor:
+            return "", {}
+        values = SsyPageCursor.decode(cursor)
+        try:
+            c_date = datetime.fromisoformat(values["d"])
+            c_id = int(values["id"])
+        except Exception:
+            raise ValueError("잘못된 cursor 값입니다.")
+        sql = (f"({alias}.report_date < :c_date OR "
+               f"({alias}.report_date = :c_date AND {alias}.report_id < :c_id))")
+        return sql, {"c_date": c_date, "c_id": c_id}
+
+    @staticmethod
+    def reportCursor(report_date, report_id) -> str:
+        return SsyPageCursor.encode({"d": report_date.isoformat(), "id": int(report_id)})
+
+    @staticmethod
+    def cutReportPage(rows, limit: int, dateIdx: int, idIdx: int):
+        """
+        limit+1건까지 조회된 행에서 report_id 기준 limit건만 남기고 next_cursor를 만든다.
+        (Maintenance_Status JOIN처럼 한 신고가 여러 행일 수 있는 경우도 report 단위로 자른다)
+        """
+        kept, seen, last = [], set(), None
+        for r in rows:
+            rid = r[idIdx]
+            if rid not in seen:
+                if len(seen) == limit:
+                    return kept, SsyPageCursor.reportCursor(last[dateIdx], last[idIdx])
+                seen.add(rid)
+                last = r
+            kept.append(r)
+        return kept, None
+
+    # ----------------------------------------------------------------------
+    # 단일 숫자 키(status_id 등) 기준
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def idKeyset(cursor, column: str):
+        if not cursor:
+            return "", {}
+        values = SsyPageCursor.decode(cursor)
+        try:
+            return f"{column} < :c_id", {"c_id": int(values["id"])}
+        except Exception:
+            raise ValueError("잘못된 cursor 값입니다.")
+
+    @staticmethod
+    def cutIdPage(rows, limit: int, idIdx: int):
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, SsyPageCursor.encode({"id": int(rows[-1][idIdx])})
+        return rows, None
+
+    # ----------------------------------------------------------------------
+    # SQL 조립
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def pageLimit(limit, cursor):
+        """limit/cursor 둘 다 없으면 None(기존처럼 전체 조회), 아니면 보정된 limit"""
+        if limit is None and not cursor:
+            return None
+        return SsyPageCursor.clampLimit(limit)
+
+    @staticmethod
+    def reportQuery(template: str, cursor, limit, filters=(), params=None, alias: str = "r"):
+        """
+        template의 {where}/{fetch} 자리에 필터 + keyset 조건, FETCH FIRST 절을 채운다.
+        limit이 None이면 keyset 없이 전체 조회.
+        """
+        where = list(filters)
+        params = dict(params or {})
+        fetch = ""
+        if limit is not None:
+            keyset, keyParams = SsyPageCursor.reportKeyset(cursor, alias)
+            if keyset:
+                where.append(keyset)
+                params.update(keyParams)
+            fetch = "FETCH FIRST :p_lim ROWS ONLY"
+            params["p_lim"] = limit + 1
+        sql = template.format(where=("WHERE " + " AND ".join(where)) if where else "", fetch=fetch)
+        return sql, params
@@ -0,0 +1,95 @@
+import decimal
+import oracledb
+
+DT_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# DATE/TIMESTAMP 계열 컬럼 타입
+_DATE_TYPES = (
+    oracledb.DB_TYPE_DATE,
+    oracledb.DB_TYPE_TIMESTAMP,
+    oracledb.DB_TYPE_TIMESTAMP_TZ,
+    oracledb.DB_TYPE_TIMESTAMP_LTZ,
+)
+
+class SsyRowMapper:
+    """
+    DAO 공용 행 변환기.
+    SsyDBManager/SsyAsyncDBManager가 fetch_lobs=False로 CLOB은 str, BLOB은 bytes로 한 번에 받아오므로
+    행마다 LOB.read() 왕복이 생기지 않는다. 여기서는 날짜/Decimal/bytes 변환만 담당한다.
+    """
+
+    @staticmethod
+    def toText(v):
+        if v is None or isinstance(v, str):
+            return v
+        # 혹시 LOB locator가 넘어온 경우(fetch_lobs 설정 전 커서 등) 대비
+        if hasattr(v, "read"):
+            v = v.read()
+        if isinstance(v, (bytes, bytearray)):
+            return v.decode("utf-8", errors="ignore")
+        return v
+
+    @staticmethod
+    def dt2str(v, fmt: str = DT_FORMAT):
+        return v.strftime(fmt) if hasattr(v, "strftime") else None
+
+    @staticmethod
+    def toJson(v):
+        # 모든 값을 JSON 직렬화 가능한 타입으로 (LOB/bytes→str, datetime→문자열, Decimal→int/float)
+        v = SsyRowMapper.toText(v)
+        if hasattr(v, "strftime"):
+            return v.strftime(DT_FORMAT)
+        if isinstance(v, decimal.Decimal):
+            return int(v) if v == v.to_integral_value() else float(v)
+        return v
+
+    @staticmethod
+    def toNumber(v):
+        # NUMBER 컬럼: 정수 컬럼은 드라이버가 이미 int로 주므로 Decimal일 때만 변환
+        if isinstance(v, decimal.Decimal):
+            return int(v) if v == v.to_integral_value() else float(v)
+        return v
+
+    @staticmethod
+    def converters(description):
+        # cur.description의 컬럼 타입을 보고 컬럼별 변환 함수를 한 번만 고른다
+        convs = []
+        for col in description:
+            type_code = col[1]
+            if type_code in _DATE_TYPES:
+                convs.append(SsyRowMapper.dt2str)
+            elif type_code is oracledb.DB_TYPE_NUMBER:
+                convs.append(SsyRowMapper.toNumber)
+            elif type_code in (oracledb.DB_TYPE_CLOB, oracledb.DB_TYPE_NCLOB, oracledb.DB_TYPE_LONG,
+                               oracledb.DB_TYPE_BLOB, oracledb.DB_TYPE_RAW, oracledb.DB_TYPE_LONG_RAW):
+                convs.append(SsyRowMapper.toText)
+            else:
+                convs.append(None)
+        return convs
+
+    @staticmethod
+    def mapRows(description, rows):
+        """컬럼명(소문자) → 변환된 값 dict 리스트"""
+        names = [col[0].lower() for col in description]
+        # 변환이 필요한 컬럼만 골라 두고, 나머지는 zip으로 그대로 담는다
+        todo = [(i, name, conv) for i, (name, conv) in enumerate(zip(names, SsyRowMapper.converters(description))) if conv]
+        result = []
+        for row in rows:
+            d = dict(zip(names, row))
+            for i, name, conv in todo:
+                v = row[i]
+                if v is not None:
+                    d[name] = conv(v)
+            result.append(d)
+        return result
+
+    @staticmethod
+    def fetchAllDicts(cur):
+        return SsyRowMapper.mapRows(cur.description, cur.fetchall())
+
+    @staticmethod
+    def fetchOneDict(cur):
+        row = cur.fetchone()
+        if row is None:
+            return None
+        return SsyRowMapper.mapRows(cur.description, [row])[0]
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+class AiResultCache:
+    """
+    사진 바이트 SHA-256 → AI 응답(+ 이미 받아 둔 로컬 마스크 경로) 캐시.
+    같은 사진을 다시 신고하면 AI 서버 호출과 마스크 다운로드를 건너뛴다.
+    - 메모리: LRU, maxEntries개 / 직렬화 크기 합 maxBytes 이하
+    - sqlitePath가 있으면 파일에도 저장 (재시작 뒤에도 유지, jobWorker와 웹 서버가 같은 파일을 써도 됨)
+    """
+
+    def __init__(self, maxEntries: int = 2000, maxBytes: int = 16 * 1024 * 1024,
+                 sqlitePath: Optional[str] = None, diskEntries: int = 50000):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.diskEntries = diskEntries
+        self._mem = OrderedDict()     # key -> json 문자열
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._puts = 0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stored": 0}
+        if sqlitePath:
+            self._db = sqlite3.connect(sqlitePath, check_same_thread=False, isolation_level=None, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS ai_results (
+                    key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def hashFile(fh, chunk: int = 64 * 1024) -> str:
+        """파일 객체를 청크 단위로 읽어 SHA-256 (읽은 뒤 처음으로 되돌림 → 그대로 업로드 가능)"""
+        h = hashlib.sha256()
+        for block in iter(lambda: fh.read(chunk), b""):
+            h.update(block)
+        fh.seek(0)
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            raw = self._mem.get(key)
+            if raw is not None:
+                self._mem.move_to_end(key)
+                self.stats["hits"] += 1
+                return json.loads(raw)
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM ai_results WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._db.execute("UPDATE ai_results SET last_used = ? WHERE key = ?", (time.time(), key))
+                    self._remember(key, row[0])
+                    self.stats["disk_hits"] += 1
+                    return json.loads(row[0])
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: dict):
+        raw = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            self._remember(key, raw)
+            self.stats["stored"] += 1
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO ai_results (key, value, last_used) VALUES (?, ?, ?)",
+                                 (key, raw, time.time()))
+                self._puts += 1
+                if self._puts % 1000 == 0:
+                    self._db.execute("""
+                        DELETE FROM ai_results WHERE key IN (
+                            SELECT key FROM ai_results ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                        )
+                    """, (self.diskEntries,))
+
+    def _remember(self, key: str, raw: str):
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._mem[key] = raw
+        self._bytes += len(raw)
+        while self._mem and (len(self._mem) > self.maxEntries or self._bytes > self.maxBytes):
+            _k, v = self._mem.popitem(last=False)
+            self._bytes -= len(v)
+
+    def status(self) -> dict:
+        with self._lock:
+            disk = self._db.execute("SELECT COUNT(*) FROM ai_results").fetchone()[0] if self._db is not None else None
+            return dict(self.stats, entries=len(self._mem), bytes=self._bytes, max_entries=self.maxEntries,
+                        disk_entries=disk)
+
+
+# 프로세스 전체 공용
+#   AI_CACHE_MAX_ENTRIES 메모리 최대 항목 수, AI_CACHE_MAX_MB 메모리 최대 크기
+#   AI_CACHE_SQLITE      지정하면 SQLite 파일에도 저장
+aiResultCache = AiResultCache(
+    maxEntries=int(os.environ.get("AI_CACHE_MAX_ENTRIES", "2000")),
+    maxBytes=int(os.environ.get("AI_CACHE_MAX_MB", "16")) * 1024 * 1024,
+    sqlitePath=os.environ.get("AI_CACHE_SQLITE") or None,
+)
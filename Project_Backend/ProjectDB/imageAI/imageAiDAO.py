@@ -1,9 +1,16 @@
 import os, json, requests
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+import asyncio
+import hashlib
 import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from pathlib import Path
 from io import BytesIO
 from ProjectDB.Registration.RegistrationDAO import RegistrationDAO
+from ProjectDB.imageAI.aiResultCache import aiResultCache
 import mimetypes
 import httpx
 
@@ -13,16 +20,134 @@ TIMEOUT = (5, 120)  # (connect, read)
 LOCAL_ANALYSIS_DIR = Path("./analysis_photo")  # 실제 경로로
 LOCAL_ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
 
+# 신고 사진 전달 시 옮긴 바이트 수 (/ai.stats)
+#   fetched: AI 서버로 보내기 전에 URL에서 다시 받은 바이트 (로컬 파일을 바로 보내면 0)
+#   uploaded: /predict로 올린 바이트, mask: 마스크 이미지 다운로드 바이트
+#   cache_hits: 같은 사진의 이전 결과(aiResultCache)를 써서 AI 호출을 건너뛴 수
+_transfer = {"reports": 0, "batches": 0, "src_local": 0, "src_remote": 0, "fetched_bytes": 0, "uploaded_bytes": 0,
+             "mask_bytes": 0, "cache_hits": 0}
+_transferLock = threading.Lock()
+
+def _count(**kw):
+    with _transferLock:
+        for k, v in kw.items():
+            _transfer[k] += v
+
+def transferStats() -> dict:
+    with _transferLock:
+        data = dict(_transfer)
+    n = data["reports"] or 1
+    data["bytes_per_report"] = round((data["fetched_bytes"] + data["uploaded_bytes"] + data["mask_bytes"]) / n)
+    return data
+
+def _is_url(s: str) -> bool:
+    s2 = s.strip().replace("\\", "/")
+    return s2.startswith("http://") or s2.startswith("https://")
+
 def _safe_status(msg: str, limit: int = 100) -> str:
     s = (msg or "").strip()
     if len(s) <= limit:
         return s
     return s[: limit - 3] + "..."
 
+class AIBusyError(Exception):
+    """동시 AI 호출 상한에 걸려 입장하지 못함 (job이면 backoff 뒤 재시도)"""
+
+
+class _AIGate:
+    """
+    프로세스 전체 AI 호출 입장 제어 + 공용 httpx.AsyncClient(keep-alive 풀).
+    - maxInflight: 동시에 AI 서버에 가 있는 요청 수 상한 (세마포어)
+    - 상한에 걸렸을 때: 대기열이 maxWaiting 이상이면 바로 거절, 아니면 최대 waitSec 기다렸다가 거절
+    """
+
+    STAGES = ("admit", "fetch", "predict", "mask", "db")
+
+    def __init__(self, maxInflight: int = 4, maxWaiting: int = 16, waitSec: float = 30):
+        self.maxInflight = maxInflight
+        self.maxWaiting = maxWaiting
+        self.waitSec = waitSec
+        self._sem = None
+        self._client = None
+        self.inflight = 0
+        self.waiting = 0
+        self._stageMs = {st: deque(maxlen=500) for st in self.STAGES}
+        self.stats = {"admitted": 0, "queued": 0, "rejected": 0, "ok": 0, "failed": 0}
+
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(TIMEOUT[1], connect=TIMEOUT[0]),
+                limits=httpx.Limits(max_connections=self.maxInflight * 2,
+                                    max_keepalive_connections=self.maxInflight),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.maxInflight)
+        t0 = time.perf_counter()
+        # 입장 중인 요청(waiting)까지 세어야 동시에 몰린 요청도 바로 판단할 수 있다
+        behind = self.inflight + self.waiting - self.maxInflight
+        if behind >= 0:
+            if behind >= self.maxWaiting:
+                self.stats["rejected"] += 1
+                raise AIBusyError(f"AI 호출 대기열 초과 (진행 {self.inflight}, 대기 {behind})")
+            self.stats["queued"] += 1
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), self.waitSec)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            raise AIBusyError(f"AI 호출 대기 {self.waitSec:.0f}초 초과")
+        finally:
+            self.waiting -= 1
+        self.record("admit", t0)
+        self.stats["admitted"] += 1
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self._sem.release()
+
+    def record(self, stage: str, t0: float):
+        self._stageMs[stage].append((time.perf_counter() - t0) * 1000)
+
+    @staticmethod
+    def _summary(values):
+        if not values:
+            return {"avg": None, "p95": None, "max": None}
+        s = sorted(values)
+        return {"avg": round(sum(s) / len(s), 1), "p95": round(s[min(len(s) - 1, int(len(s) * 0.95))], 1),
+                "max": round(s[-1], 1)}
+
+    def status(self) -> dict:
+        return dict(self.stats, inflight=self.inflight, waiting=self.waiting, max_inflight=self.maxInflight,
+                    max_waiting=self.maxWaiting, stage_ms={st: self._summary(list(v)) for st, v in self._stageMs.items()})
+
+
+# 프로세스 전체 공용
+aiGate = _AIGate(
+    maxInflight=int(os.environ.get("AI_MAX_INFLIGHT", "4")),
+    maxWaiting=int(os.environ.get("AI_MAX_WAITING", "16")),
+    waitSec=float(os.environ.get("AI_ADMISSION_WAIT_SEC", "30")),
+)
+
+
 class ImageAiDAO:
     """
     - 역할: 외부 AI 호출(/predict: 파일 업로드) → 응답 파싱 → Reports 갱신
-    - 사용 예: background_tasks.add_task(service.process_report, report_id, src_path_or_url, display_name)
+    - 사용 예: jobDAO.enqueue("ai", "ai.process_report", {"report_id": ..., "src": ...}) → jobWorker에서 호출
+              (큐를 못 쓰면 background_tasks.add_task(service.process_report_async, report_id, src_path_or_url))
+    - process_report_async: 공용 AsyncClient + aiGate 입장 제어, 스레드풀을 쓰지 않음 (DB 갱신만 to_thread)
+    - 같은 사진(SHA-256)을 이미 분석했으면 aiResultCache의 결과/마스크를 그대로 사용 (AI 호출 생략)
     """
     logging.basicConfig(level=logging.INFO)
     log = logging.getLogger("ai-call")
@@ -46,125 +171,388 @@ class ImageAiDAO:
         if not url_or_path:
             return None
 
-        # 이미지 다운로드
-        resp = requests.get(url_or_path, timeout=30)
-        resp.raise_for_status()
-
-        # 로컬에 저장
+        # 이미지 다운로드 → 메모리에 다 올리지 않고 청크 단위로 파일에 기록
         filename = os.path.basename(url_or_path)
         local_path = LOCAL_ANALYSIS_DIR / filename
-        with open(local_path, "wb") as f:
-            f.write(resp.content)
+        size = 0
+        with requests.get(url_or_path, timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            with open(local_path, "wb") as f:
+                for chunk in resp.iter_content(64 * 1024):
+                    f.write(chunk)
+                    size += len(chunk)
+        _count(mask_bytes=size)
 
         return str(local_path)
 
-    # ---------- 퍼블릭 메소드(BackgroundTasks에서 호출) ----------
-    def process_report(self, report_id: int, src: str = None, display_name: str = "input"):
+    # ---------- 퍼블릭 메소드(job 워커 / BackgroundTasks에서 호출) ----------
+    def process_report(self, report_id: int, src: str = None, display_name: str = "input", reraise: bool = False,
+                       src_url: str = None):
         """
-        1) ai_status = 'processing'
+        1) ai_state = 'processing' (이미 done이면 여기서 끝 — 재시도/중복 job)
         2) AI 호출(/predict - 파일 바이트 업로드)
         3) 응답 파싱 → (ai_status, caption_en, caption_ko, mask_url)
-        4) DB 업데이트
+        4) DB 업데이트 (saveAIResult 한 번 = 결과 + done + 점수, 한 트랜잭션)
+        src: registration_photos/의 로컬 경로(있으면 디스크에서 바로 스트리밍) 또는 URL
+        src_url: src 파일이 이 프로세스에 없을 때(다른 호스트의 워커 등) 받아올 공개 URL
+        reraise=True면 실패를 기록한 뒤 예외를 다시 던진다 (job 워커가 재시도하도록)
         """
-        # 1) processing 상태 기록
-        self.dao.updateAIStatus(report_id, "processing")
-        self.log.info("[process_report] report_id=%s → AI 분석 시작", report_id)
-
         try:
+            # 1) processing 상태 기록
+            if not self.dao.beginAIAnalysis(report_id):
+                self.log.info("[process_report] report_id=%s → 이미 분석 완료, 건너뜀", report_id)
+                return
+            self.log.info("[process_report] report_id=%s → AI 분석 시작", report_id)
+
             if not src:
                 # 필요 시 report_id로 원본 이미지 경로를 찾아오는 로직을 구현
                 # (현재 프로젝트 구조에 맞게 구현하세요)
                 raise ValueError("src(로컬 경로 또는 URL)가 지정되지 않았습니다.")
 
             # 2) AI 호출
-            data = self._call_ai(src, name=display_name)
+            _count(reports=1)
+            data = self._call_ai(src, name=display_name, src_url=src_url)
 
             # 3) 응답 매핑
             ai_status, caption_en, caption_ko, mask_url = self._map_response_to_fields(data)
 
             if mask_url:
-                local_mask_path = self._download_to_local(mask_url)  # ← 로컬 저장
+                # 같은 사진으로 받아 둔 마스크가 있으면 재사용
+                local_mask_path = self._cached_mask(data) or self._download_to_local(mask_url)  # ← 로컬 저장
             else:
                 local_mask_path = None
 
-            # 4) 결과 DB 업데이트
-            self.dao.updateAIResults(
+            # 4) 결과 DB 업데이트 + done 전이
+            self.dao.saveAIResult(
                 report_id=report_id,
                 ai_status=_safe_status(ai_status),
                 caption_en=caption_en,
                 caption_ko=caption_ko,
                 mask_url=local_mask_path  # ← 로컬 경로 저장 (원한다면 앱의 정적 서빙 URL로 변환)
             )
-            # 상태 OK로 정리
-        
-            self.dao.updateAIStatus(report_id, _safe_status(ai_status))
+            self._remember_result(data, local_mask_path)
             self.log.info("[process_report] report_id=%s → AI 분석 완료, status=%s", report_id, ai_status)
 
         except Exception as e:
             # 실패 이유를 DB에 기록 (열 길이 100 제한 대응)
             err_msg = _safe_status(f"failed:{str(e)}")
-            self.dao.updateAIStatus(report_id, err_msg)
+            self.dao.saveAIFailure(report_id, err_msg)
             self.log.error("[process_report] report_id=%s → AI 분석 실패: %s", report_id, e, exc_info=True)
-            # 필요시 여기서 재throw 하지 않고 종료해도 됨
-            # raise
+            if reraise:
+                raise
 
-    # ---------- 내부 유틸 ----------
-    def _call_ai(self, src: str, name: str = "input"):
-        url = f"{self.ai_base_url}/predict"
+    async def process_report_async(self, report_id: int, src: str = None, display_name: str = "input",
+                                   reraise: bool = False, src_url: str = None):
+        """
+        process_report의 async 버전. 단계별 시간(admit/fetch/predict/mask/db)은 aiGate.status()에 기록.
+        상한에 걸려 입장하지 못하면(AIBusyError) ai_status는 건드리지 않는다 — reraise면 job 재시도,
+        아니면 queued로 남아 /ai.backfill 대상 (배치 경로와 같음)
+        """
+        try:
+            async with aiGate.slot():
+                await self._process_async(report_id, src, display_name, src_url)
+            aiGate.stats["ok"] += 1
+        except AIBusyError as e:
+            self.log.warning("[process_report] report_id=%s → %s", report_id, e)
+            if reraise:
+                raise
+        except Exception as e:
+            aiGate.stats["failed"] += 1
+            err_msg = _safe_status(f"failed:{str(e)}")
+            await asyncio.to_thread(self.dao.saveAIFailure, report_id, err_msg)
+            self.log.error("[process_report] report_id=%s → AI 분석 실패: %s", report_id, e, exc_info=True)
+            if reraise:
+                raise
+
+    async def _process_async(self, report_id: int, src: str, display_name: str, src_url: str):
+        t0 = time.perf_counter()
+        started = await asyncio.to_thread(self.dao.beginAIAnalysis, report_id)
+        aiGate.record("db", t0)
+        if not started:
+            self.log.info("[process_report] report_id=%s → 이미 분석 완료, 건너뜀", report_id)
+            return
+        self.log.info("[process_report] report_id=%s → AI 분석 시작", report_id)
+        if not src:
+            raise ValueError("src(로컬 경로 또는 URL)가 지정되지 않았습니다.")
+
+        _count(reports=1)
+        data = await self._call_ai_async(src, name=display_name, src_url=src_url)
+        await self._apply_result_async(report_id, data)
+
+    async def _apply_result_async(self, report_id: int, data: dict):
+        """AI 응답 하나 → 마스크 저장 + DB 반영"""
+        ai_status, caption_en, caption_ko, mask_url = self._map_response_to_fields(data)
 
-        def is_url(s: str) -> bool:
-            s2 = s.strip().replace("\\", "/")
-            return s2.startswith("http://") or s2.startswith("https://")
+        t0 = time.perf_counter()
+        local_mask_path = (self._cached_mask(data) or await self._download_to_local_async(mask_url)) if mask_url else None
+        aiGate.record("mask", t0)
 
-        # ---- 원본 바이트/파일명/MIME 준비 ----
-        content_bytes = None
-        filename = "input.jpg"
-        mime = "application/octet-stream"
+        t0 = time.perf_counter()
+        await asyncio.to_thread(self.dao.saveAIResult, report_id=report_id, ai_status=_safe_status(ai_status),
+                                caption_en=caption_en, caption_ko=caption_ko, mask_url=local_mask_path)
+        aiGate.record("db", t0)
+        self._remember_result(data, local_mask_path)
+        self.log.info("[process_report] report_id=%s → AI 분석 완료, status=%s", report_id, ai_status)
 
-        if is_url(src):
-            src_url = src.strip().replace("\\", "/")
-            r = requests.get(src_url, timeout=TIMEOUT)
+    # ---------- 결과 캐시 (사진 SHA-256) ----------
+    def _cached_result(self, sha: str) -> Optional[dict]:
+        data = aiResultCache.get(sha)
+        if data is not None:
+            _count(cache_hits=1)
+            data["cached"] = True
+        return data
+
+    def _cached_mask(self, data: dict) -> Optional[str]:
+        p = data.get("local_mask_path")
+        return p if p and Path(p).exists() else None
+
+    def _remember_result(self, data: dict, local_mask_path: Optional[str]):
+        """정상 분석 결과만 저장 (오류 응답은 다음에 다시 분석)"""
+        sha = data.get("content_sha256")
+        if sha and data.get("status") in ("detected", "not_detected"):
+            aiResultCache.put(sha, dict(data, local_mask_path=local_mask_path, cached=False))
+
+    async def _open_source_async(self, src: str, src_url: str = None):
+        """원본 → (filename, 파일 객체, mime, size). 로컬 파일이 있으면 열기만, 없을 때만 URL에서 받기"""
+        client = aiGate.client()
+        if not _is_url(src) and Path(src).exists():
+            p = Path(src)
+            filename, size = p.name, p.stat().st_size
+            mime = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            fh = open(p, "rb")
+            _count(src_local=1)
+        else:
+            remote = src if _is_url(src) else src_url
+            if not remote:
+                raise FileNotFoundError(f"Local image not found: {src}")
+            remote = remote.strip().replace("\\", "/")
+            r = await client.get(remote)
             r.raise_for_status()
-            content_bytes = r.content
-            # 파일명/MIME 추정
-            tail = src_url.split("/")[-1]
-            if tail:
-                filename = tail
+            filename = remote.split("/")[-1] or "input.jpg"
             ct = r.headers.get("Content-Type", "")
-            if ct:
-                mime = ct.split(";")[0].strip()
-            else:
-                mime = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            mime = ct.split(";")[0].strip() if ct else (mimetypes.guess_type(filename)[0] or "application/octet-stream")
+            size = len(r.content)
+            fh = BytesIO(r.content)
+            _count(src_remote=1, fetched_bytes=size)
+        return filename, fh, mime, size
+
+    async def _call_ai_async(self, src: str, name: str = "input", src_url: str = None):
+        url = f"{self.ai_base_url}/predict"
+        client = aiGate.client()
+
+        t0 = time.perf_counter()
+        filename, fh, mime, size = await self._open_source_async(src, src_url)
+        try:
+            sha = await asyncio.to_thread(aiResultCache.hashFile, fh)
+        except Exception:
+            fh.close()
+            raise
+        aiGate.record("fetch", t0)
+        cached = self._cached_result(sha)
+        if cached is not None:
+            fh.close()
+            return cached
+
+        t0 = time.perf_counter()
+        try:
+            data = {"name": name}
+            resp = await client.post(url, files={"image": (filename, fh, mime)}, data=data)
+            _count(uploaded_bytes=size)
+            if resp.status_code == 422:
+                self.log.error("422 detail (image): %s", resp.text)
+                fh.seek(0)
+                resp = await client.post(url, files={"image": (filename, fh, mime)}, data=data)
+                _count(uploaded_bytes=size)
+            resp.raise_for_status()
+            return dict(resp.json(), content_sha256=sha)
+        finally:
+            fh.close()
+            aiGate.record("predict", t0)
+
+    # ---------- 배치 모드 ----------
+    async def process_reports_batch_async(self, items: List[dict]) -> List[Optional[Exception]]:
+        """
+        밀린 신고 여러 건을 /predict_batch 한 번으로 분석.
+        items: [{"report_id", "src", "src_url"}, ...] → 건별 결과 (None=성공, 예외=실패, 실패 사유는 ai_status에 기록)
+        상한에 걸려 입장하지 못한 건(AIBusyError)은 기록하지 않고 예외만 돌려준다 — job 재시도 / 다음 backfill 대상
+        AI 서버에 /predict_batch가 없으면(404/405) 한 건씩 /predict로 처리
+        """
+        results: List[Optional[Exception]] = [None] * len(items)
+        if not items:
+            return results
+        skipped = set()     # 이미 done인 신고 (재시도/중복 job) → 성공으로 보고 건너뜀
+        try:
+            async with aiGate.slot():
+                t0 = time.perf_counter()
+                started = await asyncio.to_thread(self.dao.beginAIAnalysisBatch, [it["report_id"] for it in items])
+                aiGate.record("db", t0)
+                skipped = {i for i, it in enumerate(items) if it["report_id"] not in started}
+                if skipped:
+                    self.log.info("[process_batch] report_ids=%s → 이미 분석 완료, 건너뜀",
+                                  [items[i]["report_id"] for i in sorted(skipped)])
+                todo = [i for i in range(len(items)) if i not in skipped]
+                if todo:
+                    batch = [items[i] for i in todo]
+                    self.log.info("[process_batch] report_ids=%s → AI 일괄 분석 시작", [it["report_id"] for it in batch])
+                    _count(reports=len(batch), batches=1)
+                    sub = await self._process_batch_items(batch)
+                    for i, err in zip(todo, sub):
+                        results[i] = err
+        except Exception as e:
+            # 입장 거절(AIBusyError) / 요청 자체 실패 → 전부 실패
+            results = [r if (r or i in skipped) else e for i, r in enumerate(results)]
+
+        for it, err in zip(items, results):
+            if err is None:
+                aiGate.stats["ok"] += 1
+                continue
+            if isinstance(err, AIBusyError):
+                self.log.warning("[process_batch] report_id=%s → %s", it["report_id"], err)
+                continue
+            aiGate.stats["failed"] += 1
+            self.log.error("[process_batch] report_id=%s → AI 분석 실패: %s", it["report_id"], err)
+            await asyncio.to_thread(self.dao.saveAIFailure, it["report_id"], _safe_status(f"failed:{err}"))
+        return results
+
+    async def _process_batch_items(self, items: List[dict]) -> List[Optional[Exception]]:
+        results: List[Optional[Exception]] = [None] * len(items)
+        datas = await self._call_ai_batch_async(items, results)
+        if datas is None:
+            # 배치 엔드포인트 없음 → 한 건씩
+            for i, it in enumerate(items):
+                if results[i] is None:
+                    try:
+                        data = await self._call_ai_async(it.get("src"), src_url=it.get("src_url"))
+                        await self._apply_result_async(it["report_id"], data)
+                    except Exception as e:
+                        results[i] = e
         else:
+            for i, (it, data) in enumerate(zip(items, datas)):
+                if results[i] is not None:
+                    continue
+                try:
+                    if data.get("status") == "error":
+                        raise RuntimeError(f"AI {data.get('code')}: {data.get('detail')}")
+                    await self._apply_result_async(it["report_id"], data)
+                except Exception as e:
+                    results[i] = e
+        return results
+
+    async def _call_ai_batch_async(self, items: List[dict], results: List[Optional[Exception]]):
+        """
+        원본을 모아 multipart 한 번으로 전송 → 보낸 순서대로 응답 목록 (없는 원본은 results에 예외로 표시)
+        서버에 /predict_batch가 없으면 None
+        """
+        url = f"{self.ai_base_url}/predict_batch"
+        datas = [{} for _ in items]
+        opened = []     # (items의 index, filename, fh, mime, size, sha) — 캐시에 없는 것만
+        t0 = time.perf_counter()
+        try:
+            for i, it in enumerate(items):
+                try:
+                    src = await self._open_source_async(it.get("src") or "", it.get("src_url"))
+                    try:
+                        sha = await asyncio.to_thread(aiResultCache.hashFile, src[1])
+                    except Exception:
+                        src[1].close()
+                        raise
+                    cached = self._cached_result(sha)
+                    if cached is not None:
+                        src[1].close()
+                        datas[i] = cached
+                    else:
+                        opened.append((i,) + src + (sha,))
+                except Exception as e:
+                    results[i] = e
+            aiGate.record("fetch", t0)
+            if not opened:
+                return datas
+
+            t0 = time.perf_counter()
+            files = [("images", (fn, fh, mime)) for (_i, fn, fh, mime, _s, _h) in opened]
+            resp = await aiGate.client().post(url, files=files)
+            if resp.status_code in (404, 405):
+                return None
+            resp.raise_for_status()
+            _count(uploaded_bytes=sum(o[4] for o in opened))
+            body = resp.json().get("results", [])
+            aiGate.record("predict", t0)
+        finally:
+            for o in opened:
+                o[2].close()
+
+        for k, o in enumerate(opened):
+            datas[o[0]] = dict(body[k], content_sha256=o[5]) if k < len(body) else {"status": "error", "detail": "응답 누락"}
+        return datas
+
+    async def _download_to_local_async(self, url: str) -> str:
+        local_path = LOCAL_ANALYSIS_DIR / os.path.basename(url)
+        size = 0
+        async with aiGate.client().stream("GET", url, timeout=30) as resp:
+            resp.raise_for_status()
+            with open(local_path, "wb") as f:
+                async for chunk in resp.aiter_bytes(64 * 1024):
+                    f.write(chunk)
+                    size += len(chunk)
+        _count(mask_bytes=size)
+        return str(local_path)
+
+    # ---------- 내부 유틸 ----------
+    def _call_ai(self, src: str, name: str = "input", src_url: str = None):
+        url = f"{self.ai_base_url}/predict"
+
+        # ---- 원본 준비: 로컬 파일이면 열어서 그대로 스트리밍, 없을 때만 URL에서 받기 ----
+        if not _is_url(src) and Path(src).exists():
             p = Path(src)
-            if not p.exists():
-                raise FileNotFoundError(f"Local image not found: {p}")
             filename = p.name
             mime = mimetypes.guess_type(filename)[0] or "application/octet-stream"
-            content_bytes = p.read_bytes()
+            _count(src_local=1)
+            with open(p, "rb") as fh:
+                sha = aiResultCache.hashFile(fh)
+                cached = self._cached_result(sha)
+                if cached is not None:
+                    return cached
+                return dict(self._post_predict(url, name, filename, fh, mime, p.stat().st_size), content_sha256=sha)
 
-        # ---- 1차 시도: 서버가 file 필드 기대하는 경우 ----
+        remote = src if _is_url(src) else src_url
+        if not remote:
+            raise FileNotFoundError(f"Local image not found: {src}")
+        src_url = remote.strip().replace("\\", "/")
+        r = requests.get(src_url, timeout=TIMEOUT)
+        r.raise_for_status()
+        content_bytes = r.content
+        _count(src_remote=1, fetched_bytes=len(content_bytes))
+        sha = hashlib.sha256(content_bytes).hexdigest()
+        cached = self._cached_result(sha)
+        if cached is not None:
+            return cached
+        # 파일명/MIME 추정
+        filename = src_url.split("/")[-1] or "input.jpg"
+        ct = r.headers.get("Content-Type", "")
+        if ct:
+            mime = ct.split(";")[0].strip()
+        else:
+            mime = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        return dict(self._post_predict(url, name, filename, BytesIO(content_bytes), mime, len(content_bytes)),
+                    content_sha256=sha)
+
+    def _post_predict(self, url: str, name: str, filename: str, fh, mime: str, size: int):
+        """multipart 업로드 (httpx는 파일 객체를 청크 단위로 읽어 보낸다)"""
         data = {"name": name}  # name이 Form(...) 여도 OK
-        files = {"image": (filename, BytesIO(content_bytes), mime)}
-        resp = requests.post(url, files=files, data=data, timeout=TIMEOUT)
+        resp = httpx.post(url, files={"image": (filename, fh, mime)}, data=data,
+                          timeout=httpx.Timeout(TIMEOUT[1], connect=TIMEOUT[0]))
+        _count(uploaded_bytes=size)
 
         if resp.status_code == 422:
-            # 검증 에러 상세를 로그로 남김
+            # 검증 에러 상세를 로그로 남기고 한 번 더 시도
             try:
-                self.log.error("422 detail (file): %s", resp.text)
+                self.log.error("422 detail (image): %s", resp.text)
             except Exception:
                 pass
-            # ---- 2차 시도: 서버가 image 필드 기대하는 경우 ----
-            files2 = {"image": (filename, BytesIO(content_bytes), mime)}
-            resp2 = requests.post(url, files=files2, data=data, timeout=TIMEOUT)
-            if resp2.status_code == 422:
-                try:
-                    self.log.error("422 detail (image): %s", resp2.text)
-                except Exception:
-                    pass
-                resp2.raise_for_status()
-            resp2.raise_for_status()
-            return resp2.json()
+            fh.seek(0)
+            resp = httpx.post(url, files={"image": (filename, fh, mime)}, data=data,
+                              timeout=httpx.Timeout(TIMEOUT[1], connect=TIMEOUT[0]))
+            _count(uploaded_bytes=size)
 
         resp.raise_for_status()
         return resp.json()
@@ -191,7 +579,3 @@ class ImageAiDAO:
         except:
             # 예상 외 응답
             raise ValueError(f"unknown AI response format: {json.dumps(data)[:200]}")
-
-    def update_ai_status(self, report_id, status_text):
-        # Oracle 업데이트 쿼리 실제 호출
-        self.dao.updateAIStatus(report_id, _safe_status(status_text))
\ No newline at end of file
@@ -0,0 +1,153 @@
+# 요청당 새 커넥션 vs 세션 풀 (SsyDBManager) 처리량 비교
+# 실행: python bench_db_pool.py --requests 600 --concurrency 1 8 32 --connect-ms 30 --query-ms 2
+# 요청 하나 = /registration.write처럼 DAO 호출 3번 (호출마다 커넥션 얻기 → 쿼리 1번 → 반납)
+#   connect : 풀 도입 전 방식 — DAO 호출마다 oracledb.connect() / close()
+#   pool    : SsyDBManager.conCur() — 프로세스 공용 풀에서 acquire / 반납
+# 실제 Oracle 대신 가짜 드라이버를 쓴다 (시뮬레이션):
+#   connect() 한 번 = --connect-ms (TCP + 인증 핸드셰이크), execute() 한 번 = --query-ms (DB 왕복)
+# 풀은 min개를 미리 열고 max개까지 늘리며, 남는 커넥션이 없으면 기다린다 (POOL_GETMODE_WAIT와 같은 동작).
+# FastAPI sync 엔드포인트가 스레드풀에서 도는 것처럼 --concurrency개 스레드로 요청을 보내 초당 요청 수를 출력한다
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import oracledb
+from ProjectDB.SSY import config
+from ProjectDB.SSY.ssyDBManager import SsyDBManager
+
+CALLS_PER_REQUEST = 3
+
+
+class FakeCursor:
+    def __init__(self, sim):
+        self.sim = sim
+
+    def execute(self, sql, params=None):
+        time.sleep(self.sim.queryDelay)
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, sim, pool=None):
+        self.sim, self.pool = sim, pool
+
+    def cursor(self):
+        return FakeCursor(self.sim)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        if self.pool:
+            self.pool._release(self)
+
+
+class FakePool:
+    def __init__(self, sim, min, max, **_kw):
+        self.sim, self.max = sim, max
+        self._idle = [sim.connect() for _ in range(min)]
+        self._opened = min
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while not self._idle and self._opened >= self.max:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._opened += 1
+        con = self.sim.connect()
+        con.pool = self
+        return con
+
+    def _release(self, con):
+        with self._cond:
+            self._idle.append(con)
+            self._cond.notify()
+
+    def close(self, force=False):
+        pass
+
+
+class FakeOracle:
+    def __init__(self, connectMs, queryMs):
+        self.connectDelay = connectMs / 1000
+        self.queryDelay = queryMs / 1000
+        self.connects = 0
+        self._lock = threading.Lock()
+
+    def connect(self, *_a, **_kw):
+        with self._lock:
+            self.connects += 1
+        time.sleep(self.connectDelay)
+        return FakeConnection(self)
+
+    def create_pool(self, **kw):
+        pool = FakePool(self, **kw)
+        for con in pool._idle:
+            con.pool = pool
+        return pool
+
+
+def request_connect():
+    # 풀 도입 전 makeConCur/closeConCur
+    for _ in range(CALLS_PER_REQUEST):
+        con = oracledb.connect(config.ORACLE_URL)
+        cur = con.cursor()
+        try:
+            cur.execute("SELECT 1 FROM dual")
+            cur.fetchone()
+        finally:
+            cur.close()
+            con.close()
+
+
+def request_pool():
+    for _ in range(CALLS_PER_REQUEST):
+        with SsyDBManager.conCur() as (con, cur):
+            cur.execute("SELECT 1 FROM dual")
+            cur.fetchone()
+
+
+def run(fn, requests, concurrency):
+    with ThreadPoolExecutor(concurrency) as ex:
+        t0 = time.perf_counter()
+        list(ex.map(lambda _: fn(), range(requests)))
+        return requests / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=600)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    ap.add_argument("--connect-ms", type=float, default=30, help="connect() 1회 지연(ms, 시뮬레이션)")
+    ap.add_argument("--query-ms", type=float, default=2, help="쿼리 1회 왕복 지연(ms, 시뮬레이션)")
+    args = ap.parse_args()
+
+    sim = FakeOracle(args.connect_ms, args.query_ms)
+    oracledb.connect = sim.connect
+    oracledb.create_pool = sim.create_pool
+
+    print(f"simulated connect={args.connect_ms}ms query={args.query_ms}ms calls/request={CALLS_PER_REQUEST} "
+          f"pool min={config.POOL_MIN} max={config.POOL_MAX}")
+    print(f"{'threads':>7} {'connect req/s':>14} {'pool req/s':>11} {'speedup':>8} {'connects':>15}")
+    for concurrency in args.concurrency:
+        sim.connects = 0
+        rps_connect = run(request_connect, args.requests, concurrency)
+        connects_old = sim.connects
+
+        SsyDBManager.closePool()
+        sim.connects = 0
+        rps_pool = run(request_pool, args.requests, concurrency)
+        print(f"{concurrency:>7} {rps_connect:>14.0f} {rps_pool:>11.0f} {rps_pool / rps_connect:>7.1f}x"
+              f" {connects_old:>7} -> {sim.connects:<5}")
+    SsyDBManager.closePool()
+
+
+if __name__ == "__main__":
+    main()
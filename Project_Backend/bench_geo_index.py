@@ -0,0 +1,59 @@
+# SsyGeoIndex.nearby vs 전체 훑기 비교 (주변 신고 조회)
+# 실행: python bench_geo_index.py --reports 100000 --queries 500 --radius 300 1000 3000
+# 서울 범위 안에 무작위 신고 좌표를 만든 뒤, 같은 질의를
+#   full  : 모든 신고에 haversine 거리 계산 (인덱스 도입 전 방식, DB 왕복은 제외한 순수 계산만)
+#   index : SsyGeoIndex.nearby (반경을 덮는 격자 칸만)
+# 으로 처리해 질의당 시간(ms)과 결과 일치 여부를 출력한다
+import argparse
+import random
+import time
+from ProjectDB.SSY.ssyGeoIndex import SsyGeoIndex
+
+SOUTH, NORTH, WEST, EAST = 37.45, 37.70, 126.80, 127.20
+
+
+def full_scan(points, lat, lng, radius):
+    found = []
+    for key, plat, plng in points:
+        d = SsyGeoIndex.distanceM(lat, lng, plat, plng)
+        if d <= radius:
+            found.append((key, d))
+    found.sort(key=lambda kd: kd[1])
+    return found
+
+
+def timed(fn, queries):
+    t0 = time.perf_counter()
+    out = [fn(lat, lng) for lat, lng in queries]
+    return (time.perf_counter() - t0) * 1000 / len(queries), out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--reports", type=int, default=100000)
+    ap.add_argument("--queries", type=int, default=500)
+    ap.add_argument("--full-queries", type=int, default=20, help="full scan은 느리므로 질의 수를 따로")
+    ap.add_argument("--radius", type=float, nargs="+", default=[300, 1000, 3000])
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    points = [(i, rnd.uniform(SOUTH, NORTH), rnd.uniform(WEST, EAST)) for i in range(args.reports)]
+    queries = [(rnd.uniform(SOUTH, NORTH), rnd.uniform(WEST, EAST)) for _ in range(args.queries)]
+
+    index = SsyGeoIndex()
+    t0 = time.perf_counter()
+    index.load(points)
+    print(f"reports={args.reports} load={time.perf_counter() - t0:.2f}s cells={len(index._cells)}")
+    print(f"{'radius m':>9} {'avg hits':>9} {'full ms':>9} {'index ms':>9} {'speedup':>8} {'same':>5}")
+    for radius in args.radius:
+        ms_idx, res_idx = timed(lambda la, ln: index.nearby(la, ln, radius), queries)
+        sample = queries[:args.full_queries]
+        ms_full, res_full = timed(lambda la, ln: full_scan(points, la, ln, radius), sample)
+        same = all([k for k, _ in a] == [k for k, _ in b] for a, b in zip(res_full, res_idx))
+        hits = sum(len(r) for r in res_idx) / len(res_idx)
+        print(f"{radius:>9.0f} {hits:>9.1f} {ms_full:>9.2f} {ms_idx:>9.3f} {ms_full / ms_idx:>7.0f}x {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# 알림함 조회 쿼리 비교 (NotificationDAO.list)
+# 실행: python bench_inbox_query.py --notifications 10000 100000 --users 2000 --queries 200
+# Oracle 대신 sqlite3(메모리 DB)에 notifications/users 가짜 데이터를 만들고 같은 사용자들의 알림함을
+#   old : d93af49 이전 쿼리 — 행마다 UPPER/TRIM/INSTR + 주소 REGEXP 서브쿼리 (인덱스를 못 타서 전체 훑기)
+#   new : _recipient_keys로 키를 미리 계산한 recipient_code IN (...) + (recipient_code, sent_at DESC) 인덱스
+# 로 조회해 질의당 시간(ms), 초당 처리 수, 결과 일치 여부를 출력한다.
+# SQLite 수치는 Oracle과 절대값이 다르다 — 실행 계획 모양(전체 훑기 vs 키별 인덱스 범위 조회)의 차이를 보는 용도
+import argparse
+import random
+import re
+import sqlite3
+import time
+from ProjectDB.Notification.notificationDAO import NotificationDAO, _region_of
+
+ADDRESSES = ["서울특별시 강남구 역삼동", "서울특별시 마포구 합정동", "부산광역시 해운대구 우동",
+             "인천광역시 남동구 구월동", "경기도 수원시 팔달구 인계동", "경기도 성남시 분당구 정자동"]
+
+# d93af49 이전 _SQL_INBOX (Oracle 전용 문법만 SQLite로 바꿈: ROWNUM → LIMIT, TO_CHAR 제거)
+SQL_OLD = """
+    SELECT n.notification_id, n.content, n.sent_at, n.sender, n.recipient_code
+    FROM notifications n
+    WHERE
+        UPPER(n.recipient_code) = 'USER_ALL'
+        OR UPPER(n.recipient_code) = 'NAME_' || UPPER(TRIM(:p_uid))
+        OR (
+            INSTR(TRIM(:p_uid), '@') > 0 AND
+            UPPER(n.recipient_code) = 'NAME_' || UPPER(SUBSTR(TRIM(:p_uid), 1, INSTR(TRIM(:p_uid), '@') - 1))
+        )
+        OR n.recipient_code = 'LOCATION_' || (
+            SELECT
+                CASE
+                    WHEN REGEXP_LIKE(address, '^서울특별시') THEN 'SEOUL'
+                    WHEN REGEXP_LIKE(address, '^부산광역시') THEN 'BUSAN'
+                    WHEN REGEXP_LIKE(address, '^인천광역시') THEN 'INCHEON'
+                    WHEN REGEXP_LIKE(address, '^경기도') THEN 'GYEONGGI'
+                    ELSE ''
+                END
+            FROM users
+            WHERE UPPER(TRIM(user_id)) = UPPER(TRIM(:p_uid)) LIMIT 1
+        )
+        OR n.recipient_code = 'LOCATION_' || (
+            SELECT REGEXP_SUBSTR(address, '([^ ]+구)')
+            FROM users
+            WHERE UPPER(TRIM(user_id)) = UPPER(TRIM(:p_uid)) LIMIT 1
+        )
+    ORDER BY n.sent_at DESC NULLS LAST
+    LIMIT :p_lim
+"""
+
+SQL_NEW = """
+    SELECT n.notification_id, n.content, n.sent_at, n.sender, n.recipient_code
+    FROM notifications n
+    WHERE n.recipient_code IN ({keys})
+    ORDER BY n.sent_at DESC NULLS LAST
+    LIMIT :p_lim
+"""
+
+
+def setup(n_notifications, n_users, seed):
+    rnd = random.Random(seed)
+    db = sqlite3.connect(":memory:")
+    db.create_function("REGEXP_LIKE", 2, lambda s, p: int(bool(s and re.search(p, s))), deterministic=True)
+    db.create_function("REGEXP_SUBSTR", 2, lambda s, p: (m.group(0) if s and (m := re.search(p, s)) else None),
+                       deterministic=True)
+    db.execute("CREATE TABLE users (user_id TEXT PRIMARY KEY, address TEXT)")
+    db.execute("CREATE TABLE notifications (notification_id INTEGER PRIMARY KEY, content TEXT, sent_at TEXT,"
+               " sender TEXT, recipient_code TEXT)")
+    users = [f"user{i}" for i in range(n_users)]
+    db.executemany("INSERT INTO users VALUES (?, ?)", [(u, rnd.choice(ADDRESSES)) for u in users])
+
+    codes = ["USER_ALL"] + [f"LOCATION_{c}" for c in ("SEOUL", "BUSAN", "INCHEON", "GYEONGGI")]
+    codes += sorted({f"LOCATION_{_region_of(a)[1]}" for a in ADDRESSES})
+    rows = []
+    for i in range(n_notifications):
+        # 대부분은 개인 알림, 일부는 전체/지역 브로드캐스트
+        rc = rnd.choice(codes) if rnd.random() < 0.05 else f"NAME_{rnd.choice(users).upper()}"
+        rows.append((i + 1, f"알림 {i}", f"2025-{1 + i * 12 // n_notifications:02d}-01 {i:09d}", "admin", rc))
+    db.executemany("INSERT INTO notifications VALUES (?, ?, ?, ?, ?)", rows)
+    db.execute("CREATE INDEX notifications_rc_sent_ix ON notifications (recipient_code, sent_at DESC)")
+    db.execute("ANALYZE")
+    return db, users
+
+
+def query_old(db, uid, limit):
+    return db.execute(SQL_OLD, {"p_uid": uid, "p_lim": limit}).fetchall()
+
+
+def query_new(db, uid, address, limit):
+    # 실제 앱에서는 지역 코드가 _regionCache에 있으므로 주소 파싱도 요청마다 하지 않는다
+    params = NotificationDAO._recipient_keys(uid, _region_of(address))
+    keys = ", ".join(f":{k}" for k in params)
+    params["p_lim"] = limit
+    return db.execute(SQL_NEW.format(keys=keys), params).fetchall()
+
+
+def timed(fn, items):
+    t0 = time.perf_counter()
+    out = [fn(x) for x in items]
+    return (time.perf_counter() - t0) * 1000 / len(items), out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--notifications", type=int, nargs="+", default=[10000, 100000])
+    ap.add_argument("--users", type=int, default=2000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    print(f"users={args.users} queries={args.queries} limit={args.limit} (sqlite {sqlite3.sqlite_version})")
+    print(f"{'rows':>8} {'old ms':>8} {'new ms':>8} {'old q/s':>8} {'new q/s':>8} {'speedup':>8} {'same':>5}")
+    for n in args.notifications:
+        db, users = setup(n, args.users, args.seed)
+        address = dict(db.execute("SELECT user_id, address FROM users"))
+        rnd = random.Random(args.seed + n)
+        sample = [rnd.choice(users) for _ in range(args.queries)]
+        ms_old, res_old = timed(lambda u: query_old(db, u, args.limit), sample)
+        ms_new, res_new = timed(lambda u: query_new(db, u, address[u], args.limit), sample)
+        same = res_old == res_new
+        print(f"{n:>8} {ms_old:>8.2f} {ms_new:>8.3f} {1000 / ms_old:>8.0f} {1000 / ms_new:>8.0f}"
+              f" {ms_old / ms_new:>7.0f}x {str(same):>5}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# 알림 일괄 INSERT 비교 (전체/지역 공지 fan-out)
+# 실행: python bench_notification_bulk.py --recipients 10000 100000 --rtt-ms 0.3
+#   per-row : 1a1ea41 이전 방식 — 수신자마다 cur.execute 한 번 (DB 왕복 N번)
+#   bulk    : NotificationDAO.insert_notifications_bulk — BULK_CHUNK건씩 executemany (왕복 N/BULK_CHUNK번)
+# DB 대신 가짜 커서를 쓰고 execute/executemany 호출마다 --rtt-ms 만큼 기다린다
+# (네트워크 왕복 시뮬레이션, 실제 Oracle 아님. 서버 쪽 INSERT 비용은 포함하지 않는다).
+# 전체 시간(s), 초당 처리 건수, DB 왕복 수를 출력한다
+import argparse
+import logging
+import time
+from contextlib import contextmanager
+import ProjectDB.Notification.notificationDAO as notifyModule
+from ProjectDB.Notification.notificationDAO import BULK_CHUNK, NotificationDAO
+
+SQL_ONE = """
+    INSERT INTO notifications (notification_id, content, sender, recipient_code)
+    VALUES (notification_seq.NEXTVAL, :p_content, :p_sender, :p_rc)
+    RETURNING notification_id INTO :p_new_id
+"""
+
+
+class FakeVar:
+    def __init__(self, arraysize=1):
+        self.values = [None] * arraysize
+
+    def getvalue(self, i=0):
+        return [self.values[i]]
+
+
+class FakeCursor:
+    """execute/executemany 한 번 = DB 왕복 한 번 (rtt 만큼 대기), 시퀀스 값을 RETURNING 변수에 채운다"""
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.seq = 0
+        self.roundTrips = 0
+        self._out = None
+
+    def _roundTrip(self):
+        self.roundTrips += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def var(self, typ, arraysize=1):
+        return FakeVar(arraysize)
+
+    def setinputsizes(self, *sizes):
+        self._out = sizes[-1]
+
+    def execute(self, sql, params):
+        self._roundTrip()
+        self.seq += 1
+        params["p_new_id"].values[0] = self.seq
+
+    def executemany(self, sql, rows, batcherrors=False):
+        self._roundTrip()
+        for i in range(len(rows)):
+            self.seq += 1
+            self._out.values[i] = self.seq
+
+    def getbatcherrors(self):
+        return []
+
+
+class FakeCon:
+    def __init__(self, cur):
+        self.cur = cur
+
+    def commit(self):
+        self.cur._roundTrip()
+
+    def rollback(self):
+        pass
+
+
+def per_row(cur, con, recipients, content, sender):
+    # 1a1ea41 이전 insert_notifications_bulk 의 루프
+    ids = []
+    for rc in recipients:
+        out_id = cur.var(int)
+        params = {"p_content": content, "p_sender": sender,
+                  "p_rc": NotificationDAO._normalize_recipient_code(rc), "p_new_id": out_id}
+        cur.execute(SQL_ONE, params)
+        new_id = out_id.getvalue()
+        if isinstance(new_id, (list, tuple)):
+            new_id = new_id[0]
+        ids.append(int(new_id) if new_id is not None else None)
+    con.commit()
+    return ids
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--recipients", type=int, nargs="+", default=[10000, 100000])
+    ap.add_argument("--rtt-ms", type=float, default=0.3, help="DB 왕복 1회 지연(ms, 시뮬레이션)")
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    rtt = args.rtt_ms / 1000
+    holder = {}
+
+    @contextmanager
+    def fakeConCur():
+        yield holder["con"], holder["cur"]
+    notifyModule.SsyDBManager.conCur = staticmethod(fakeConCur)
+    # bulk 쪽 시간에는 알림함 인덱스 갱신/SSE 발행(구독자 없음)도 포함된다
+    dao = NotificationDAO()
+
+    print(f"rtt={args.rtt_ms}ms (simulated) BULK_CHUNK={BULK_CHUNK}")
+    print(f"{'recipients':>10} {'mode':>8} {'seconds':>8} {'rows/s':>10} {'round trips':>12} {'speedup':>8}")
+    for n in args.recipients:
+        recipients = [f"user{i}@example.com" for i in range(n)]
+        cur = FakeCursor(rtt)
+        t0 = time.perf_counter()
+        old_ids = per_row(cur, FakeCon(cur), recipients, "공지", "admin")
+        s_old, trips_old = time.perf_counter() - t0, cur.roundTrips
+
+        cur = FakeCursor(rtt)
+        holder.update(cur=cur, con=FakeCon(cur))
+        t0 = time.perf_counter()
+        res = dao.insert_notifications_bulk("공지", "admin", recipients)
+        s_new, trips_new = time.perf_counter() - t0, cur.roundTrips
+        assert res["ids"] == old_ids and res["inserted"] == n
+
+        print(f"{n:>10} {'per-row':>8} {s_old:>8.2f} {n / s_old:>10.0f} {trips_old:>12}")
+        print(f"{n:>10} {'bulk':>8} {s_new:>8.2f} {n / s_new:>10.0f} {trips_new:>12} {s_old / s_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
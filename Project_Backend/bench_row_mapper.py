@@ -0,0 +1,112 @@
+# SsyRowMapper.mapRows vs 예전 행별 변환 비교 (getAllStatuses 같은 CLOB 포함 목록 조회)
+# 실행: python bench_row_mapper.py --rows 10000 --lob-ms 0 0.2
+# Maintenance_Status 모양(NUMBER, VARCHAR, CLOB 2개, TIMESTAMP)의 가짜 행을 만든 뒤
+#   old : fetch_lobs=True 시절 방식 — CLOB이 LOB locator로 와서 행마다 컬럼별 read(), 값마다 hasattr/strftime 검사
+#   new : fetch_lobs=False + SsyRowMapper.mapRows — CLOB은 이미 str, 변환 함수는 description 기준으로 한 번만 선택
+# 으로 dict 목록을 만드는 시간(ms)을 출력한다.
+# --lob-ms 는 LOB.read() 한 번의 DB 왕복을 흉내 낸 지연(시뮬레이션, 실제 DB 아님). 0이면 순수 파이썬 변환 비용만 잰다
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+import oracledb
+from ProjectDB.SSY.ssyRowMapper import SsyRowMapper
+
+DESCRIPTION = [
+    ("STATUS_ID", oracledb.DB_TYPE_NUMBER),
+    ("REPORT_ID", oracledb.DB_TYPE_NUMBER),
+    ("CURRENT_STATUS", oracledb.DB_TYPE_VARCHAR),
+    ("DAMAGE_INFO_DETAILS", oracledb.DB_TYPE_CLOB),
+    ("FACILITY_TYPE", oracledb.DB_TYPE_VARCHAR),
+    ("MANAGER_NICKNAME", oracledb.DB_TYPE_VARCHAR),
+    ("MANAGER_COMMENTS", oracledb.DB_TYPE_CLOB),
+    ("LAST_UPDATED_DATE", oracledb.DB_TYPE_TIMESTAMP),
+]
+LOB_COLUMNS = (3, 6)
+
+
+class FakeLob:
+    """LOB locator 흉내: read()마다 지정한 지연만큼 기다린다 (DB 왕복 시뮬레이션)"""
+
+    def __init__(self, text, delay):
+        self.text = text
+        self.delay = delay
+
+    def read(self):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.text
+
+
+def make_rows(n, seed):
+    rnd = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    rows = []
+    for i in range(n):
+        rows.append((
+            i + 1,
+            rnd.randint(1, n),
+            rnd.choice(["접수", "처리중", "완료"]),
+            "도로 파손 " * rnd.randint(5, 40),
+            rnd.choice(["도로", "가로등", "보도블럭"]),
+            f"manager{rnd.randint(1, 50)}",
+            "현장 확인 후 보수 예정 " * rnd.randint(1, 10),
+            base + timedelta(minutes=i),
+        ))
+    return rows
+
+
+def old_way(rows):
+    # 18283fd 이전 ManagementStatusDAO.getAllStatuses 의 행 처리
+    result = []
+    for r in rows:
+        damage = r[3]
+        if hasattr(damage, "read"):
+            damage = damage.read()
+            if isinstance(damage, bytes):
+                damage = damage.decode("utf-8")
+        comments = r[6]
+        if hasattr(comments, "read"):
+            comments = comments.read()
+            if isinstance(comments, bytes):
+                comments = comments.decode("utf-8")
+        result.append({
+            "status_id": r[0],
+            "report_id": r[1],
+            "current_status": r[2],
+            "damage_info_details": damage,
+            "facility_type": r[4],
+            "manager_nickname": r[5],
+            "manager_comments": comments,
+            "last_updated_date": r[7].strftime("%Y-%m-%d %H:%M:%S") if r[7] else None,
+        })
+    return result
+
+
+def timed(fn, rows):
+    t0 = time.perf_counter()
+    out = fn(rows)
+    return (time.perf_counter() - t0) * 1000, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10000)
+    ap.add_argument("--lob-ms", type=float, nargs="+", default=[0, 0.2], help="LOB.read() 1회 지연(ms, 시뮬레이션)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rows = make_rows(args.rows, args.seed)
+    print(f"rows={args.rows} columns={len(DESCRIPTION)} lob columns={len(LOB_COLUMNS)}")
+    print(f"{'lob ms':>7} {'old ms':>9} {'new ms':>9} {'speedup':>8} {'same':>5}")
+    for lob_ms in args.lob_ms:
+        lob_rows = [tuple(FakeLob(v, lob_ms / 1000) if i in LOB_COLUMNS else v for i, v in enumerate(r))
+                    for r in rows]
+        ms_old, res_old = timed(old_way, lob_rows)
+        ms_new, res_new = timed(lambda rs: SsyRowMapper.mapRows(DESCRIPTION, rs), rows)
+        same = res_old == res_new
+        print(f"{lob_ms:>7.1f} {ms_old:>9.1f} {ms_new:>9.1f} {ms_old / ms_new:>7.1f}x {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# 로컬 테스트용 Expo 푸시 서버 흉내
+# 실행: uvicorn fakeExpoServer:app --port 8081
+# 백엔드 쪽: EXPO_PUSH_URL=http://127.0.0.1:8081/--/api/v2/push/send
+#
+# 환경 변수
+#   FAKE_EXPO_LATENCY_MS  요청당 지연 (기본 50)
+#   FAKE_EXPO_429_RATE    429 응답 비율 (0~1, 기본 0)
+#   FAKE_EXPO_5XX_RATE    503 응답 비율 (0~1, 기본 0)
+# 토큰에 "Invalid"가 들어 있으면 DeviceNotRegistered 에러로 응답
+import asyncio
+import os
+import random
+import uuid
+from typing import Union, List
+from fastapi import FastAPI, Body
+from fastapi.responses import JSONResponse
+
+app = FastAPI()
+
+LATENCY = float(os.environ.get("FAKE_EXPO_LATENCY_MS", "50")) / 1000
+RATE_429 = float(os.environ.get("FAKE_EXPO_429_RATE", "0"))
+RATE_5XX = float(os.environ.get("FAKE_EXPO_5XX_RATE", "0"))
+
+# 발급한 ticket id -> receipt
+receipts = {}
+stats = {"requests": 0, "messages": 0, "throttled": 0, "unavailable": 0, "max_batch": 0}
+
+def _ticket(msg: dict) -> dict:
+    token = str(msg.get("to", ""))
+    if not token.startswith("ExponentPushToken[") and not token.startswith("ExpoPushToken["):
+        return {"status": "error", "message": f'"{token}" is not a valid Expo push token',
+                "details": {"error": "DeviceNotRegistered"}}
+    ticket_id = str(uuid.uuid4())
+    if "Invalid" in token:
+        receipts[ticket_id] = {"status": "error", "message": f'"{token}" is not a registered push notification recipient',
+                               "details": {"error": "DeviceNotRegistered"}}
+    else:
+        receipts[ticket_id] = {"status": "ok"}
+    return {"status": "ok", "id": ticket_id}
+
+@app.post("/--/api/v2/push/send")
+async def push_send(messages: Union[List[dict], dict] = Body(...)):
+    stats["requests"] += 1
+    await asyncio.sleep(LATENCY)
+    if random.random() < RATE_429:
+        stats["throttled"] += 1
+        return JSONResponse({"errors": [{"code": "TOO_MANY_REQUESTS"}]}, status_code=429)
+    if random.random() < RATE_5XX:
+        stats["unavailable"] += 1
+        return JSONResponse({"errors": [{"code": "INTERNAL_SERVER_ERROR"}]}, status_code=503)
+
+    batch = messages if isinstance(messages, list) else [messages]
+    if len(batch) > 100:
+        return JSONResponse({"errors": [{"code": "PUSH_TOO_MANY_NOTIFICATIONS",
+                                         "message": "You are trying to send more than 100 push notifications in one request."}]},
+                            status_code=400)
+    stats["messages"] += len(batch)
+    stats["max_batch"] = max(stats["max_batch"], len(batch))
+    return {"data": [_ticket(m) for m in batch]}
+
+@app.post("/--/api/v2/push/getReceipts")
+async def push_receipts(ids: List[str] = Body(..., embed=True)):
+    await asyncio.sleep(LATENCY)
+    if len(ids) > 1000:
+        return JSONResponse({"errors": [{"code": "TOO_MANY_IDS"}]}, status_code=400)
+    return {"data": {i: receipts[i] for i in ids if i in receipts}}
+
+@app.get("/stats")
+def get_stats():
+    return dict(stats, receipts=len(receipts))
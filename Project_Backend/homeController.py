@@ -1,12 +1,28 @@
 import sys
 import os
-from fastapi import Body, FastAPI, Form, UploadFile, HTTPException, File, BackgroundTasks, Request, APIRouter, Query, Depends, Header
-from ProjectDB.Account.accountDAO import AccountDAO
-from ProjectDB.Registration.RegistrationDAO import RegistrationDAO
+from fastapi import Body, FastAPI, Form, UploadFile, HTTPException, File, BackgroundTasks, Request, Response, APIRouter, Query, Depends, Header
+from ProjectDB.Account.accountDAO import AccountDAO, rankingBoard
+from ProjectDB.Registration.RegistrationDAO import RegistrationDAO, reportDedup
 from ProjectDB.ManagementStatus.ManagementStatusDAO import ManagementStatusDAO
 from ProjectDB.Notice.noticeDAO import NoticeDAO
-from ProjectDB.imageAI.imageAiDAO import ImageAiDAO
-from ProjectDB.Notification.notificationDAO import NotificationDAO
+from ProjectDB.imageAI.imageAiDAO import ImageAiDAO, transferStats, aiGate
+from ProjectDB.imageAI.aiResultCache import aiResultCache
+from ProjectDB.Notification.notificationDAO import NotificationDAO, inboxIndex
+from ProjectDB.Notification.pushDispatcher import PushDispatcher, pushDispatcher
+from ProjectDB.Notification.receiptPoller import receiptPoller
+from ProjectDB.Notification.adminDigest import adminDigest
+from ProjectDB.Notification.notifyService import (
+    adminRecipients, localRecipients, reportPosition, saveNotifications, saveLocalNotifications,
+    pushMessages, notifyAdmins, notifyLocal,
+)
+from ProjectDB.Job.jobDAO import jobDAO
+from ProjectDB.SSY.ssyDBManager import SsyDBManager
+from ProjectDB.SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from ProjectDB.SSY.ssyCache import responseCache
+from ProjectDB.SSY.ssyETag import SsyETag
+from ProjectDB.SSY.ssyEventBroker import SsyEventBroker, eventBroker, isLoopback
+from ProjectDB.SSY import config
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional,Dict, List
 from fastapi.staticfiles import StaticFiles
@@ -17,8 +33,7 @@ import jwt
 # 개인정보 수정
 from pydantic import BaseModel,Field,constr
 from urllib.parse import unquote # ADMIN 랭킹 개인정보 확인
-from token_utils import create_access_token, create_refresh_token, REFRESH_SECRET_KEY, SECRET_KEY, ALGORITHM, EXPO_PUSH_URL
-import httpx
+from token_utils import create_access_token, create_refresh_token, REFRESH_SECRET_KEY, SECRET_KEY, ALGORITHM
 
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
@@ -115,6 +130,30 @@ from ai.whisper_gpt.whisper_gpt import process_audio_and_get_structured_data
 app = FastAPI()
 router = APIRouter()
 
+# 서버 시작 시 in-process 인덱스 적재
+@app.on_event("startup")
+def loadIndexes():
+    rDAO.loadReportIndex()
+    aDAO.loadRanking()
+    aDAO.loadHomeIndex()
+    notifyDAO.loadInboxIndex()
+
+# 푸시 전송 워커 + receipt 폴러 시작
+@app.on_event("startup")
+async def startPushDispatcher():
+    await pushDispatcher.start()
+    await receiptPoller.start()
+
+# 서버 종료 시 DB 세션 풀 정리
+@app.on_event("shutdown")
+async def closeDBPool():
+    await adminDigest.stop()
+    await aiGate.aclose()
+    await pushDispatcher.stop()
+    await receiptPoller.stop()
+    SsyDBManager.closePool()
+    await SsyAsyncDBManager.closePool()
+
 BASE_DIR = os.path.dirname(__file__)
 INPUT_DIR = os.path.join(BASE_DIR, "input_images")
 MASK_DIR  = os.path.join(BASE_DIR, "mask_images")
@@ -136,7 +175,25 @@ registration_photo_folder = os.path.join(os.path.dirname(__file__), 'registratio
 os.makedirs(registration_photo_folder, exist_ok=True)
 app.mount("/registration_photos", StaticFiles(directory=registration_photo_folder), name="registration_photos")
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# 조건부 응답: 클라이언트의 If-None-Match가 현재 ETag와 같으면 행 조회/직렬화 없이 304
+# (버전 문자열은 응답 캐시에 같이 두어 쓰기 경로의 invalidate 때까지 DB를 다시 보지 않음)
+def reportsETag(*params):
+    version = responseCache.getOrLoad("reports", "version", rDAO.getReportsVersion)
+    return SsyETag.make("reports", version, *params) if version else None
+
+def conditional(request: Request, response: Response, etag, load):
+    if etag and SsyETag.matches(request.headers.get("if-none-match"), etag):
+        return SsyETag.notModified(etag)
+    result = load()
+    return SsyETag.attach(result, response, etag) if etag else result
+
+async def conditionalAsync(request: Request, response: Response, etag, load):
+    if etag and SsyETag.matches(request.headers.get("if-none-match"), etag):
+        return SsyETag.notModified(etag)
+    result = await load()
+    return SsyETag.attach(result, response, etag) if etag else result
 
 
 # 회원가입 API 엔드포인트
@@ -191,7 +248,7 @@ def getRanking(user_id: str):
     # 사용자 랭킹을 조회
     # 랭킹은 점수(score) 기준으로 내림차순 정렬
     try:
-        ranking = aDAO.getRanking(user_id)
+        ranking = responseCache.getOrLoad("ranking", user_id, lambda: aDAO.getRanking(user_id))
         if not ranking:
             return JSONResponse(status_code=404, content={"error": "랭킹 정보가 없습니다."})
         return ranking.body
@@ -199,6 +256,38 @@ def getRanking(user_id: str):
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
+# 신고 등록 후 작업(AI 분석, 알림)은 jobs 테이블에 넣고 별도 프로세스(jobWorker.py)가 처리
+# JOB_QUEUE=off 이거나 enqueue가 실패하면 예전처럼 이 프로세스의 BackgroundTasks로 실행
+JOB_QUEUE = os.environ.get("JOB_QUEUE", "on") != "off"
+
+async def enqueueJob(background_tasks: BackgroundTasks, queue: str, kind: str, payload: dict, fallback,
+                     max_attempts: int = 5):
+    if JOB_QUEUE:
+        try:
+            return await run_in_threadpool(jobDAO.enqueue, queue, kind, payload, 0, max_attempts)
+        except Exception as e:
+            print(f"[jobs] {kind} enqueue 실패, 프로세스 내 실행으로 대체: {e}")
+    background_tasks.add_task(fallback, **payload)
+
+# AI 분석 job payload — 저장된 파일을 디스크에서 바로 올리고, 파일이 없는 곳(다른 호스트 워커)에서만 URL로 받음
+def aiJobPayload(request: Request, report_id: int, photo_filename: str) -> dict:
+    base = str(request.base_url).rstrip("/")
+    return {"report_id": report_id,
+            "src": os.path.join(registration_photo_folder, photo_filename),
+            "src_url": f"{base}/registration_photos/{photo_filename}"}
+
+# 관리자 digest 한 묶음 → notify.admins job 하나 (푸시 1건 + ADMIN_ALL 알림 1행)
+async def sendAdminDigest(title: str, body: str, data: dict):
+    payload = {"title": title, "body": body, "data": data, "digest": True}
+    if JOB_QUEUE:
+        try:
+            return await run_in_threadpool(jobDAO.enqueue, "notify", "notify.admins", payload, 0, 3)
+        except Exception as e:
+            print(f"[jobs] notify.admins enqueue 실패, 프로세스 내 실행으로 대체: {e}")
+    return await notifyAdmins(**payload)
+
+adminDigest.sink = sendAdminDigest
+
 # 신고 등록 API 엔드포인트
 @app.post("/registration.write")
 async def registrationWrite(
@@ -221,32 +310,34 @@ async def registrationWrite(
         payload = json.loads(resp.body)
         report_id = int(payload.get("report_id"))
         photo_filename = payload.get("photo_url")
-        base = str(request.base_url).rstrip("/")
-        input_image_url = f"{base}/registration_photos/{photo_filename}"
 
-        # 3) AI 백그라운드 작업 추가
-        if background_tasks:
-            background_tasks.add_task(aiDAO.process_report, report_id, input_image_url)
+        # 근처에서 최근 같은 파손이 이미 신고됨 → AI 분석 / 관리자·주변 알림은 원본 신고 때 이미 나감
+        if payload.get("duplicate_of"):
+            return resp
+
+        # 3) AI 분석 job
+        await enqueueJob(background_tasks, "ai", "ai.process_report",
+                         aiJobPayload(request, report_id, photo_filename), aiDAO.process_report_async)
 
         # 4) 신고 등록 성공 시 알림 추가
         # 신고자 정보 가져오기 (여기서는 user_id로 닉네임 등을 조회)
-        user_info = aDAO.getUserInfo(user_id)
+        user_info = await run_in_threadpool(aDAO.getUserInfo, user_id)
         nickname = user_info.get("nickname", "익명")
 
-        # 관리자에게 알림 보내기
-        admin_notification_data = {
-            "title": "[신규 신고 등록 알림]",
-            "body": f"사용자 '{nickname}'님이 새로운 파손 내용을 등록하셨습니다.",
-        }
-        # 백그라운드 태스크에 알림 전송 작업 추가 (API 호출)
-        background_tasks.add_task(notifyDAO.send_notification_to_admin_task, **admin_notification_data)
+        # 관리자 알림은 메모리에 모았다가 window/N건마다 한 번에 (sendAdminDigest)
+        adminDigest.add(report_id, nickname)
 
         # 주변 사용자들에게 알림 보내기
+        # 알림은 재시도하면 DB 행이 중복될 수 있으므로 시도 횟수를 줄임
         local_notification_data = {
             "title": "[새로운 파손 공공기물 발견]",
             "body": f"근처에 새로운 파손된 공공기물이 신고되었습니다.",
+            "exclude_user_id": user_id,
+            "latitude": latitude,
+            "longitude": longitude,
         }
-        background_tasks.add_task(notifyDAO.send_notification_to_local_task, **local_notification_data)
+        await enqueueJob(background_tasks, "notify", "notify.local", local_notification_data, notifyLocal,
+                         max_attempts=3)
 
     except Exception as e:
         print("BG schedule error:", e)
@@ -254,9 +345,28 @@ async def registrationWrite(
     return resp
 
 # 신고 목록 조회 API 엔드포인트
+# limit/cursor를 주면 (report_date, report_id) 기준 keyset 페이지네이션, 응답의 next_cursor로 다음 페이지 조회
 @app.get("/registration.list")
-def registrationList():
-    return rDAO.getAllRegistrations()
+def registrationList(request: Request, response: Response,
+                     limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None):
+    return conditional(request, response, reportsETag("registration.list", limit, cursor),
+                       lambda: responseCache.getOrLoad("reports", f"registration.list:{limit}:{cursor}",
+                                                       lambda: rDAO.getAllRegistrations(limit, cursor)))
+
+# 주변 신고 조회 (in-process 공간 인덱스 사용)
+@app.get("/reports/nearby")
+def reportsNearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(500, gt=0, le=50000),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    return rDAO.getNearbyReports(lat, lng, radius_m, limit)
+
+# 중복 신고 판별 현황
+@app.get("/reports/dedup.stats")
+def reportsDedupStats():
+    return reportDedup.status()
 
 # 관리 상태 등록 API 엔드포인트
 @app.post("/management.status.add")
@@ -272,8 +382,8 @@ def addManagementStatus(
 
 # 관리 상태 전체 조회 API 엔드포인트
 @app.get("/management.status.list")
-def getManagementStatusList():
-    return msDAO.getAllStatuses()
+def getManagementStatusList(limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None):
+    return msDAO.getAllStatuses(limit, cursor)
 
 @app.get("/get_user_info/{user_id}")
 def get_user_info(user_id: str):
@@ -305,12 +415,13 @@ def infoSpeech2Txt(location: str, type: str, problem: str):
     return JSONResponse(result, headers=headers)
 
 @app.get("/get_all_damage_reports")
-def getAllDamageReports(): # 
+def getAllDamageReports(limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None): # 
     """
     모든 파손 보고서의 위도, 경도, location_description 정보를 조회합니다.
     DamageMapScreen에서 지도에 마커를 표시하는 데 사용됩니다.
+    limit/cursor를 주면 페이지 단위로 조회하고, 다음 커서는 X-Next-Cursor 헤더로 내려갑니다.
     """
-    return msDAO.getAllDamageReportLocations()  # JSONResponse를 그대로 반환
+    return msDAO.getAllDamageReportLocations(limit, cursor)  # JSONResponse를 그대로 반환
 
 
 
@@ -429,14 +540,20 @@ def delete_account(authorization: str = Header(...)):
         raise HTTPException(status_code=500, detail="회원 탈퇴 실패")
     
 @app.get("/get_notices")
-def get_notices():
+def get_notices(request: Request, response: Response):
     """
     공지사항 목록을 조회합니다.
     """
     try:
-        notices = nDAO.getNotices()
+        version = responseCache.getOrLoad("notices", "version", nDAO.getNoticesVersion)
+        etag = SsyETag.make("notices", version) if version else None
+        if etag and SsyETag.matches(request.headers.get("if-none-match"), etag):
+            return SsyETag.notModified(etag)
+        notices = responseCache.getOrLoad("notices", "list", nDAO.getNotices)
         if not notices:
             return JSONResponse(status_code=404, content={"error": "공지사항이 없습니다."})
+        if etag and notices.status_code == 200:
+            SsyETag.attach(None, response, etag)
         return notices.body
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -473,8 +590,12 @@ def create_notice(
 
     #신고한 유저가 자기가 신고한 목록 보기위해 필요한거
 @app.get("/my_reports")
-async def my_reports(user_id: str = Query(..., description="조회할 사용자 ID")):
-    return rDAO.getUserReports(user_id)
+async def my_reports(
+    user_id: str = Query(..., description="조회할 사용자 ID"),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None
+):
+    return await rDAO.getUserReportsAsync(user_id, limit, cursor)
 
     #유저 신고한 내역 확인할때 유저 정보 확인
 @app.get("/me")
@@ -535,7 +656,7 @@ def delete_my_report(report_id: int, current_user: Dict = Depends(get_current_us
 # 특정 ID의 공지사항 상세 정보를 조회
 @app.get("/get_notice/{notice_id}")
 def get_notice_detail(notice_id: int):
-    return nDAO.getNoticeById(notice_id)
+    return responseCache.getOrLoad("notices", f"detail:{notice_id}", lambda: nDAO.getNoticeById(notice_id))
 
 @app.post("/update_notice/{notice_id}") 
 def update_notice(
@@ -548,14 +669,16 @@ def update_notice(
     return nDAO.updateNotice(notice_id, title, content, notice_type, is_pinned)
 
 @app.get("/admin/all_reports")
-def get_all_reports_for_admin():
-    """관리자 페이지를 위한 모든 신고 목록을 조회합니다."""
-    return rDAO.getAllReportsForAdmin()
+def get_all_reports_for_admin(limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None):
+    """관리자 페이지를 위한 모든 신고 목록을 조회합니다. (다음 커서는 X-Next-Cursor 헤더)"""
+    return rDAO.getAllReportsForAdmin(limit, cursor)
 
 @app.get("/report_details/{report_id}")
-def get_report_details(report_id: int):
-    """특정 신고의 모든 상세 정보를 조회합니다."""
-    return rDAO.getReportDetailsById(report_id)
+def get_report_details(request: Request, response: Response, report_id: int):
+    """특정 신고의 모든 상세 정보를 조회합니다. (If-None-Match가 맞으면 304)"""
+    version = responseCache.getOrLoad("reports", f"version:{report_id}", lambda: rDAO.getReportVersion(report_id))
+    etag = SsyETag.make("report", report_id, version) if version else None
+    return conditional(request, response, etag, lambda: rDAO.getReportDetailsById(report_id))
 
 @app.post("/update_report_status/{report_id}")
 def update_report_status(
@@ -626,25 +749,115 @@ def auth_refresh(body: RefreshIn):
 
 
 @app.get("/management.reports")
-async def management_reports():
-    return msDAO.getAllDamageReportLocations()  # 또는 WithLatestStatus 버전
+async def management_reports(request: Request, response: Response,
+                             limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None):
+    etag = await run_in_threadpool(reportsETag, "management.reports", limit, cursor)
+    return await conditionalAsync(request, response, etag, lambda: responseCache.getOrLoadAsync(
+        "reports", f"management.reports:{limit}:{cursor}",
+        lambda: msDAO.getAllDamageReportLocationsAsync(limit, cursor)))  # 또는 WithLatestStatus 버전
+
+# 응답 캐시 적중/미스 통계
+@app.get("/cache.stats")
+def cache_stats():
+    return responseCache.stats()
+
+# 지도 화면용: 뷰포트(bounding box) 안의 신고만, 낮은 줌에서는 서버 클러스터(개수 + 중심점)로 반환
+@app.get("/map.markers")
+async def map_markers(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=22)
+):
+    return await msDAO.getMapMarkers(south, west, north, east, zoom)
 
 @app.get("/management.report/{report_id}")
 async def management_report_detail(report_id: int):
-    return msDAO.getReportDetail(report_id)
+    return await msDAO.getReportDetailAsync(report_id)
 
 @app.get("/notifications")
-def get_notifications(recipient_code: Optional[str] = None, limit: int = 50):
+async def get_notifications(request: Request, response: Response,
+                            recipient_code: Optional[str] = None, limit: int = 50):
     """
     사용자의 recipient_code(=user_id)로 알림 조회.
     recipient_code 없으면 전체 목록(관리/테스트용).
+    If-None-Match가 현재 알림함 버전과 같으면 304.
     """
     try:
-        data = notifyDAO.list(recipient_code, limit)
-        return data
+        etag = None
+        if recipient_code:
+            version = await run_in_threadpool(notifyDAO.getInboxVersion, recipient_code)
+            etag = SsyETag.make("notifications", recipient_code, limit, version) if version else None
+        return await conditionalAsync(request, response, etag,
+                                      lambda: notifyDAO.listAsync(recipient_code, limit))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"알림 조회 실패: {e}"})
 
+# 실시간 알림 / AI 진행 상황 (Server-Sent Events)
+# user_id → 그 사용자가 받는 알림, report_id(여러 개 가능) → 해당 신고의 AI 상태/결과
+SSE_HEARTBEAT_SEC = 15
+
+@app.get("/events")
+async def events(request: Request, user_id: Optional[str] = None, report_id: List[int] = Query([])):
+    topics = [f"report:{rid}" for rid in report_id]
+    if user_id:
+        topics += await run_in_threadpool(notifyDAO.eventTopics, user_id)
+    if not topics:
+        raise HTTPException(status_code=400, detail="user_id 또는 report_id가 필요합니다.")
+
+    sub = eventBroker.subscribe(topics)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await sub.get(SSE_HEARTBEAT_SEC)
+                # 이벤트가 없으면 연결 유지용 주석 한 줄
+                yield ": ping\n\n" if event is None else SsyEventBroker.sse(event)
+        finally:
+            eventBroker.unsubscribe(sub)
+
+    h = {"Access-Control-Allow-Origin": "*", "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=h)
+
+@app.get("/events.stats")
+def events_stats():
+    return eventBroker.status()
+
+# jobWorker 프로세스에서 생긴 이벤트 수신 (eventBroker.forwardTo)
+# 워커 쪽에서 바뀐 in-process 상태(알림함 인덱스, 응답 캐시, 랭킹 보드)를 여기서도 맞춘 뒤 SSE로 전달
+# EVENT_FORWARD_KEY가 있으면 같은 키(X-Event-Key)를, 없으면 같은 호스트(loopback)에서 온 요청만 받는다
+@app.post("/events.publish")
+def events_publish(request: Request, topic: str = Body(...), event: dict = Body(...),
+                   x_event_key: Optional[str] = Header(None)):
+    if config.EVENT_FORWARD_KEY:
+        allowed = x_event_key == config.EVENT_FORWARD_KEY
+    else:
+        allowed = request.client is not None and isLoopback(request.client.host)
+    if not allowed:
+        raise HTTPException(status_code=403, detail="forbidden")
+    kind = event.get("type")
+    if kind == "notification":
+        inboxIndex.add(event.get("recipient_code"), event.get("notification_id"))
+    elif kind == "ai_status":
+        responseCache.invalidate("reports")
+    elif kind == "ai_result":
+        if event.get("user_id"):
+            rankingBoard.setScore(event["user_id"], event.get("score"))
+        responseCache.invalidate("reports", "ranking")
+    return {"delivered": eventBroker.publish(topic, event)}
+
+# 안 읽은 알림 수 (브로드캐스트 포함, 인메모리 계산)
+@app.get("/notifications/unread_count")
+def get_unread_count(user_id: str):
+    return notifyDAO.unreadCount(user_id)
+
+# 알림 읽음 처리 (last_id 생략 시 현재 최신 알림까지)
+@app.post("/notifications/seen")
+def mark_notifications_seen(user_id: str = Body(...), last_id: Optional[int] = Body(None)):
+    return {"result": "ok", "last_seen_id": notifyDAO.markSeen(user_id, last_id)}
+
 # 알림용 토큰 저장
 @app.post("/account.save_push_token")
 def save_push_token(expoPushToken: str = Body(...), authorization: str = Header(...)):
@@ -655,274 +868,158 @@ def save_push_token(expoPushToken: str = Body(...), authorization: str = Header(
     user_id = user["user_id"]
 
     result = notifyDAO.saveExpoPushToken(user_id, expoPushToken)
+    receiptPoller.forget(expoPushToken)
 
     if result:
         return {"message": "토큰 저장 완료"}
     else:
         raise HTTPException(status_code=500, detail="토큰 저장 실패")
     
-@app.post("/notification.notify")
-def send_notification(to_user_id: str = Body(...), title: str = Body(...), body: str = Body(...), data: dict = Body({})):
+# ----------------------------------------------------------------------
+# 푸시 알림: DB 저장 후 pushDispatcher 큐에 넣고 바로 job_id 반환
+# (전송 결과는 /notification.jobs/{job_id} 로 확인)
+# ----------------------------------------------------------------------
+def jobAccepted(job):
     h = {"Access-Control-Allow-Origin": "*"}
+    return JSONResponse({"result": {"job_id": job.id, "count": len(job.results)}}, status_code=202, headers=h)
 
+@app.post("/notification.notify")
+async def send_notification(to_user_id: str = Body(...), title: str = Body(...), body: str = Body(...), data: dict = Body({})):
     # DB에서 대상자의 expo_push_token 조회
-    token = notifyDAO.getExpoPushToken(to_user_id)
+    token = await run_in_threadpool(notifyDAO.getExpoPushToken, to_user_id)
     if not token:
         raise HTTPException(status_code=400, detail="푸시 토큰 없음")
 
-    payload = {
-        "to": token,             # "ExponentPushToken[xxx]"
-        "title": title,
-        "body": body,
-        "data": data,            # 클릭 시 사용할 딥링크 정보 등
-        "sound": "default",
-        "channelId": "default",
-        "priority": "high",
-    }
-
-    try:
-        with httpx.Client(timeout=10) as client:
-            r = client.post(EXPO_PUSH_URL, json=payload)
-            r.raise_for_status()
-            body = {
-                "result": r.json()
-            }
-            return JSONResponse(body, headers=h)
-        
-    except httpx.HTTPError as e:
-        raise HTTPException(status_code=500, detail=f"Expo Push 전송 실패: {str(e)}")
-
-# 100개씩 나눠서 알림을 보내기 위한 용도
-def chunk(lst, n=100):
-    for i in range(0, len(lst), n):
-        yield lst[i:i+n]
+    job = await pushDispatcher.enqueue([PushDispatcher.message(token, title, body, data)],
+                                       {"type": "user", "to_user_id": to_user_id})
+    return jobAccepted(job)
 
 @app.post("/notification.notify_admin")
 async def send_notification_to_admin(title: str = Body(...), body: str = Body(...), data: dict = Body({})):
-    h = {"Access-Control-Allow-Origin": "*"}
-
-    # 1. 관리자 유저 ID와 토큰을 함께 가져옵니다.
-    #    getAdminsWithTokens 함수는 (user_id, token) 튜플 리스트를 반환합니다.
-    admins = notifyDAO.getAdminsWithTokens()
-
+    admins = await adminRecipients()
     if not admins:
         raise HTTPException(status_code=400, detail="관리자 푸시 토큰 없음")
 
-    admin_ids  = [u for (u, _t) in admins]
-    admin_toks = [t for (_u, t) in admins]
+    await saveNotifications(admins, title, body, "notify_admin")
+    job = await pushDispatcher.enqueue(pushMessages(admins, title, body, data), {"type": "admin"})
+    return jobAccepted(job)
 
-    # 2. 알림 내용을 DB에 일괄 저장합니다.
-    try:
-        notifyDAO.insert_notifications_bulk(
-            content=f"{title}\n{body}",
-            sender="system",
-            recipients=admin_ids
-        )
-    except Exception as e:
-        print(f"[notify_admin] DB insert 실패: {e}")
-        # DB 저장 실패 시에도 푸시 전송은 계속 진행하도록 합니다.
-
-    # 3. 푸시 알림 전송 로직 (기존 코드 유지)
-    tickets, errors = [], []
-    async with httpx.AsyncClient(timeout=15) as client:
-        # 100개씩 나눠서 알림 전송
-        for group in chunk(admin_toks, 100):
-            messages = [
-                {"to": t, "title": title, "body": body, "data": data or {}, "sound": "default", "channelId": "default", "priority": "high"}
-                for t in group
-            ]
-            resp = await client.post(EXPO_PUSH_URL, json=messages)
-            resp.raise_for_status()
-            out = resp.json()
-            for item in out.get("data", []):
-                if item.get("status") == "ok":
-                    tickets.append(item.get("id"))
-                else:
-                    errors.append(item)
-
-    return JSONResponse({"result": {"tickets": tickets, "errors": errors}}, headers=h)
-        
 @app.post("/notification.notify_repair")
 async def send_notification_repair(
     user_id: str = Body(...),
     msg1: dict = Body(...),  # 신고자용 메시지
     msg2: dict = Body(...),  # 주변 사용자용 메시지
+    latitude: Optional[float] = Body(None),   # 신고 위치 (또는 report_id) → 주변 사용자만
+    longitude: Optional[float] = Body(None),
+    report_id: Optional[int] = Body(None),
 ):
-    h = {"Access-Control-Allow-Origin": "*"}
-    
-    # 1. 신고자에게 보낼 알림을 DB에 저장합니다.
+    # 1. 신고자에게 보낼 알림을 DB에 저장
     try:
-        notifyDAO.insert_notification_user(
-            content=f"{msg1.get('title','')}\n{msg1.get('body','')}",
-            sender="system",
-            user_id_or_email=user_id
-        )
+        await run_in_threadpool(notifyDAO.insert_notification_user,
+                                content=f"{msg1.get('title','')}\n{msg1.get('body','')}",
+                                sender="system", user_id_or_email=user_id)
     except Exception as e:
         print(f"[notify_repair] 신고자 DB insert 실패: {e}")
 
-    # 2. 주변 사용자 목록을 가져와서 알림을 DB에 저장합니다.
-    other_tokens, user_ids = notifyDAO.getLocalExpoPushToken()
-    recipients_for_db = [uid for uid, t in zip(user_ids, other_tokens) if uid and uid != user_id and t]
-    
-    try:
-        if recipients_for_db:
-            notifyDAO.insert_notifications_bulk(
-                content=f"{msg2.get('title','')}\n{msg2.get('body','')}",
-                sender="system",
-                recipients=recipients_for_db
-            )
-    except Exception as e:
-        print(f"[notify_repair] 주변 사용자 DB insert 실패: {e}")
+    # 2. 주변 사용자 알림 DB 저장
+    latitude, longitude = reportPosition(latitude, longitude, report_id)
+    locals_ = await localRecipients(user_id, latitude, longitude)
+    await saveLocalNotifications(locals_, msg2.get("title"), msg2.get("body"), "notify_repair", latitude, longitude,
+                                 user_id)
 
-    # 3. 푸시 알림 전송 로직 (기존 코드 유지)
-    # messages 리스트를 구성하고, httpx.post를 호출하는 기존 로직은 그대로 두세요.
-    # ... (기존 코드) ...
-    
-    # 이 부분에 `messages` 리스트 구성 및 푸시 전송 로직이 포함됩니다.
-    # 이 로직을 정확히 재현하기 위해 `homeController.py`에 있는 기존 `/notification.notify_repair` 코드를
-    # 아래의 메시지 리스트 생성 및 httpx 호출 로직으로 교체해야 합니다.
-
-    tickets, errors, total_count = [], [], 0
-    async with httpx.AsyncClient(timeout=20) as client:
-        messages = []
-        # 신고자 메시지
-        reporter_token = notifyDAO.getExpoPushToken(user_id)
-        if reporter_token:
-            messages.append({
-                "to": reporter_token,
-                "title": msg1.get("title"),
-                "body": msg1.get("body"),
-                "data": msg1.get("data"),
-                "sound": "default",
-                "channelId": "default",
-                "priority": "high",
-            })
-        
-        # 주변 사용자 메시지
-        for t, uid in zip(other_tokens, user_ids):
-            if uid and uid != user_id and t:
-                messages.append({
-                    "to": t,
-                    "title": msg2.get("title"),
-                    "body": msg2.get("body"),
-                    "data": msg2.get("data"),
-                    "sound": "default",
-                    "channelId": "default",
-                    "priority": "high",
-                })
-
-        # Expo는 100개 권장 청크
-        CHUNK = 100
-        for i in range(0, len(messages), CHUNK):
-            chunk_msgs = messages[i:i+CHUNK]
-            resp = await client.post(EXPO_PUSH_URL, json=chunk_msgs)
-            resp.raise_for_status()
-            out = resp.json()
-            total_count += len(chunk_msgs)
-            for item in out.get("data", []):
-                if item.get("status") == "ok":
-                    tickets.append(item.get("id"))
-                else:
-                    errors.append(item)
+    # 3. 신고자 + 주변 사용자 메시지를 한 job으로 enqueue
+    messages = []
+    reporter_token = await run_in_threadpool(notifyDAO.getExpoPushToken, user_id)
+    if reporter_token:
+        messages.append(PushDispatcher.message(reporter_token, msg1.get("title"), msg1.get("body"), msg1.get("data")))
+    messages += pushMessages(locals_, msg2.get("title"), msg2.get("body"), msg2.get("data"))
 
-    return JSONResponse({
-        "result": {"tickets": tickets, "errors": errors, "count": total_count}
-    }, headers=h)
-    
-@app.post("/notification.notify_reg")
-async def send_notification_reg(user_id: str = Body(), msg1: dict = Body(), msg2: dict = Body()):
-    h = {"Access-Control-Allow-Origin": "*"}
-
-    # 알림을 보낼 계정의 토큰 추출
-    other_tokens, user_ids = notifyDAO.getLocalExpoPushToken()
+    job = await pushDispatcher.enqueue(messages, {"type": "repair", "user_id": user_id})
+    return jobAccepted(job)
 
-    # 관리자 계정의 토큰과 id를 추출
-    admin_info = notifyDAO.getAdminsWithTokens()
-    print("----------------------------------ok-------------------------------------")
-    if not admin_info:
+@app.post("/notification.notify_reg")
+async def send_notification_reg(user_id: str = Body(), msg1: dict = Body(), msg2: dict = Body(),
+                                latitude: Optional[float] = Body(None), longitude: Optional[float] = Body(None),
+                                report_id: Optional[int] = Body(None)):
+    # 관리자 계정의 토큰과 id
+    admins = await adminRecipients()
+    if not admins:
         raise HTTPException(status_code=400, detail="관리자 푸시 토큰 없음")
 
-    admin_ids  = [u for (u, _t) in admin_info]
-    admin_tokens = [t for (_u, t) in admin_info]
-
-    # 관리자에게 보낼 알림을 DB에 저장
-    try:
-        notifyDAO.insert_notifications_bulk(
-            content=f"{msg1.get('title', '')}\n{msg1.get('body', '')}",
-            sender="system",
-            recipients=admin_ids
-        )
-    except Exception as e:
-        print(f"[notify_admin] DB insert 실패: {e}")
-
-    # 주변 사용자 목록을 가져와서 알림을 DB에 저장
-    other_tokens, user_ids = notifyDAO.getLocalExpoPushToken()
-    recipients_for_db = [uid for uid, t in zip(user_ids, other_tokens) if uid and uid != user_id and t]
-    
+    # 주변 사용자 (신고자 본인 제외)
+    latitude, longitude = reportPosition(latitude, longitude, report_id)
+    locals_ = await localRecipients(user_id, latitude, longitude)
+
+    await saveNotifications(admins, msg1.get("title"), msg1.get("body"), "notify_reg")
+    await saveLocalNotifications(locals_, msg2.get("title"), msg2.get("body"), "notify_reg", latitude, longitude,
+                                 user_id)
+
+    messages = pushMessages(locals_, msg2.get("title"), msg2.get("body"), msg2.get("data"))
+    messages += pushMessages(admins, msg1.get("title"), msg1.get("body"), msg1.get("data"))
+
+    job = await pushDispatcher.enqueue(messages, {"type": "reg", "user_id": user_id})
+    return jobAccepted(job)
+
+# 푸시 job 진행 상태 / 메시지별 결과(ticket id 또는 에러)
+@app.get("/notification.jobs/{job_id}")
+def get_push_job(job_id: str):
+    job = pushDispatcher.job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="job 없음")
+    return job.summary(withResults=True)
+
+@app.get("/notification.dispatcher")
+def get_push_dispatcher_status():
+    return pushDispatcher.status()
+
+# receipt 확인 / 무효 토큰 정리 지표
+@app.get("/notification.receipts")
+def get_push_receipt_metrics():
+    return receiptPoller.metrics()
+
+# AI 호출 전송량 / 동시 호출·입장 제어 / 단계별 시간
+@app.get("/ai.stats")
+def ai_stats():
+    return {"transfer": transferStats(), "calls": aiGate.status(), "result_cache": aiResultCache.status()}
+
+# 밀린 AI 분석 일괄 처리 (장애 뒤 백로그, 실패 건 재분석)
+# job으로 넣으면 워커가 /predict_batch 단위로 묶어 처리, 큐를 못 쓰면 이 프로세스에서 AI_BATCH_SIZE건씩
+AI_BATCH_SIZE = int(os.environ.get("AI_BATCH_SIZE", "8"))
+
+@app.post("/ai.backfill")
+async def ai_backfill(request: Request, background_tasks: BackgroundTasks,
+                      limit: int = Body(100, ge=1, le=5000), include_failed: bool = Body(False),
+                      older_than_min: int = Body(10, ge=0)):
+    h = {"Access-Control-Allow-Origin": "*"}
+    pending = await run_in_threadpool(rDAO.getPendingAIReports, limit, include_failed, older_than_min)
+    items = [aiJobPayload(request, rid, photo) for rid, photo in pending]
+    queued = 0
+    if JOB_QUEUE:
+        try:
+            for it in items:
+                await run_in_threadpool(jobDAO.enqueue, "ai", "ai.process_report", it)
+                queued += 1
+        except Exception as e:
+            print(f"[jobs] ai.backfill enqueue 실패, 프로세스 내 실행으로 대체: {e}")
+    rest = items[queued:]
+    for i in range(0, len(rest), AI_BATCH_SIZE):
+        background_tasks.add_task(aiDAO.process_reports_batch_async, rest[i:i + AI_BATCH_SIZE])
+    return JSONResponse({"result": "ok", "found": len(items), "queued": queued, "in_process": len(rest),
+                         "report_ids": [it["report_id"] for it in items]}, headers=h)
+
+# 관리자 digest 대기 건수 / 묶음 크기
+@app.get("/notification.digest")
+def get_admin_digest_status():
+    return adminDigest.status()
+
+# job 큐 깊이 / 대기·처리 시간
+@app.get("/jobs.stats")
+def jobs_stats(window_sec: float = Query(3600, gt=0)):
+    h = {"Access-Control-Allow-Origin": "*"}
     try:
-        if recipients_for_db:
-            notifyDAO.insert_notifications_bulk(
-                content=f"{msg2.get('title','')}\n{msg2.get('body','')}",
-                sender="system",
-                recipients=recipients_for_db
-            )
+        return JSONResponse(jobDAO.stats(window_sec), headers=h)
     except Exception as e:
-        print(f"[notify_repair] 주변 사용자 DB insert 실패: {e}")
-
-    tickets = []
-    errors = []
-
-    # 100개씩 나눠서 알림 전송
-    async with httpx.AsyncClient(timeout=15) as client:
-        
-        messages = []
-        for idx, t in enumerate(other_tokens):
-            if user_ids[idx] != user_id:
-                msg = {
-                    "to": t,
-                    "title": msg2["title"],
-                    "body": msg2["body"],
-                    "data": msg2["data"],
-                    "sound": "default",
-                    "channelId": "default",
-                    "priority": "high",
-                }
-
-                messages.append(msg)
-
-        for t in admin_tokens:
-            msg = {
-                "to": t,
-                "title": msg1["title"],
-                "body": msg1["body"],
-                "data": msg1["data"],
-                "sound": "default",
-                "channelId": "default",
-                "priority": "high",
-            }
-            messages.append(msg)
-
-        resp = await client.post(EXPO_PUSH_URL, json=messages)
-        resp.raise_for_status()
-        out = resp.json()
-
-        # 각 메시지별 ticket 처리
-        for item in out["data"]:
-            if item["status"] == "ok":
-                if "id" in item:
-                    tickets.append(item["id"])
-            else:
-                errors.append(item)  # 개별 실패(토큰 형식 오류 등)
-
-        body = {
-            "result": {
-                "tickets": tickets,
-                "errors": errors,
-                "count": len(messages)
-            }
-        }
-
-        return JSONResponse(body, headers=h)
+        return JSONResponse(status_code=500, content={"error": str(e)}, headers=h)
     
 @app.post("/test")
 def test():
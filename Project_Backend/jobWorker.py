@@ -0,0 +1,261 @@
+# 백그라운드 job 워커 (웹 서버와 별도 프로세스)
+# 실행: python jobWorker.py
+# 웹 서버 registrationWrite가 jobs 테이블에 넣은 AI 분석 / 알림 job을 lease를 잡고 처리한다
+#
+# 환경 변수
+#   JOB_BACKEND          oracle(기본) / sqlite (로컬 실행, JOB_SQLITE_PATH 파일 — 웹 서버와 같은 값으로)
+#   JOB_QUEUES           큐:동시 실행 수[x배치 크기] 목록 (기본 "ai:2x8,notify:4")
+#                        배치 크기가 있으면 한 번에 그만큼 더 claim해서, 일괄 처리 함수가 있는 job은 묶어서 실행
+#                        (ai.process_report → /predict_batch 한 번. 밀린 게 한 건뿐이면 /predict)
+#   JOB_LEASE_SEC        lease 길이 (기본 60). 실행 중에는 1/3마다 연장, 워커가 죽으면 만료 후 다른 워커가 가져감
+#   JOB_TIMEOUT_SEC      job 하나 최대 실행 시간 (기본 600)
+#   JOB_POLL_SEC         큐가 비었을 때 다시 볼 주기 (기본 1)
+#   EVENT_FORWARD_URL    웹 서버의 /events.publish (기본 http://127.0.0.1:8000/events.publish, off면 전달 안 함)
+#   EVENT_FORWARD_KEY    웹 서버와 같은 값 (없으면 loopback 주소로만 보낼 수 있음, ProjectDB/SSY/config.py 참고)
+#   → 워커에서 생긴 SSE 이벤트 / 캐시 무효화 / 랭킹 점수를 웹 서버 프로세스에 전달
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from ProjectDB.Account.accountDAO import AccountDAO
+from ProjectDB.Job.jobDAO import jobDAO
+from ProjectDB.imageAI.imageAiDAO import ImageAiDAO, aiGate
+from ProjectDB.Notification.notifyService import notifyAdmins, notifyLocal
+from ProjectDB.Notification.pushDispatcher import pushDispatcher
+from ProjectDB.Notification.receiptPoller import receiptPoller
+from ProjectDB.SSY import config
+from ProjectDB.SSY.ssyDBManager import SsyDBManager
+from ProjectDB.SSY.ssyEventBroker import eventBroker
+
+LEASE_SEC = float(os.environ.get("JOB_LEASE_SEC", "60"))
+TIMEOUT_SEC = float(os.environ.get("JOB_TIMEOUT_SEC", "600"))
+POLL_SEC = float(os.environ.get("JOB_POLL_SEC", "1"))
+# 주변 사용자 계산에 쓰는 거주지 인덱스 재적재 주기 (가입/주소 변경은 웹 서버 프로세스에서 일어나므로)
+HOME_INDEX_REFRESH_SEC = float(os.environ.get("JOB_HOME_INDEX_REFRESH_SEC", "300"))
+
+aDAO = AccountDAO()
+aiDAO = ImageAiDAO()
+
+# ----------------------------------------------------------------------
+# job 종류별 처리 함수 (payload dict → 예외가 나면 재시도)
+# ----------------------------------------------------------------------
+HANDLERS = {}
+# 같은 종류 job 여러 건을 한 번에: payload 목록 → 건별 결과 목록 (None=성공, 예외=실패)
+BATCH_HANDLERS = {}
+
+def handler(kind: str):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+def batchHandler(kind: str):
+    def register(fn):
+        BATCH_HANDLERS[kind] = fn
+        return fn
+    return register
+
+@handler("ai.process_report")
+async def runProcessReport(payload: dict):
+    # 상한(AI_MAX_INFLIGHT)에 걸리면 AIBusyError → backoff 뒤 재시도
+    await aiDAO.process_report_async(payload["report_id"], payload.get("src"), reraise=True,
+                                     src_url=payload.get("src_url"))
+
+@batchHandler("ai.process_report")
+async def runProcessReportBatch(payloads: list):
+    return await aiDAO.process_reports_batch_async(payloads)
+
+@handler("notify.admins")
+async def runNotifyAdmins(payload: dict):
+    job = await notifyAdmins(**payload)
+    await job.done.wait()
+
+@handler("notify.local")
+async def runNotifyLocal(payload: dict):
+    job = await notifyLocal(**payload)
+    await job.done.wait()
+
+
+def parseQueues(spec: str) -> dict:
+    """ "ai:2x8,notify:4" → {"ai": (2, 8), "notify": (4, 1)} """
+    queues = {}
+    for part in spec.split(","):
+        name, _, n = part.strip().partition(":")
+        if name:
+            n, _, b = n.partition("x")
+            queues[name] = (max(1, int(n or 1)), max(1, int(b or 1)))
+    return queues
+
+
+class QueueRunner:
+    """
+    큐 하나: 동시 실행 수(concurrency)만큼만 실행, job마다 heartbeat로 lease 연장.
+    batch > 1이면 빈 자리 × batch개까지 claim해서 일괄 처리 가능한 job은 batch개씩 묶는다
+    (슬롯에서 차례를 기다리는 job도 claim 시점부터 heartbeat 대상 → 앞 job이 오래 걸려도 lease가 만료되지 않음)
+    """
+
+    def __init__(self, queue: str, concurrency: int, workerId: str, batch: int = 1):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.batch = batch
+        self.workerId = workerId
+        self.running = set()
+        self.stats = {"claimed": 0, "done": 0, "retried": 0, "failed": 0, "batches": 0}
+
+    async def run(self, stopping: asyncio.Event):
+        while not stopping.is_set():
+            free = self.concurrency - len(self.running)
+            if free <= 0:
+                await asyncio.wait(self.running, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            try:
+                jobs = await asyncio.to_thread(jobDAO.claim, self.queue, self.workerId, free * self.batch, LEASE_SEC)
+            except Exception as e:
+                logging.exception(f"[jobWorker] {self.queue} claim 실패: {e}")
+                jobs = []
+            if not jobs:
+                try:
+                    await asyncio.wait_for(stopping.wait(), POLL_SEC)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.stats["claimed"] += len(jobs)
+            for groups in self._slots(jobs, free):
+                task = asyncio.create_task(self._runSlot(groups))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+
+    def _slots(self, jobs: list, free: int) -> list:
+        """claim한 job → 실행 단위(묶음) → 빈 자리 수만큼의 슬롯에 나눠 담기 (슬롯 안은 순서대로 실행)"""
+        groups, pending = [], {}
+        for job in jobs:
+            if self.batch > 1 and job["kind"] in BATCH_HANDLERS:
+                bucket = pending.setdefault(job["kind"], [])
+                bucket.append(job)
+                if len(bucket) == self.batch:
+                    groups.append(pending.pop(job["kind"]))
+            else:
+                groups.append([job])
+        groups += pending.values()
+        slots = [[] for _ in range(min(free, len(groups)))]
+        for i, g in enumerate(groups):
+            slots[i % len(slots)].append(g)
+        return slots
+
+    async def _runSlot(self, groups: list):
+        # 아직 끝나지 않은 job (실행 중 + 차례 대기) — 끝난 묶음은 빼서 heartbeat를 멈춤
+        held = [job for g in groups for job in g]
+        hb = asyncio.create_task(self._heartbeat(held))
+        try:
+            for g in groups:
+                if len(g) == 1:
+                    await self._execute(g[0])
+                else:
+                    await self._executeBatch(g)
+                for job in g:
+                    held.remove(job)
+        finally:
+            hb.cancel()
+
+    async def drain(self, timeout: float):
+        # 끝나지 못한 job은 lease가 만료되면 다른 워커가 다시 가져간다
+        if self.running:
+            await asyncio.wait(self.running, timeout=timeout)
+
+    async def _heartbeat(self, jobs: list):
+        while True:
+            await asyncio.sleep(LEASE_SEC / 3)
+            for job in list(jobs):
+                if not await asyncio.to_thread(jobDAO.extendLease, job["job_id"], self.workerId, LEASE_SEC):
+                    logging.warning(f"[jobWorker] job {job['job_id']} lease 연장 실패")
+
+    async def _failed(self, job: dict, error: str, retry: bool = True):
+        status = await asyncio.to_thread(jobDAO.fail, job, self.workerId, error, retry)
+        self.stats["retried" if status == "queued" else "failed"] += 1
+        logging.warning(f"[jobWorker] job {job['job_id']} {job['kind']} 실패 "
+                        f"(시도 {job['attempts']}/{job['max_attempts']} → {status}): {error}")
+
+    async def _execute(self, job: dict):
+        fn = HANDLERS.get(job["kind"])
+        t0 = time.time()
+        try:
+            if fn is None:
+                raise LookupError(f"처리 함수 없음: {job['kind']}")
+            await asyncio.wait_for(fn(job["payload"]), TIMEOUT_SEC)
+        except Exception as e:
+            await self._failed(job, f"{type(e).__name__}: {e}", fn is not None)
+        else:
+            await asyncio.to_thread(jobDAO.complete, job["job_id"], self.workerId)
+            self.stats["done"] += 1
+            logging.info(f"[jobWorker] job {job['job_id']} {job['kind']} 완료 "
+                         f"(대기 {t0 - job['created_at']:.1f}s, 실행 {time.time() - t0:.1f}s)")
+
+    async def _executeBatch(self, jobs: list):
+        t0 = time.time()
+        try:
+            results = await asyncio.wait_for(BATCH_HANDLERS[jobs[0]["kind"]]([j["payload"] for j in jobs]), TIMEOUT_SEC)
+        except Exception as e:
+            results = [e] * len(jobs)
+        self.stats["batches"] += 1
+        for job, err in zip(jobs, results):
+            if err is None:
+                await asyncio.to_thread(jobDAO.complete, job["job_id"], self.workerId)
+                self.stats["done"] += 1
+            else:
+                await self._failed(job, f"{type(err).__name__}: {err}")
+        logging.info(f"[jobWorker] {jobs[0]['kind']} {len(jobs)}건 일괄 처리 "
+                     f"(실패 {sum(1 for r in results if r is not None)}, 실행 {time.time() - t0:.1f}s)")
+
+
+async def refreshHomeIndex(stopping: asyncio.Event):
+    while not stopping.is_set():
+        try:
+            await asyncio.wait_for(stopping.wait(), HOME_INDEX_REFRESH_SEC)
+        except asyncio.TimeoutError:
+            await asyncio.to_thread(aDAO.loadHomeIndex)
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    queues = parseQueues(os.environ.get("JOB_QUEUES", "ai:2x8,notify:4"))
+    workerId = f"{socket.gethostname()}:{os.getpid()}"
+
+    if config.EVENT_FORWARD_URL and config.EVENT_FORWARD_URL != "off":
+        # 키 없이 다른 호스트로 보내도록 설정돼 있으면 ValueError로 바로 종료
+        eventBroker.forwardTo(config.EVENT_FORWARD_URL, config.EVENT_FORWARD_KEY)
+        logging.info(f"[jobWorker] 이벤트 전달 → {config.EVENT_FORWARD_URL} "
+                     f"({'공유 키' if config.EVENT_FORWARD_KEY else 'loopback, 키 없음'})")
+    else:
+        logging.warning("[jobWorker] EVENT_FORWARD_URL=off: 웹 서버의 SSE/캐시/랭킹에 결과가 늦게 반영됩니다")
+
+    await asyncio.to_thread(aDAO.loadHomeIndex)
+    await pushDispatcher.start()
+    await receiptPoller.start()
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except NotImplementedError:
+            pass    # Windows
+
+    runners = [QueueRunner(q, n, workerId, b) for q, (n, b) in queues.items()]
+    logging.info(f"[jobWorker] {workerId} 시작 backend={jobDAO.backend} queues={queues}")
+    try:
+        await asyncio.gather(*(r.run(stopping) for r in runners), refreshHomeIndex(stopping))
+    finally:
+        for r in runners:
+            await r.drain(LEASE_SEC)
+            logging.info(f"[jobWorker] {r.queue} {r.stats}")
+        await pushDispatcher.stop()
+        await receiptPoller.stop()
+        await aiGate.aclose()
+        await asyncio.to_thread(eventBroker.stopForwarding)
+        SsyDBManager.closePool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
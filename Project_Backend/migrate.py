@@ -0,0 +1,108 @@
+# DB 스키마 마이그레이션
+# 실행: python migrate.py            미적용 migrations/*.sql을 파일 이름 순서대로 적용
+#       python migrate.py --status   적용 여부만 출력
+#       python migrate.py --dry-run  적용할 문장만 출력 (DB 변경 없음)
+#
+# migrations/NNNN_이름.sql — NNNN은 해당 변경을 넣은 작업 번호. 문장은 ';'로 끝나는 곳에서 나눈다 (PL/SQL 블록은 쓰지 않음)
+# 적용 기록은 schema_migrations 테이블. 코드 주석의 DDL을 이미 손으로 실행한 DB에서도 돌릴 수 있도록
+# "이미 있음" 오류는 그 문장이 적용된 것으로 보고 넘어간다
+import argparse
+import sys
+from pathlib import Path
+import oracledb
+from ProjectDB.SSY.ssyDBManager import SsyDBManager
+
+MIGRATIONS_DIR = Path(__file__).resolve().with_name("migrations")
+
+# ORA-00955 이름 중복(테이블/시퀀스/인덱스), ORA-01430 컬럼 중복, ORA-01408 같은 컬럼 목록의 인덱스 존재
+ALREADY_EXISTS = {955, 1430, 1408}
+
+_SQL_HISTORY_DDL = """
+    CREATE TABLE schema_migrations (
+        version     VARCHAR2(100) PRIMARY KEY,
+        applied_at  TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+    )
+"""
+
+
+def splitStatements(text: str) -> list:
+    """'--' 주석 줄을 빼고 ';'로 끝나는 곳에서 문장을 나눈다 (끝의 ';'는 떼고 돌려줌)"""
+    statements, buf = [], []
+    for line in text.splitlines():
+        if line.strip().startswith("--"):
+            continue
+        buf.append(line)
+        if line.rstrip().endswith(";"):
+            stmt = "\n".join(buf).strip().rstrip(";").strip()
+            if stmt:
+                statements.append(stmt)
+            buf = []
+    rest = "\n".join(buf).strip()
+    if rest:
+        statements.append(rest)
+    return statements
+
+
+def loadMigrations(directory: Path = MIGRATIONS_DIR) -> list:
+    """[(version, statements), ...] 파일 이름 순서. version은 확장자를 뺀 파일 이름"""
+    return [(p.stem, splitStatements(p.read_text(encoding="utf-8"))) for p in sorted(directory.glob("*.sql"))]
+
+
+def _errorCode(e: oracledb.DatabaseError) -> int:
+    err = e.args[0] if e.args else None
+    return getattr(err, "code", 0)
+
+
+def appliedVersions(cur) -> set:
+    try:
+        cur.execute(_SQL_HISTORY_DDL)
+    except oracledb.DatabaseError as e:
+        if _errorCode(e) not in ALREADY_EXISTS:
+            raise
+    cur.execute("SELECT version FROM schema_migrations")
+    return {r[0] for r in cur.fetchall()}
+
+
+def migrate(dryRun: bool = False, statusOnly: bool = False) -> int:
+    migrations = loadMigrations()
+    with SsyDBManager.conCur() as (con, cur):
+        done = appliedVersions(cur)
+        pending = [(v, stmts) for v, stmts in migrations if v not in done]
+        for v, _ in migrations:
+            print(f"{'적용됨' if v in done else '미적용'}  {v}")
+        if statusOnly or not pending:
+            return 0
+        for version, statements in pending:
+            print(f"== {version}")
+            for stmt in statements:
+                print(stmt + ";")
+                if dryRun:
+                    continue
+                try:
+                    cur.execute(stmt)
+                except oracledb.DatabaseError as e:
+                    if _errorCode(e) not in ALREADY_EXISTS:
+                        con.rollback()
+                        print(f"ERROR: {version} 실패: {e}")
+                        return 1
+                    print(f"   (이미 있음, 건너뜀: ORA-{_errorCode(e):05d})")
+            if not dryRun:
+                # DDL은 문장마다 자동 커밋, DML(기존 행 채우기 등)과 기록은 여기서 함께 커밋
+                cur.execute("INSERT INTO schema_migrations (version) VALUES (:v)", {"v": version})
+                con.commit()
+        return 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    ap.add_argument("--status", action="store_true", help="적용 여부만 출력")
+    ap.add_argument("--dry-run", action="store_true", help="적용할 문장만 출력")
+    args = ap.parse_args()
+    try:
+        sys.exit(migrate(dryRun=args.dry_run, statusOnly=args.status))
+    finally:
+        SsyDBManager.closePool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+-- 지도 뷰포트 마커/클러스터 조회 (ManagementStatusDAO 뷰포트 범위 조건)
+CREATE INDEX reports_lat_lng_ix ON Reports (latitude, longitude);
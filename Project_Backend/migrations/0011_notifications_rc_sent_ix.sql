@@ -0,0 +1,2 @@
+-- 알림함 조회: recipient_code IN (...) ORDER BY sent_at DESC FETCH FIRST n
+CREATE INDEX notifications_rc_sent_ix ON notifications (recipient_code, sent_at DESC);
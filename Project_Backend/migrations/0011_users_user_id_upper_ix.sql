@@ -0,0 +1,2 @@
+-- 알림함 지역 조회(NotificationDAO._loadRegion)의 UPPER(TRIM(user_id)) = :p_uid 비교용 함수 기반 인덱스
+CREATE INDEX users_user_id_upper_ix ON Users (UPPER(TRIM(user_id)));
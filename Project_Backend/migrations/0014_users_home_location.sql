@@ -0,0 +1,2 @@
+-- 주변 사용자 알림 대상 선정용 거주지 좌표 (AccountDAO.loadHomeIndex가 비어 있는 행을 주소로 채움)
+ALTER TABLE Users ADD (home_lat NUMBER(9,6), home_lng NUMBER(9,6));
@@ -0,0 +1,6 @@
+-- 사용자별 "마지막으로 본 알림" 커서 (지역/전체 알림은 한 행만 저장하고 읽음 여부는 커서로 판단)
+CREATE TABLE notification_cursors (
+    user_id      VARCHAR2(100) PRIMARY KEY,
+    last_seen_id NUMBER NOT NULL,
+    updated_at   TIMESTAMP DEFAULT SYSTIMESTAMP
+);
@@ -0,0 +1,19 @@
+-- 백그라운드 job 영속 큐 (JobDAO, JOB_BACKEND=oracle)
+-- 시각은 epoch 초(NUMBER). running 상태의 run_after = lease 만료 시각
+CREATE SEQUENCE job_seq;
+CREATE TABLE jobs (
+    job_id        NUMBER PRIMARY KEY,
+    queue         VARCHAR2(30)  NOT NULL,
+    kind          VARCHAR2(100) NOT NULL,
+    payload       CLOB,
+    status        VARCHAR2(10)  NOT NULL,
+    attempts      NUMBER DEFAULT 0 NOT NULL,
+    max_attempts  NUMBER DEFAULT 5 NOT NULL,
+    run_after     NUMBER NOT NULL,
+    locked_by     VARCHAR2(100),
+    last_error    VARCHAR2(1000),
+    created_at    NUMBER NOT NULL,
+    started_at    NUMBER,
+    finished_at   NUMBER
+);
+CREATE INDEX jobs_claim_ix ON jobs (queue, status, run_after);
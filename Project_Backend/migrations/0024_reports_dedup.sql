@@ -0,0 +1,5 @@
+-- 중복 신고 판별 (RegistrationDAO.registerFacility / reportDedup)
+--   photo_dhash  신고 사진 dHash (16진수 16자리)
+--   duplicate_of 중복으로 판정된 신고의 원본 report_id
+-- 이 컬럼이 없으면 신고 등록은 중복 판별 없이 기존 INSERT로 동작한다
+ALTER TABLE Reports ADD (photo_dhash VARCHAR2(16), duplicate_of NUMBER);
@@ -0,0 +1,10 @@
+-- AI 분석 상태 전이 (queued → processing → done / failed), RegistrationDAO.beginAIAnalysis/saveAIResult/saveAIFailure
+ALTER TABLE Reports ADD (ai_state VARCHAR2(12) DEFAULT 'queued');
+-- 기존 행: ai_status 값으로 채움 (처리 중에 멈춘 것은 다시 분석하도록 queued)
+UPDATE Reports
+   SET ai_state = CASE
+                      WHEN ai_status IS NULL OR ai_status = 'processing' THEN 'queued'
+                      WHEN ai_status LIKE 'failed:%' THEN 'failed'
+                      ELSE 'done'
+                  END;
+CREATE INDEX reports_ai_state_ix ON Reports (ai_state);
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Project_Backend를 import 경로에 (ProjectDB.* / jobWorker 등을 앱과 같은 방식으로 import)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
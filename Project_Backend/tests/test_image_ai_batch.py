@@ -0,0 +1,50 @@
+import asyncio
+import ProjectDB.imageAI.imageAiDAO as aiModule
+from ProjectDB.imageAI.imageAiDAO import AIBusyError, ImageAiDAO, _AIGate
+
+
+class RecordingDAO:
+    def __init__(self):
+        self.failures = []
+
+    def beginAIAnalysisBatch(self, report_ids):
+        return set(report_ids)
+
+    def saveAIFailure(self, report_id, status):
+        self.failures.append((report_id, status))
+        return True
+
+
+def items(*ids):
+    return [{"report_id": i, "src": f"/nonexistent/{i}.jpg"} for i in ids]
+
+
+def test_busy_batch_is_not_recorded_as_failed(monkeypatch):
+    # 대기 자리 없이 가득 찬 게이트 → 입장 즉시 AIBusyError
+    gate = _AIGate(maxInflight=1, maxWaiting=0)
+    gate.inflight = 1
+    monkeypatch.setattr(aiModule, "aiGate", gate)
+    dao = RecordingDAO()
+    results = asyncio.run(ImageAiDAO(dao=dao).process_reports_batch_async(items(1, 2)))
+    assert all(isinstance(r, AIBusyError) for r in results)
+    # ai_state를 failed로 만들지 않아야 job 재시도 / backfill 대상으로 남는다
+    assert dao.failures == []
+    assert gate.stats["failed"] == 0
+
+
+def test_real_batch_failures_are_recorded(monkeypatch):
+    monkeypatch.setattr(aiModule, "aiGate", _AIGate())
+    dao = RecordingDAO()
+    results = asyncio.run(ImageAiDAO(dao=dao).process_reports_batch_async(items(3)))
+    assert isinstance(results[0], FileNotFoundError)
+    assert dao.failures and dao.failures[0][0] == 3 and dao.failures[0][1].startswith("failed:")
+
+
+def test_busy_single_report_stays_queued(monkeypatch):
+    gate = _AIGate(maxInflight=1, maxWaiting=0)
+    gate.inflight = 1
+    monkeypatch.setattr(aiModule, "aiGate", gate)
+    dao = RecordingDAO()
+    # BackgroundTasks 경로 (reraise=False): 예외 없이 끝나고 실패로 기록하지 않는다
+    asyncio.run(ImageAiDAO(dao=dao).process_report_async(1, "/nonexistent/1.jpg"))
+    assert dao.failures == []
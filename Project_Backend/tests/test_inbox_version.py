@@ -0,0 +1,46 @@
+import pytest
+import ProjectDB.Notification.notificationDAO as notifyModule
+from ProjectDB.Notification.notificationDAO import NotificationDAO, inboxIndex
+
+
+@pytest.fixture
+def inbox(monkeypatch):
+    # DB 없이: 지역/관리자 목록은 캐시에, 알림은 인덱스에
+    monkeypatch.setattr(notifyModule, "_regionCache", {"KIM": ("SEOUL", "강남구", "강남구")})
+    monkeypatch.setattr(notifyModule, "_adminIds", set())
+    monkeypatch.setattr(notifyModule, "_adminIdsAt", 1e18)
+    monkeypatch.setattr(inboxIndex, "ids", {})
+    monkeypatch.setattr(inboxIndex, "loaded", True)
+
+    def no_db():
+        raise AssertionError("DB 조회 없이 계산해야 함")
+    monkeypatch.setattr(notifyModule.SsyDBManager, "makeConCur", staticmethod(no_db))
+    inboxIndex.add("USER_ALL", 1)
+    inboxIndex.add("NAME_KIM", 2)
+    return NotificationDAO()
+
+
+def test_version_changes_only_for_own_keys(inbox):
+    v1 = inbox.getInboxVersion("kim")
+    assert v1.startswith("2:2:")
+    inboxIndex.add("NAME_LEE", 3)
+    assert inbox.getInboxVersion("kim") == v1
+    inboxIndex.add("LOCATION_SEOUL", 4)
+    assert inbox.getInboxVersion("kim").startswith("3:4:")
+
+
+def test_version_changes_when_region_changes(inbox):
+    v1 = inbox.getInboxVersion("kim")
+    NotificationDAO.rememberRegion("kim", "부산광역시 해운대구 우동")
+    assert inbox.getInboxVersion("kim") != v1
+
+
+def test_recipient_keys_are_padded_not_truncated():
+    params = NotificationDAO._recipient_keys("kim@ex.com", ("SEOUL", "강남구", "역삼동", "X"), isAdmin=True)
+    keys = set(params.values())
+    assert {"USER_ALL", "NAME_KIM@EX.COM", "NAME_KIM", "ADMIN_ALL", "LOCATION_X"} <= keys and len(keys) == 8
+    # 바인드 수는 7의 배수, SQL도 같은 수의 바인드를 쓴다
+    assert len(params) == 14
+    sql = notifyModule._inbox_sql(dict(params, p_lim=50))
+    assert ":k13" in sql and ":k14" not in sql
+    assert len(NotificationDAO._recipient_keys("kim", None)) == 7
@@ -0,0 +1,69 @@
+import time
+import pytest
+from ProjectDB.Job.jobDAO import JobDAO
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    return JobDAO(backend="sqlite", sqlitePath=str(tmp_path / "jobs.db"), retryBase=0.01, retryMax=0.01)
+
+
+def row(dao, job_id):
+    with dao._conCur() as (_con, cur):
+        cur.execute("SELECT status, attempts, locked_by, last_error FROM jobs WHERE job_id = ?", (job_id,))
+        return cur.fetchone()
+
+
+def expire(dao, job_id):
+    with dao._conCur() as (_con, cur):
+        cur.execute("UPDATE jobs SET run_after = ? WHERE job_id = ?", (time.time() - 1, job_id))
+
+
+def test_claim_marks_running_and_respects_limit(jobs):
+    ids = [jobs.enqueue("ai", "k", {"n": i}) for i in range(3)]
+    got = jobs.claim("ai", "w1", 2, leaseSec=60)
+    assert [j["job_id"] for j in got] == ids[:2]
+    assert got[0]["payload"] == {"n": 0} and got[0]["attempts"] == 1
+    assert row(jobs, ids[0])[:3] == ("running", 1, "w1")
+    # lease가 살아 있는 job은 다른 워커가 못 가져감
+    assert [j["job_id"] for j in jobs.claim("ai", "w2", 5, leaseSec=60)] == ids[2:]
+    assert jobs.claim("ai", "w3", 5, leaseSec=60) == []
+
+
+def test_delayed_job_waits(jobs):
+    jobs.enqueue("ai", "k", {}, delay=60)
+    assert jobs.claim("ai", "w1", 5, leaseSec=60) == []
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_loses_it(jobs):
+    job_id = jobs.enqueue("ai", "k", {})
+    jobs.claim("ai", "w1", 1, leaseSec=60)
+    expire(jobs, job_id)
+    got = jobs.claim("ai", "w2", 1, leaseSec=60)
+    assert got[0]["job_id"] == job_id and got[0]["attempts"] == 2
+    assert not jobs.extendLease(job_id, "w1", 60)
+    assert not jobs.complete(job_id, "w1")
+    assert jobs.complete(job_id, "w2")
+    assert row(jobs, job_id)[0] == "done"
+
+
+def test_fail_retries_until_max_attempts(jobs):
+    job_id = jobs.enqueue("ai", "k", {}, max_attempts=2)
+    job = jobs.claim("ai", "w1", 1, leaseSec=60)[0]
+    assert jobs.fail(job, "w1", "boom") == "queued"
+    time.sleep(0.03)
+    job = jobs.claim("ai", "w1", 1, leaseSec=60)[0]
+    assert job["attempts"] == 2
+    assert jobs.fail(job, "w1", "boom") == "failed"
+    assert row(jobs, job_id)[0] == "failed"
+    assert jobs.claim("ai", "w1", 1, leaseSec=60) == []
+
+
+def test_expired_lease_after_max_attempts_is_failed_not_reclaimed(jobs):
+    job_id = jobs.enqueue("ai", "k", {}, max_attempts=1)
+    jobs.claim("ai", "w1", 1, leaseSec=60)
+    expire(jobs, job_id)
+    assert jobs.claim("ai", "w2", 1, leaseSec=60) == []
+    status, attempts, locked_by, error = row(jobs, job_id)
+    assert (status, attempts, locked_by) == ("failed", 1, None)
+    assert "max_attempts" in error
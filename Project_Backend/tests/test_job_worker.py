@@ -0,0 +1,31 @@
+import asyncio
+import jobWorker
+from jobWorker import QueueRunner
+
+
+def job(job_id, kind="test.sleep"):
+    return {"job_id": job_id, "queue": "q", "kind": kind, "payload": {}, "attempts": 1,
+            "max_attempts": 5, "created_at": 0}
+
+
+def test_jobs_waiting_in_a_slot_keep_their_lease(monkeypatch):
+    extended, completed = [], []
+    monkeypatch.setattr(jobWorker, "LEASE_SEC", 0.06)
+    monkeypatch.setattr(jobWorker.jobDAO, "extendLease", lambda jid, _w, _l: extended.append(jid) or True)
+    monkeypatch.setattr(jobWorker.jobDAO, "complete", lambda jid, _w: completed.append(jid) or True)
+
+    async def sleep(_payload):
+        await asyncio.sleep(0.1)
+    monkeypatch.setitem(jobWorker.HANDLERS, "test.sleep", sleep)
+
+    runner = QueueRunner("q", 1, "w1")
+    # 자리 하나에 job 두 개 → 두 번째는 첫 번째가 끝날 때까지 대기
+    [slot] = runner._slots([job(1), job(2)], free=1)
+    asyncio.run(runner._runSlot(slot))
+
+    assert completed == [1, 2]
+    # 첫 번째 job 실행 중에 대기 중인 두 번째 job의 lease도 연장됨
+    first_beat = extended[:2]
+    assert sorted(first_beat) == [1, 2]
+    # 끝난 job은 더 이상 연장하지 않음
+    assert extended[-1] == 2 and extended.count(1) < extended.count(2)
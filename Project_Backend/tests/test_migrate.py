@@ -0,0 +1,29 @@
+import migrate
+
+
+def test_split_statements_drops_comments_and_semicolons():
+    text = """
+-- 설명
+ALTER TABLE Reports ADD (a NUMBER);
+UPDATE Reports
+   SET a = 1
+ WHERE a IS NULL;
+-- 끝
+CREATE INDEX x_ix ON Reports (a)
+"""
+    assert migrate.splitStatements(text) == [
+        "ALTER TABLE Reports ADD (a NUMBER)",
+        "UPDATE Reports\n   SET a = 1\n WHERE a IS NULL",
+        "CREATE INDEX x_ix ON Reports (a)",
+    ]
+
+
+def test_shipped_migrations_are_ordered_and_parse():
+    migrations = migrate.loadMigrations()
+    versions = [v for v, _ in migrations]
+    assert versions == sorted(versions)
+    assert "0024_reports_dedup" in versions
+    for version, statements in migrations:
+        assert statements, version
+        for stmt in statements:
+            assert not stmt.endswith(";")
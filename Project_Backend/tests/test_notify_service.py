@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+import ProjectDB.Notification.notificationDAO as notifyModule
+import ProjectDB.Notification.notifyService as service
+from ProjectDB.Notification.notificationDAO import NotificationDAO, _region_of, districtRegionCode
+
+SEOUL_JUNGGU = (37.5641, 126.9979)
+
+
+def test_district_code_is_qualified_by_city():
+    assert districtRegionCode("서울특별시 중구") == "SEOUL_중구"
+    assert districtRegionCode("부산광역시 중구") == "BUSAN_중구"
+    assert districtRegionCode(None) is None and districtRegionCode("서울특별시") is None
+    busan = NotificationDAO._recipient_keys("kim", _region_of("부산광역시 중구 중앙동"))
+    seoul = NotificationDAO._recipient_keys("kim", _region_of("서울특별시 중구 을지로"))
+    assert "LOCATION_BUSAN_중구" in busan.values() and "LOCATION_SEOUL_중구" not in busan.values()
+    assert "LOCATION_SEOUL_중구" in seoul.values()
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    calls = {"broadcast": [], "bulk": []}
+    residents = {"서울특별시 중구": {"near1", "near2", "reporter", "boss"}}
+    homes = {u: d for d, us in residents.items() for u in us}
+    monkeypatch.setattr(service, "NOTIFY_DELIVERY", "broadcast")
+    monkeypatch.setattr(service.aDAO, "getDistrictResidents", lambda d: set(residents.get(d, ())))
+    monkeypatch.setattr(service.aDAO, "getHomeDistrict", lambda u: homes.get(u))
+    monkeypatch.setattr(notifyModule, "_adminIds", {"BOSS"})
+    monkeypatch.setattr(notifyModule, "_adminIdsAt", 1e18)
+    monkeypatch.setattr(service.notifyDAO, "insert_notification",
+                        lambda **kw: calls["broadcast"].append(kw["recipient_code"]))
+    monkeypatch.setattr(service.notifyDAO, "insert_notifications_bulk",
+                        lambda **kw: calls["bulk"].append(sorted(kw["recipients"])))
+    return calls, residents
+
+
+def save(recipients, lat=None, lng=None, exclude=None):
+    asyncio.run(service.saveLocalNotifications(recipients, "t", "b", "test", lat, lng, exclude))
+
+
+def test_broadcast_when_every_resident_is_a_recipient(saved):
+    calls, residents = saved
+    residents["서울특별시 중구"] -= {"reporter", "boss"}
+    save([("near1", "t1"), ("near2", "t2"), ("visitor", "t3")], *SEOUL_JUNGGU, exclude="reporter")
+    assert calls == {"broadcast": ["LOCATION_SEOUL_중구"], "bulk": [["visitor"]]}
+
+
+def test_reporter_living_in_district_gets_per_recipient_rows(saved):
+    calls, residents = saved
+    residents["서울특별시 중구"].discard("boss")
+    save([("near1", "t1"), ("near2", "t2")], *SEOUL_JUNGGU, exclude="reporter")
+    assert calls == {"broadcast": [], "bulk": [["near1", "near2"]]}
+
+
+def test_admin_living_in_district_gets_per_recipient_rows(saved):
+    calls, residents = saved
+    residents["서울특별시 중구"].discard("reporter")
+    save([("near1", "t1"), ("near2", "t2")], *SEOUL_JUNGGU, exclude="reporter")
+    assert calls == {"broadcast": [], "bulk": [["near1", "near2"]]}
+
+
+def test_unknown_position_never_writes_user_all(saved):
+    calls, _ = saved
+    save([("u1", "t1"), ("u2", "t2")])
+    assert calls == {"broadcast": [], "bulk": [["u1", "u2"]]}
@@ -0,0 +1,43 @@
+import asyncio
+import httpx
+from ProjectDB.Notification.pushDispatcher import PushDispatcher
+
+
+class BrokenPoller:
+    def __init__(self):
+        self.calls = 0
+
+    def track(self, group, results):
+        self.calls += 1
+        raise RuntimeError("poller down")
+
+
+def run(data, poller=None):
+    async def main():
+        d = PushDispatcher(url="https://push.invalid/send", workers=1, receiptPoller=poller)
+        await d.start()
+        await d._client.aclose()
+        d._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda req: httpx.Response(200, json={"data": data})))
+        msgs = [PushDispatcher.message(f"ExponentPushToken[{i}]", "t", "b") for i in range(len(data))]
+        first = await d.enqueue(msgs)
+        await asyncio.wait_for(first.done.wait(), 2)
+        # 같은 워커가 다음 job도 처리해야 함
+        second = await d.enqueue(msgs)
+        await asyncio.wait_for(second.done.wait(), 2)
+        await d.stop()
+        return first.summary(withResults=True), d.stats
+
+    return asyncio.run(main())
+
+
+def test_malformed_ticket_does_not_kill_worker():
+    summary, stats = run([{"status": "ok", "id": "a"}, "garbage"])
+    assert summary["done"] and summary["ok"] == 1 and summary["failed"] == 1
+    assert stats["sent"] == 4
+
+
+def test_receipt_tracking_error_still_finishes_job():
+    poller = BrokenPoller()
+    summary, _ = run([{"status": "ok", "id": "a"}], poller)
+    assert summary["done"] and summary["ok"] == 1
+    assert poller.calls == 2
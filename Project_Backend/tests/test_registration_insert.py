@@ -0,0 +1,152 @@
+import asyncio
+import io
+import json
+import os
+import pytest
+from PIL import Image
+import ProjectDB.Registration.RegistrationDAO as regModule
+from ProjectDB.Registration.RegistrationDAO import RegistrationDAO
+
+TEST_PHOTO = "pytest_registration.jpg"
+
+
+class FakeVar:
+    def __init__(self, value=None):
+        self.value = value
+
+    def getvalue(self):
+        return self.value
+
+
+class FakeCursor:
+    """registerFacility가 보내는 SQL/바인드를 기록하는 async 커서"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.executed = []
+        self._rows = []
+
+    def var(self, _type):
+        return FakeVar()
+
+    async def execute(self, sql, binds=None):
+        self.executed.append((" ".join(sql.split()), dict(binds or {})))
+        if "user_tab_columns" in sql:
+            self._rows = [(c,) for c in self.columns]
+        elif "INSERT INTO Reports" in sql:
+            binds["out_report_id"].value = [101]
+        elif "RETURNING SCORE INTO" in sql.upper():
+            binds["o_score"].value = [20]
+        elif "SELECT NVL(SCORE" in sql:
+            self._rows = [(20,)]
+
+    async def fetchall(self):
+        return self._rows
+
+    async def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class FakeCon:
+    def __init__(self):
+        self.committed = False
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+class FakePhoto:
+    filename = "photo.jpg"
+
+    def __init__(self, content):
+        self.content = content
+
+    async def read(self):
+        return self.content
+
+
+def jpeg(color):
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def db(monkeypatch):
+    def connect(columns):
+        cur, con = FakeCursor(columns), FakeCon()
+
+        async def makeConCur():
+            return con, cur
+
+        async def closeConCur(_con, _cur):
+            pass
+
+        monkeypatch.setattr(regModule.SsyAsyncDBManager, "makeConCur", staticmethod(makeConCur))
+        monkeypatch.setattr(regModule.SsyAsyncDBManager, "closeConCur", staticmethod(closeConCur))
+        return cur
+
+    monkeypatch.setattr(regModule.SsyFileNameGenerator, "generate", staticmethod(lambda *_a, **_k: TEST_PHOTO))
+    monkeypatch.setattr(regModule, "_reportColumns", None)
+    monkeypatch.setattr(regModule.reportDedup, "_entries", {})
+    yield connect
+    regModule.reportIndex.remove(101)
+    path = os.path.join(os.path.dirname(regModule.__file__), "..", "..", "registration_photos", TEST_PHOTO)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def register(content=None):
+    resp = asyncio.run(RegistrationDAO().registerFacility(
+        FakePhoto(content or jpeg((200, 30, 30))), "어딘가", 37.5, 127.0, "user1", "파손", "2026-10-18 10:00:00"))
+    return resp.status_code, json.loads(resp.body)
+
+
+def insertOf(cur):
+    return next((sql, binds) for sql, binds in cur.executed if "INSERT INTO Reports" in sql)
+
+
+BASE = ["USER_ID", "PHOTO_URL", "LOCATION_DESCRIPTION", "LATITUDE", "LONGITUDE",
+        "REPORT_DATE", "DETAILS", "IS_NORMAL", "REPAIR_STATUS", "AI_STATUS"]
+
+
+def test_missing_dedup_columns_uses_original_insert(db):
+    cur = db(BASE)
+    status, body = register()
+    assert status == 200 and body["report_id"] == 101 and body["duplicate_of"] is None
+    sql, binds = insertOf(cur)
+    assert "photo_dhash" not in sql and "duplicate_of" not in sql
+    assert "p_photo_dhash" not in binds
+    # 새 점수는 UPDATE ... RETURNING으로 받고 따로 조회하지 않는다
+    assert body["new_score"] == 20
+    assert not any(sql.startswith("SELECT NVL(SCORE") for sql, _ in cur.executed)
+
+
+def test_dedup_disabled_skips_probe_and_new_columns(db, monkeypatch):
+    monkeypatch.setattr(regModule, "REPORT_DEDUP", False)
+    cur = db(BASE + ["PHOTO_DHASH", "DUPLICATE_OF"])
+    status, _ = register()
+    assert status == 200
+    assert not any("user_tab_columns" in sql for sql, _ in cur.executed)
+    assert "photo_dhash" not in insertOf(cur)[0]
+
+
+def test_dedup_columns_present_flags_second_report(db):
+    cur = db(BASE + ["PHOTO_DHASH", "DUPLICATE_OF", "AI_STATE"])
+    status, first = register()
+    assert status == 200 and first["duplicate_of"] is None
+    sql, binds = insertOf(cur)
+    assert "photo_dhash" in sql and binds["p_photo_dhash"]
+
+    cur = db(BASE + ["PHOTO_DHASH", "DUPLICATE_OF", "AI_STATE"])
+    status, second = register()
+    assert status == 200 and second["duplicate_of"] == 101
+    sql, binds = insertOf(cur)
+    assert binds["p_ai_status"] == "중복:#101"
+    # 밀린 분석(getPendingAIReports)에 잡히지 않도록 끝 상태로 등록
+    assert binds["p_ai_state"] == "done"
+    # 중복 신고는 점수를 올리지 않는다
+    assert not any("SCORE = NVL(SCORE, 0) + 10" in sql for sql, _ in cur.executed)
@@ -0,0 +1,99 @@
+import asyncio
+from fastapi.responses import JSONResponse
+from ProjectDB.SSY.ssyCache import SsyCache, SsyMemoryCacheBackend, _MISS
+
+
+def makeCache(maxEntries=100):
+    return SsyCache(SsyMemoryCacheBackend(maxEntries), ttl=30)
+
+
+def test_hit_after_load():
+    cache = makeCache()
+    calls = []
+    loader = lambda: calls.append(1) or {"v": len(calls)}
+    assert cache.getOrLoad("reports", "list", loader) == {"v": 1}
+    assert cache.getOrLoad("reports", "list", loader) == {"v": 1}
+    assert len(calls) == 1
+    assert cache.stats()["namespaces"]["reports"] == {"hits": 1, "misses": 1, "invalidations": 0}
+
+
+def test_invalidate_drops_only_that_namespace():
+    cache = makeCache()
+    db = {"reports": 1, "notices": 1}
+    cache.getOrLoad("reports", "k", lambda: {"v": db["reports"]})
+    cache.getOrLoad("notices", "k", lambda: {"v": db["notices"]})
+    db["reports"] = db["notices"] = 2
+    cache.invalidate("reports")
+    assert cache.getOrLoad("reports", "k", lambda: {"v": db["reports"]}) == {"v": 2}
+    assert cache.getOrLoad("notices", "k", lambda: {"v": db["notices"]}) == {"v": 1}
+
+
+def test_load_racing_with_invalidate_is_not_served_later():
+    # 읽기(loader) 도중 쓰기 경로가 DB를 바꾸고 invalidate → 읽어 둔 이전 값이 새 세대로 저장되면 안 됨
+    cache = makeCache()
+    db = {"v": 1}
+
+    def racingLoader():
+        value = {"v": db["v"]}
+        db["v"] = 2
+        cache.invalidate("reports")
+        return value
+
+    assert cache.getOrLoad("reports", "version", racingLoader) == {"v": 1}
+    assert cache.getOrLoad("reports", "version", lambda: {"v": db["v"]}) == {"v": 2}
+
+
+def test_async_load_racing_with_invalidate_is_not_served_later():
+    cache = makeCache()
+    db = {"v": 1}
+
+    async def racingLoader():
+        value = {"v": db["v"]}
+        db["v"] = 2
+        cache.invalidate("reports")
+        return value
+
+    async def freshLoader():
+        return {"v": db["v"]}
+
+    async def run():
+        assert await cache.getOrLoadAsync("reports", "k", racingLoader) == {"v": 1}
+        assert await cache.getOrLoadAsync("reports", "k", freshLoader) == {"v": 2}
+
+    asyncio.run(run())
+
+
+def test_errors_and_non_200_responses_are_not_cached():
+    cache = makeCache()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        return JSONResponse({"error": "x"}, status_code=500)
+
+    cache.getOrLoad("reports", "k", failing)
+    cache.getOrLoad("reports", "k", failing)
+    cache.getOrLoad("reports", "e", lambda: calls.append(1) or {"error": "x"})
+    cache.getOrLoad("reports", "e", lambda: calls.append(1) or {"error": "x"})
+    assert len(calls) == 4
+
+
+def test_response_roundtrip_keeps_body_and_headers():
+    cache = makeCache()
+    original = JSONResponse({"a": 1}, headers={"Access-Control-Allow-Origin": "*"})
+    cache.getOrLoad("reports", "r", lambda: original)
+    again = cache.getOrLoad("reports", "r", lambda: None)
+    assert again.body == original.body
+    assert again.headers["access-control-allow-origin"] == "*"
+
+
+def test_memory_backend_lru_and_ttl():
+    backend = SsyMemoryCacheBackend(maxEntries=2)
+    backend.set("a", 1, 30)
+    backend.set("b", 2, 30)
+    backend.get("a")                # a가 최근 사용
+    backend.set("c", 3, 30)         # b가 밀려남
+    assert backend.get("b") is _MISS
+    assert backend.get("a") == 1 and backend.get("c") == 3
+    backend.set("d", 4, -1)         # 이미 만료
+    assert backend.get("d") is _MISS
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from ProjectDB.SSY.ssyDBManager import SsyDBManager
+from ProjectDB.SSY.ssyAsyncDBManager import SsyAsyncDBManager
+from ProjectDB.Notice.noticeDAO import NoticeDAO
+
+
+class FakeCur:
+    def __init__(self, log, fail=False):
+        self.log, self.fail = log, fail
+
+    def execute(self, *_a):
+        if self.fail:
+            raise RuntimeError("ORA-00942")
+
+    def close(self):
+        self.log.append("cur.close")
+
+
+class FakeCon:
+    def __init__(self, log, fail=False):
+        self.log, self.fail = log, fail
+
+    def cursor(self):
+        return FakeCur(self.log, self.fail)
+
+    def rollback(self):
+        self.log.append("rollback")
+
+    def close(self):
+        self.log.append("con.close")
+
+
+class FakePool:
+    def __init__(self, fail=False):
+        self.log, self.fail = [], fail
+
+    def acquire(self):
+        self.log.append("acquire")
+        return FakeCon(self.log, self.fail)
+
+
+class AsyncFakeCon(FakeCon):
+    async def rollback(self):
+        self.log.append("rollback")
+
+    async def close(self):
+        self.log.append("con.close")
+
+
+class AsyncFakePool(FakePool):
+    async def acquire(self):
+        self.log.append("acquire")
+        return AsyncFakeCon(self.log)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    def use(fail=False):
+        p = FakePool(fail)
+        monkeypatch.setattr(SsyDBManager, "getPool", staticmethod(lambda: p))
+        return p
+    return use
+
+
+def test_concur_releases_without_rollback(pool):
+    p = pool()
+    with SsyDBManager.conCur() as (_con, cur):
+        cur.execute("SELECT 1 FROM dual")
+    assert p.log == ["acquire", "cur.close", "con.close"]
+
+
+def test_concur_rolls_back_on_error(pool):
+    p = pool()
+    with pytest.raises(ValueError):
+        with SsyDBManager.conCur():
+            raise ValueError("boom")
+    assert p.log == ["acquire", "rollback", "cur.close", "con.close"]
+
+
+def test_dao_error_path_still_returns_connection(pool):
+    p = pool(fail=True)
+    assert NoticeDAO().getNoticesVersion() is None
+    assert p.log[-2:] == ["cur.close", "con.close"]
+
+
+def test_async_concur_rolls_back_on_error(monkeypatch):
+    p = AsyncFakePool()
+    monkeypatch.setattr(SsyAsyncDBManager, "getPool", staticmethod(lambda: p))
+
+    async def run():
+        async with SsyAsyncDBManager.conCur():
+            raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert p.log == ["acquire", "rollback", "cur.close", "con.close"]
@@ -0,0 +1,59 @@
+import threading
+import time
+import httpx
+import pytest
+from ProjectDB.SSY.ssyEventBroker import SsyEventBroker, isLoopback
+
+
+def test_is_loopback():
+    assert isLoopback("127.0.0.1") and isLoopback("127.1.2.3") and isLoopback("::1") and isLoopback("localhost")
+    assert not isLoopback("10.0.0.5") and not isLoopback("example.com") and not isLoopback(None)
+
+
+def test_forward_without_key_only_to_loopback():
+    broker = SsyEventBroker()
+    with pytest.raises(ValueError):
+        broker.forwardTo("http://10.0.0.5:8000/events.publish")
+    broker.forwardTo("http://[::1]:8000/events.publish")
+    broker.stopForwarding()
+    broker = SsyEventBroker()
+    broker.forwardTo("http://10.0.0.5:8000/events.publish", key="secret")
+    broker.stopForwarding()
+
+
+class SlowClient:
+    def __init__(self, delay):
+        self.delay = delay
+        self.sent = []
+
+    def post(self, url, json, headers):
+        time.sleep(self.delay)
+        self.sent.append(json["topic"])
+        return httpx.Response(200, request=httpx.Request("POST", url))
+
+    def close(self):
+        pass
+
+
+def test_publish_does_not_wait_for_forwarding():
+    broker = SsyEventBroker()
+    broker.forwardTo("http://127.0.0.1:8000/events.publish")
+    broker._client = client = SlowClient(0.05)
+    t0 = time.perf_counter()
+    for i in range(5):
+        broker.publish(f"report:{i}", {"type": "ai_status"})
+    assert time.perf_counter() - t0 < 0.05
+    broker.stopForwarding()
+    # 보낸 순서 그대로, 종료 전에 남은 것까지 전달
+    assert client.sent == [f"report:{i}" for i in range(5)]
+    assert broker.status()["forwarded"] == 5
+
+
+def test_stats_are_exact_under_threads():
+    broker = SsyEventBroker()
+    threads = [threading.Thread(target=lambda: [broker.publish("t", {}) for _ in range(2000)]) for _ in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert broker.status()["published"] == 16000
@@ -0,0 +1,53 @@
+import math
+import random
+from ProjectDB.SSY.ssyGeoIndex import EARTH_RADIUS_M, SsyGeoIndex
+
+
+def brute(points, lat, lng, radius):
+    return sorted((k for k, plat, plng in points if SsyGeoIndex.distanceM(lat, lng, plat, plng) <= radius))
+
+
+def test_nearby_matches_full_scan():
+    rnd = random.Random(1)
+    points = [(i, rnd.uniform(37.45, 37.70), rnd.uniform(126.80, 127.20)) for i in range(5000)]
+    index = SsyGeoIndex()
+    index.load(points)
+    for _ in range(30):
+        lat, lng = rnd.uniform(37.45, 37.70), rnd.uniform(126.80, 127.20)
+        for radius in (200, 1500, 5000):
+            assert sorted(k for k, _ in index.nearby(lat, lng, radius)) == brute(points, lat, lng, radius)
+
+
+def test_points_just_inside_the_radius_edge_are_found():
+    # 원의 동서/남북 끝 바로 안쪽 (경도 폭이 가장 넓은 곳은 중심 위도보다 극 쪽)
+    lat, lng, radius = 37.55, 126.98, 3000
+    angular = radius / EARTH_RADIUS_M
+    index = SsyGeoIndex()
+    index.add("north", lat + math.degrees(angular) * 0.9999, lng)
+    index.add("south", lat - math.degrees(angular) * 0.9999, lng)
+    for i, dlat in enumerate((0.0, 0.002, 0.004)):
+        # 해당 위도에서 거리 radius*0.9999가 되는 경도
+        plat = lat + dlat
+        lo, hi = lng, lng + 1
+        for _ in range(60):
+            mid = (lo + hi) / 2
+            lo, hi = (mid, hi) if SsyGeoIndex.distanceM(lat, lng, plat, mid) < radius * 0.9999 else (lo, mid)
+        index.add(f"east{i}", plat, lo)
+    assert {k for k, _ in index.nearby(lat, lng, radius)} == {"north", "south", "east0", "east1", "east2"}
+
+
+def test_nearby_sorted_limited_and_updates():
+    index = SsyGeoIndex()
+    index.add(1, 37.5000, 127.0000)
+    index.add(2, 37.5010, 127.0000)
+    index.add(3, 37.5100, 127.0000)
+    index.add(4, None, 127.0)
+    assert len(index) == 3 and 4 not in index
+    assert [k for k, _ in index.nearby(37.5, 127.0, 2000)] == [1, 2, 3]
+    assert [k for k, _ in index.nearby(37.5, 127.0, 2000, limit=2)] == [1, 2]
+    # 같은 key를 다시 add하면 이동, remove하면 빠짐
+    index.add(1, 37.6, 127.1)
+    assert [k for k, _ in index.nearby(37.5, 127.0, 2000)] == [2, 3]
+    assert index.get(1) == (37.6, 127.1)
+    assert index.remove(2) and not index.remove(2)
+    assert [k for k, _ in index.nearby(37.5, 127.0, 2000)] == [3]
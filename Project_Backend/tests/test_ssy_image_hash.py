@@ -0,0 +1,50 @@
+import random
+from io import BytesIO
+import pytest
+from ProjectDB.SSY.ssyImageHash import SsyImageHash
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def photo(seed, size=(640, 480)):
+    # 큰 덩어리 무늬가 있는 사진 흉내 (dHash는 저주파 밝기 변화만 본다)
+    rnd = random.Random(seed)
+    small = Image.new("RGB", (12, 9))
+    small.putdata([tuple(rnd.randint(0, 255) for _ in range(3)) for _ in range(12 * 9)])
+    return small.resize(size, Image.BICUBIC)
+
+
+def encode(img, fmt="JPEG", **kw):
+    buf = BytesIO()
+    img.save(buf, fmt, **kw)
+    return buf.getvalue()
+
+
+def test_recompressed_and_resized_copy_is_near():
+    img = photo(1)
+    h = SsyImageHash.dHash(encode(img, quality=95))
+    assert len(h) == 16
+    assert SsyImageHash.distance(h, SsyImageHash.dHash(encode(img, quality=40))) <= 4
+    assert SsyImageHash.distance(h, SsyImageHash.dHash(encode(img.resize((320, 240)), "PNG"))) <= 4
+
+
+def test_different_photos_are_far():
+    hashes = [SsyImageHash.dHash(encode(photo(seed))) for seed in range(2, 8)]
+    for i, a in enumerate(hashes):
+        for b in hashes[i + 1:]:
+            assert SsyImageHash.distance(a, b) > 10
+
+
+def test_exif_rotation_is_applied():
+    img = photo(9)
+    sideways = img.transpose(Image.Transpose.ROTATE_90)
+    exif = Image.Exif()
+    exif[0x0112] = 6   # Orientation: 시계 방향 90도 돌려서 보여야 함 → 원래 사진
+    upright = SsyImageHash.dHash(encode(img))
+    assert SsyImageHash.distance(SsyImageHash.dHash(encode(sideways, exif=exif.tobytes())), upright) <= 4
+    assert SsyImageHash.distance(SsyImageHash.dHash(encode(sideways)), upright) > 10
+
+
+def test_not_an_image_and_distance():
+    assert SsyImageHash.dHash(b"not an image") is None
+    assert SsyImageHash.distance("ff00", "0f01") == 5
@@ -0,0 +1,60 @@
+import random
+from ProjectDB.SSY.ssyLeaderboard import SsyLeaderboard
+
+
+def sql_rank(scores):
+    # RANK() OVER (ORDER BY score DESC)
+    return {u: 1 + sum(1 for s in scores.values() if s > score) for u, score in scores.items()}
+
+
+def test_rank_matches_sql_rank_after_random_updates():
+    rnd = random.Random(3)
+    board = SsyLeaderboard()
+    board.load([(f"u{i}", rnd.randint(0, 20), f"nick{i}", None) for i in range(50)])
+    scores = {f"u{i}": board.scoreOf(f"u{i}") for i in range(50)}
+    for _ in range(300):
+        u = f"u{rnd.randint(0, 59)}"
+        if rnd.random() < 0.1:
+            board.remove(u)
+            scores.pop(u, None)
+        else:
+            scores[u] = rnd.randint(0, 20)
+            board.setScore(u, scores[u])
+        expected = sql_rank(scores)
+        assert len(board) == len(scores)
+        assert {x: board.rankOf(x) for x in scores} == expected
+    entries = board.top(len(scores))
+    assert [e["user_id"] for e in entries] == sorted(scores, key=lambda x: (-scores[x], x))
+    assert all(e["rank"] == expected[e["user_id"]] for e in entries)
+
+
+def test_ties_share_rank_and_next_rank_is_skipped():
+    board = SsyLeaderboard()
+    board.load([("a", 30, "A", None), ("b", 20, "B", None), ("c", 20, "C", None), ("d", 10, "D", None)])
+    assert [board.rankOf(u) for u in "abcd"] == [1, 2, 2, 4]
+    assert [(e["user_id"], e["rank"]) for e in board.top(3)] == [("a", 1), ("b", 2), ("c", 2)]
+    assert board.rankOf("zz") is None
+
+
+def test_around_window_clips_at_edges():
+    board = SsyLeaderboard()
+    board.load([(f"u{i}", 100 - i, None, None) for i in range(10)])
+    assert [e["user_id"] for e in board.around("u5", 2)] == ["u3", "u4", "u5", "u6", "u7"]
+    assert [e["user_id"] for e in board.around("u0", 2)] == ["u0", "u1", "u2"]
+    assert [e["user_id"] for e in board.around("u9", 2)] == ["u7", "u8", "u9"]
+    assert board.around("nobody") == []
+    # 점수가 바뀌면 위치도 바뀐다
+    board.setScore("u9", 1000)
+    assert [e["user_id"] for e in board.around("u9", 1)] == ["u9", "u0"]
+
+
+def test_info_updates_only_known_users():
+    board = SsyLeaderboard()
+    board.setScore("a", 5)
+    board.setInfo("a", nickname="에이", profile_pic_url="/p.png")
+    board.setInfo("ghost", nickname="x")
+    assert "ghost" not in board
+    assert board.top(1) == [{"profile_pic_url": "/p.png", "user_id": "a", "nickname": "에이", "score": 5, "rank": 1}]
+    board.setScore(None, 3)
+    board.setScore("b", None)
+    assert len(board) == 1
@@ -0,0 +1,72 @@
+import random
+from datetime import datetime, timedelta
+import pytest
+from ProjectDB.SSY.ssyPageCursor import SsyPageCursor
+
+TEMPLATE = "SELECT r.report_id FROM Reports r {where} ORDER BY r.report_date DESC, r.report_id DESC {fetch}"
+
+
+def fetch_page(reports, cursor, limit):
+    """reportQuery가 만든 keyset 조건/FETCH FIRST를 파이썬으로 흉내 + 신고마다 상태 JOIN 행 1~3개"""
+    sql, params = SsyPageCursor.reportQuery(TEMPLATE, cursor, limit)
+    rows = sorted(reports, key=lambda r: (r[1], r[0]), reverse=True)
+    if "c_date" in params:
+        rows = [r for r in rows
+                if r[1] < params["c_date"] or (r[1] == params["c_date"] and r[0] < params["c_id"])]
+    rows = rows[:params["p_lim"]]
+    joined = [(rid, f"status{j}", date) for rid, date, n in rows for j in range(n)]
+    return SsyPageCursor.cutReportPage(joined, limit, dateIdx=2, idIdx=0)
+
+
+def test_walking_pages_returns_every_report_once():
+    rnd = random.Random(5)
+    base = datetime(2025, 3, 1)
+    # 같은 report_date가 많도록 (동률은 report_id로 갈린다)
+    reports = [(i, base + timedelta(hours=rnd.randint(0, 20)), rnd.randint(1, 3)) for i in range(1, 301)]
+    for limit in (1, 7, 50, 500):
+        seen, cursor, pages = [], None, 0
+        while True:
+            rows, cursor = fetch_page(reports, cursor, limit)
+            ids = list(dict.fromkeys(r[0] for r in rows))
+            assert len(ids) <= limit
+            seen += ids
+            pages += 1
+            if cursor is None:
+                break
+        assert sorted(seen) == list(range(1, 301)) and len(seen) == len(set(seen))
+        assert pages == -(-300 // limit)
+
+
+def test_cut_page_keeps_all_joined_rows_of_last_report():
+    d = datetime(2025, 1, 1)
+    rows = [(3, "a", d), (3, "b", d), (2, "a", d), (1, "a", d)]
+    kept, cursor = SsyPageCursor.cutReportPage(rows, 2, dateIdx=2, idIdx=0)
+    assert kept == rows[:3]
+    assert SsyPageCursor.decode(cursor) == {"d": d.isoformat(), "id": 2}
+    assert SsyPageCursor.cutReportPage(rows[:3], 2, dateIdx=2, idIdx=0) == (rows[:3], None)
+
+
+def test_id_keyset_pages():
+    rows = [(i,) for i in range(10, 0, -1)]
+    page, cursor = SsyPageCursor.cutIdPage(rows[:4], 3, idIdx=0)
+    assert page == rows[:3]
+    assert SsyPageCursor.idKeyset(cursor, "status_id") == ("status_id < :c_id", {"c_id": 8})
+    assert SsyPageCursor.cutIdPage(rows[:2], 3, idIdx=0) == (rows[:2], None)
+    assert SsyPageCursor.idKeyset(None, "status_id") == ("", {})
+
+
+def test_limits_and_full_listing():
+    assert SsyPageCursor.pageLimit(None, None) is None
+    assert SsyPageCursor.pageLimit(None, "x") == SsyPageCursor.DEFAULT_LIMIT
+    assert SsyPageCursor.clampLimit(0) == 1 and SsyPageCursor.clampLimit(10**6) == SsyPageCursor.MAX_LIMIT
+    sql, params = SsyPageCursor.reportQuery(TEMPLATE, None, None, filters=["r.x = 1"], params={"a": 1})
+    assert "FETCH" not in sql and "WHERE r.x = 1" in sql and params == {"a": 1}
+    sql, params = SsyPageCursor.reportQuery(TEMPLATE, None, 20)
+    assert "WHERE" not in sql and sql.endswith("FETCH FIRST :p_lim ROWS ONLY") and params == {"p_lim": 21}
+
+
+@pytest.mark.parametrize("bad", ["!!!", SsyPageCursor.encode([1, 2]), SsyPageCursor.encode({"d": "x", "id": 1}),
+                                 SsyPageCursor.encode({"id": "abc"})])
+def test_bad_cursor_is_value_error(bad):
+    with pytest.raises(ValueError):
+        SsyPageCursor.reportKeyset(bad)
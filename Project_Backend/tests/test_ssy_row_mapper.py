@@ -0,0 +1,32 @@
+import decimal
+from datetime import datetime
+import oracledb
+from ProjectDB.SSY.ssyRowMapper import SsyRowMapper
+
+
+class Lob:
+    def __init__(self, data):
+        self.data = data
+
+    def read(self):
+        return self.data
+
+
+def test_map_rows_converts_by_column_type():
+    desc = [("ID", oracledb.DB_TYPE_NUMBER), ("SCORE", oracledb.DB_TYPE_NUMBER), ("NAME", oracledb.DB_TYPE_VARCHAR),
+            ("BODY", oracledb.DB_TYPE_CLOB), ("RAW", oracledb.DB_TYPE_BLOB), ("CREATED", oracledb.DB_TYPE_TIMESTAMP)]
+    rows = [
+        (1, decimal.Decimal("2.5"), "a", "본문", b"\xed\x95\x9c", datetime(2025, 1, 2, 3, 4, 5)),
+        (decimal.Decimal("7"), None, None, Lob(b"lob"), None, None),
+    ]
+    assert SsyRowMapper.mapRows(desc, rows) == [
+        {"id": 1, "score": 2.5, "name": "a", "body": "본문", "raw": "한", "created": "2025-01-02 03:04:05"},
+        {"id": 7, "score": None, "name": None, "body": "lob", "raw": None, "created": None},
+    ]
+
+
+def test_to_json_handles_any_value():
+    assert SsyRowMapper.toJson(decimal.Decimal("3")) == 3
+    assert SsyRowMapper.toJson(Lob("x")) == "x"
+    assert SsyRowMapper.toJson(datetime(2025, 1, 1)) == "2025-01-01 00:00:00"
+    assert SsyRowMapper.toJson("s") == "s"
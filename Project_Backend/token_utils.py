@@ -13,8 +13,9 @@ REFRESH_SECRET_KEY = os.environ.get(
     "please_use_a_different_refresh_secret"
 )
 
-# Expo 알림 기능 URL
-EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+# Expo 알림 기능 URL (로컬 테스트 시 fakeExpoServer 주소로 바꿔서 사용)
+EXPO_PUSH_URL = os.environ.get("EXPO_PUSH_URL", "https://exp.host/--/api/v2/push/send")
+EXPO_RECEIPTS_URL = os.environ.get("EXPO_RECEIPTS_URL", "https://exp.host/--/api/v2/push/getReceipts")
 
 # === 토큰 생성 유틸리티 ===
 def create_access_token(payload: dict) -> str:
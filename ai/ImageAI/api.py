@@ -1,7 +1,8 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from azure.storage.blob import BlobServiceClient
 from PIL import Image
-import io, uuid, os, torch, httpx, base64
+import io, uuid, os, torch, httpx, base64, asyncio
+from typing import List
 from torchvision import transforms
 from torchvision.models.detection import maskrcnn_resnet50_fpn
 import numpy as np
@@ -9,6 +10,8 @@ from torchvision.models.detection.faster_rcnn import FastRCNNPredictor
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
+from inference_scheduler import InferenceScheduler
+from result_cache import ResultCache
 
 load_dotenv()
 app = FastAPI()
@@ -53,6 +56,50 @@ category_map_ko = {
 preprocess = transforms.ToTensor()
 THRESHOLD  = 0.5
 
+# -------------------------
+# 추론 스케줄러 (micro-batching)
+#   INFER_MAX_BATCH   한 번에 묶을 최대 이미지 수 (기본 4, 1이면 요청별 추론과 같음)
+#   INFER_MAX_WAIT_MS 첫 이미지 뒤 묶음을 기다리는 최대 시간 (기본 10ms)
+# -------------------------
+def run_batch(tensors):
+    # 크기가 달라도 모델 내부 transform이 패딩해서 한 배치로 처리
+    with torch.inference_mode():
+        outs = model([t.to(device) for t in tensors])
+    return [{k: v.cpu() for k, v in o.items()} for o in outs]
+
+scheduler = InferenceScheduler(
+    run_batch,
+    max_batch=int(os.getenv("INFER_MAX_BATCH", "4")),
+    max_wait_ms=float(os.getenv("INFER_MAX_WAIT_MS", "10")),
+)
+
+# -------------------------
+# 결과 캐시: 이미지 바이트 SHA-256 → 응답 (같은 사진 재제출 시 추론/BLIP-2 생략)
+#   RESULT_CACHE_ENTRIES 메모리 최대 항목 수 (기본 5000), RESULT_CACHE_MB 메모리 최대 크기 (기본 64)
+#   RESULT_CACHE_SQLITE  지정하면 SQLite 파일에도 저장 (재시작 후에도 유지)
+# -------------------------
+result_cache = ResultCache(
+    max_entries=int(os.getenv("RESULT_CACHE_ENTRIES", "5000")),
+    max_bytes=int(os.getenv("RESULT_CACHE_MB", "64")) * 1024 * 1024,
+    sqlite_path=os.getenv("RESULT_CACHE_SQLITE") or None,
+)
+
+async def analyze_cached(data: bytes, filename: str) -> dict:
+    key = ResultCache.key(data)
+    result, hit = await result_cache.get_or_compute(
+        key, lambda: analyze_image(data, filename),
+        cacheable=lambda r: r.get("status") in ("detected", "not_detected"),
+    )
+    return dict(result, content_sha256=key, cached=hit)
+
+@app.on_event("startup")
+async def start_scheduler():
+    await scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    await scheduler.stop()
+
 # -------------------------
 # Helper: BLIP-2 엔드포인트 호출 (비동기)
 # -------------------------
@@ -93,28 +140,55 @@ async def call_blip2_endpoint(pil_image: Image.Image, orig_filename: str = "") -
 def health():
     return {"status": "ok"}
 
+@app.get("/stats")
+def stats():
+    return {"scheduler": scheduler.status(), "result_cache": result_cache.status()}
+
 @app.post("/predict")
 async def analyze_with_maskrcnn(image: UploadFile = File(...)):
-    # 1) 이미지 로드
     data = await image.read()
+    return await analyze_cached(data, image.filename)
+
+# 여러 장을 한 multipart 요청으로 (필드 이름 "images" 반복)
+# 결과는 보낸 순서대로 /predict와 같은 형식, 한 장이 실패해도 나머지는 계속 → 그 자리에 {"status": "error", "detail": ...}
+MAX_BATCH_IMAGES = int(os.getenv("PREDICT_BATCH_MAX", "32"))
+
+@app.post("/predict_batch")
+async def analyze_batch_with_maskrcnn(images: List[UploadFile] = File(...)):
+    if len(images) > MAX_BATCH_IMAGES:
+        raise HTTPException(status_code=413, detail=f"too many images: {len(images)} > {MAX_BATCH_IMAGES}")
+    datas = [await f.read() for f in images]
+    # 전부 동시에 스케줄러에 넣어야 한 번의 forward로 묶인다
+    outs = await asyncio.gather(*(analyze_cached(d, f.filename) for d, f in zip(datas, images)),
+                                return_exceptions=True)
+    results = []
+    for f, out in zip(images, outs):
+        if isinstance(out, HTTPException):
+            out = {"status": "error", "code": out.status_code, "detail": out.detail}
+        elif isinstance(out, Exception):
+            out = {"status": "error", "code": 500, "detail": str(out)}
+        results.append(dict(out, filename=f.filename))
+    return {"count": len(results), "results": results}
+
+async def analyze_image(data: bytes, filename: str) -> dict:
+    # 1) 이미지 로드
     try:
         img = Image.open(io.BytesIO(data)).convert("RGB")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image: {e}")
     np_img = np.array(img)
-    t = preprocess(img).to(device)
+    t = preprocess(img)
 
-    # 2) Mask R-CNN 추론
-    with torch.no_grad():
-        out = model([t])[0]
+    # 2) Mask R-CNN 추론 (스케줄러가 다른 요청과 묶어서 실행)
+    out = await scheduler.submit(t)
 
     scores = out["scores"].cpu()
     keep   = scores > THRESHOLD
     if keep.sum().item() == 0:
         # 객체 미검출: BLIP-2 엔드포인트에 이미지 전달하여 caption + Blob 업로드(엔드포인트가 처리)
         now_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-        stem = Path(image.filename).stem
-        ext = os.path.splitext(image.filename)[1] or ".jpg"
+        stem = Path(filename or "input").stem
+        ext = os.path.splitext(filename or "")[1] or ".jpg"
         input_filename = f"{stem}_{now_str}_{uuid.uuid4().hex[:6]}{ext}"
 
         # BLIP-2 endpoint 부르기
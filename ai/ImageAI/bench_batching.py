@@ -0,0 +1,91 @@
+# InferenceScheduler 배치 크기별 처리량/지연 측정 (CPU)
+# 실행: python bench_batching.py --requests 64 --concurrency 16 --batch 1 2 3 4 5 6 7 8
+#   --weights ./models/maskrcnn_combined_filtered.pt 가 있으면 실제 가중치, 없으면 무작위 가중치
+#   (추론 시간은 가중치 값과 거의 무관하지만, 무작위 가중치는 검출 수가 달라 후처리 시간이 조금 다를 수 있음)
+# 출력: 배치 크기별 처리량(img/s), 요청 지연 p50/p95(ms), 실제 평균 묶음 크기
+import argparse
+import asyncio
+import os
+import time
+import torch
+from torchvision.models.detection import maskrcnn_resnet50_fpn
+from torchvision.models.detection.faster_rcnn import FastRCNNPredictor
+from inference_scheduler import InferenceScheduler
+
+
+def load_model(weights: str):
+    model = maskrcnn_resnet50_fpn(weights=None, weights_backbone=None)
+    in_features = model.roi_heads.box_predictor.cls_score.in_features
+    model.roi_heads.box_predictor = FastRCNNPredictor(in_features, 15)
+    if weights and os.path.exists(weights):
+        model.load_state_dict(torch.load(weights, map_location="cpu"))
+    return model.eval()
+
+
+def percentile(values, p):
+    s = sorted(values)
+    return s[min(len(s) - 1, int(len(s) * p))]
+
+
+async def run_once(model, images, batch: int, wait_ms: float, concurrency: int):
+    def run_batch(tensors):
+        with torch.inference_mode():
+            return model(tensors)
+
+    scheduler = InferenceScheduler(run_batch, max_batch=batch, max_wait_ms=wait_ms)
+    await scheduler.start()
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(t):
+        async with sem:
+            t0 = time.perf_counter()
+            await scheduler.submit(t)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in images))
+    elapsed = time.perf_counter() - t0
+    status = scheduler.status()
+    await scheduler.stop()
+    return {
+        "batch": batch,
+        "throughput": len(images) / elapsed,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "avg_batch": status["avg_batch"],
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=64)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--batch", type=int, nargs="+", default=list(range(1, 9)))
+    ap.add_argument("--wait-ms", type=float, default=10)
+    ap.add_argument("--size", default="640x480", help="입력 이미지 크기 WxH")
+    ap.add_argument("--weights", default="./models/maskrcnn_combined_filtered.pt")
+    ap.add_argument("--threads", type=int, default=0, help="torch intra-op 스레드 수 (0이면 기본값)")
+    args = ap.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    w, h = (int(x) for x in args.size.lower().split("x"))
+    model = load_model(args.weights)
+    torch.manual_seed(0)
+    images = [torch.rand(3, h, w) for _ in range(args.requests)]
+
+    # 워밍업 (첫 호출의 메모리 할당/커널 선택 시간 제외)
+    with torch.inference_mode():
+        model(images[:1])
+
+    print(f"requests={args.requests} concurrency={args.concurrency} wait_ms={args.wait_ms} "
+          f"size={w}x{h} threads={torch.get_num_threads()}")
+    print(f"{'batch':>5} {'img/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'avg batch':>10}")
+    for b in args.batch:
+        r = asyncio.run(run_once(model, images, b, args.wait_ms, args.concurrency))
+        print(f"{r['batch']:>5} {r['throughput']:>8.2f} {r['p50']:>9.0f} {r['p95']:>9.0f} {r['avg_batch']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, List
+
+
+class InferenceScheduler:
+    """
+    요청마다 model([t])를 부르는 대신 이미지를 큐에 모아 한 번에 추론 (micro-batching).
+    - 첫 이미지가 들어온 뒤 max_wait_ms 안에 들어온 것까지, 최대 max_batch장을 묶어 run_batch(list) 한 번
+    - 추론은 전용 스레드 하나에서 순서대로 (torch가 내부 스레드로 CPU를 다 쓰므로 동시 실행은 이득 없음)
+    - 추론 중에 들어온 요청은 큐에 쌓였다가 다음 묶음이 된다
+    - submit()은 자기 이미지의 결과만 돌려받는다 (묶음 실패 시 같은 묶음 요청 모두 예외)
+    """
+
+    def __init__(self, run_batch: Callable[[List[Any]], List[Any]], max_batch: int = 4,
+                 max_wait_ms: float = 10, queue_size: int = 256):
+        self.run_batch = run_batch
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.queue_size = queue_size
+        self._queue = None
+        self._task = None
+        self._batch_sizes = deque(maxlen=1000)
+        self._wait_ms = deque(maxlen=1000)     # 큐 대기 (submit → 추론 시작)
+        self._infer_ms = deque(maxlen=1000)    # 묶음 하나 추론 시간
+        self.stats = {"images": 0, "batches": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+    async def start(self):
+        if self._task:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if not self._task:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    # ------------------------------------------------------------------
+    # 요청 쪽
+    # ------------------------------------------------------------------
+    async def submit(self, item):
+        if not self._task:
+            await self.start()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, fut, time.perf_counter()))
+        return await fut
+
+    # ------------------------------------------------------------------
+    # 묶기 + 추론
+    # ------------------------------------------------------------------
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            # 이미 쌓여 있는 것은 기다리지 않고 바로 담는다
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _loop(self):
+        while True:
+            batch = await self._collect()
+            # 기다리다 연결이 끊긴 요청은 빼고 추론
+            batch = [b for b in batch if not b[1].done()]
+            if not batch:
+                continue
+            t0 = time.perf_counter()
+            for _item, _fut, queued_at in batch:
+                self._wait_ms.append((t0 - queued_at) * 1000)
+            try:
+                outs = await asyncio.to_thread(self.run_batch, [b[0] for b in batch])
+            except Exception as e:
+                self.stats["errors"] += 1
+                for _item, fut, _ in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            self._infer_ms.append((time.perf_counter() - t0) * 1000)
+            self._batch_sizes.append(len(batch))
+            self.stats["batches"] += 1
+            self.stats["images"] += len(batch)
+            for (_item, fut, _), out in zip(batch, outs):
+                if not fut.done():
+                    fut.set_result(out)
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _summary(values):
+        if not values:
+            return {"avg": None, "p95": None}
+        s = sorted(values)
+        return {"avg": round(sum(s) / len(s), 1), "p95": round(s[min(len(s) - 1, int(len(s) * 0.95))], 1)}
+
+    def status(self) -> dict:
+        sizes = list(self._batch_sizes)
+        return dict(
+            self.stats,
+            max_batch=self.max_batch,
+            max_wait_ms=self.max_wait * 1000,
+            queued=self._queue.qsize() if self._queue else 0,
+            avg_batch=round(sum(sizes) / len(sizes), 2) if sizes else None,
+            queue_wait_ms=self._summary(list(self._wait_ms)),
+            batch_infer_ms=self._summary(list(self._infer_ms)),
+        )
@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+
+class ResultCache:
+    """
+    이미지 바이트 SHA-256 → 분석 결과(dict) 캐시.
+    - 메모리: LRU, max_entries개 / 직렬화 크기 합 max_bytes 이하로 유지
+    - sqlite_path가 있으면 디스크(SQLite)에도 저장 → 재시작 뒤에도 재사용, 최대 disk_entries개 (오래 안 쓴 것부터 삭제)
+    - 같은 이미지가 동시에 여러 번 들어오면 한 번만 분석하고 결과를 나눠 가진다 (get_or_compute)
+    """
+
+    def __init__(self, max_entries: int = 5000, max_bytes: int = 64 * 1024 * 1024,
+                 sqlite_path: Optional[str] = None, disk_entries: int = 100000):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sqlite_path = sqlite_path
+        self.disk_entries = disk_entries
+        self._mem = OrderedDict()       # key -> json 문자열
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight = {}             # key -> Future (동시 중복 요청 합치기)
+        self._db = None
+        self._db_puts = 0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def key(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            raw = self._mem.get(key)
+            if raw is not None:
+                self._mem.move_to_end(key)
+                self.stats["hits"] += 1
+                return json.loads(raw)
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+                    self._remember(key, row[0])
+                    self.stats["disk_hits"] += 1
+                    return json.loads(row[0])
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: dict):
+        raw = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            self._remember(key, raw)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO results (key, value, last_used) VALUES (?, ?, ?)",
+                                 (key, raw, time.time()))
+                self._db_puts += 1
+                if self._db_puts % 1000 == 0:
+                    self._prune_disk()
+
+    def _remember(self, key: str, raw: str):
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._mem[key] = raw
+        self._bytes += len(raw)
+        while self._mem and (len(self._mem) > self.max_entries or self._bytes > self.max_bytes):
+            _k, v = self._mem.popitem(last=False)
+            self._bytes -= len(v)
+            self.stats["evictions"] += 1
+
+    def _prune_disk(self):
+        self._db.execute("""
+            DELETE FROM results WHERE key IN (
+                SELECT key FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.disk_entries,))
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[dict]],
+                             cacheable: Callable[[dict], bool] = lambda r: True):
+        """(결과, 캐시 적중 여부). 같은 키를 분석 중이면 그 결과를 기다린다"""
+        hit = self.get(key)
+        if hit is not None:
+            return hit, True
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(fut), True
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await compute()
+            if cacheable(result):
+                self.put(key, result)
+            fut.set_result(result)
+            return result, False
+        except BaseException as e:
+            fut.set_exception(e)
+            # 기다리는 쪽이 없으면 "exception never retrieved" 경고만 나므로 여기서 소비
+            fut.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def status(self) -> dict:
+        with self._lock:
+            disk = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0] if self._db is not None else None
+            return dict(self.stats, entries=len(self._mem), bytes=self._bytes, max_entries=self.max_entries,
+                        max_bytes=self.max_bytes, disk_entries=disk)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# ai/ImageAI를 import 경로에 (api.py와 같은 방식으로 inference_scheduler / result_cache import)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
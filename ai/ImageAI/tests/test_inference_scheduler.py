@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import pytest
+from inference_scheduler import InferenceScheduler
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_requests_are_batched_and_get_their_own_result():
+    calls = []
+
+    def run_batch(items):
+        calls.append(list(items))
+        return [x * 10 for x in items]
+
+    async def main():
+        sched = InferenceScheduler(run_batch, max_batch=4, max_wait_ms=50)
+        outs = await asyncio.gather(*(sched.submit(i) for i in range(10)))
+        await sched.stop()
+        return outs, sched.status()
+
+    outs, status = run(main())
+    assert outs == [i * 10 for i in range(10)]
+    assert [len(c) for c in calls] == [4, 4, 2]
+    assert status["images"] == 10 and status["batches"] == 3 and status["avg_batch"] == pytest.approx(10 / 3, 0.01)
+
+
+def test_single_request_waits_at_most_max_wait():
+    async def main():
+        sched = InferenceScheduler(lambda items: items, max_batch=8, max_wait_ms=20)
+        t0 = time.perf_counter()
+        out = await sched.submit("a")
+        elapsed = time.perf_counter() - t0
+        await sched.stop()
+        return out, elapsed
+
+    out, elapsed = run(main())
+    assert out == "a" and elapsed < 1
+
+
+def test_requests_arriving_during_inference_form_next_batch():
+    started = threading.Event()
+    calls = []
+
+    def run_batch(items):
+        calls.append(list(items))
+        if len(calls) == 1:
+            started.set()
+            time.sleep(0.1)
+        return items
+
+    async def main():
+        sched = InferenceScheduler(run_batch, max_batch=8, max_wait_ms=0)
+        first = asyncio.create_task(sched.submit(0))
+        await asyncio.to_thread(started.wait)
+        rest = await asyncio.gather(*(sched.submit(i) for i in range(1, 4)))
+        await first
+        await sched.stop()
+        return rest
+
+    assert run(main()) == [1, 2, 3]
+    assert calls == [[0], [1, 2, 3]]
+
+
+def test_batch_error_fails_only_that_batch():
+    def run_batch(items):
+        if "bad" in items:
+            raise RuntimeError("CUDA OOM")
+        return items
+
+    async def main():
+        sched = InferenceScheduler(run_batch, max_batch=2, max_wait_ms=50)
+        results = await asyncio.gather(sched.submit("bad"), sched.submit("x"), return_exceptions=True)
+        after = await sched.submit("ok")
+        await sched.stop()
+        return results, after, sched.status()
+
+    results, after, status = run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert after == "ok" and status["errors"] == 1
+
+
+def test_cancelled_request_is_dropped_from_batch():
+    gate = threading.Event()
+    calls = []
+
+    def run_batch(items):
+        calls.append(list(items))
+        gate.wait(2)
+        return items
+
+    async def main():
+        sched = InferenceScheduler(run_batch, max_batch=1, max_wait_ms=0)
+        first = asyncio.create_task(sched.submit("first"))
+        await asyncio.sleep(0.05)
+        gone = asyncio.create_task(sched.submit("gone"))
+        await asyncio.sleep(0.05)
+        gone.cancel()
+        gate.set()
+        out = await first
+        last = await sched.submit("last")
+        await sched.stop()
+        return out, last
+
+    assert run(main()) == ("first", "last")
+    assert ["gone"] not in calls
@@ -0,0 +1,71 @@
+import asyncio
+from result_cache import ResultCache
+
+
+def test_lru_evicts_by_entries_and_bytes():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}      # a가 최근 사용
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None and cache.get("a") == {"v": 1} and cache.get("c") == {"v": 3}
+
+    small = ResultCache(max_bytes=40)
+    small.put("x", {"data": "0123456789"})
+    small.put("y", {"data": "abcdefghij"})
+    assert small.get("x") is None and small.status()["bytes"] <= 40
+    assert small.stats["evictions"] == 1
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    key = ResultCache.key(b"image-bytes")
+    ResultCache(sqlite_path=path).put(key, {"label": "pothole", "score": 0.9})
+    again = ResultCache(sqlite_path=path)
+    assert again.get(key) == {"label": "pothole", "score": 0.9}
+    assert again.stats["disk_hits"] == 1
+    assert again.get(key) and again.stats["hits"] == 1
+
+
+def test_same_image_in_flight_is_computed_once():
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"label": "crack"}
+
+    async def main():
+        cache = ResultCache()
+        outs = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+        later = await cache.get_or_compute("k", compute)
+        return outs, later, cache.stats
+
+    outs, later, stats = asyncio.run(main())
+    assert calls == 1
+    assert [o[0] for o in outs] == [{"label": "crack"}] * 5
+    assert sorted(o[1] for o in outs) == [False, True, True, True, True]
+    assert later == ({"label": "crack"}, True) and stats["coalesced"] == 4
+
+
+def test_failures_and_uncacheable_results_are_not_stored():
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model down")
+
+    async def busy():
+        return {"error": "busy"}
+
+    async def main():
+        cache = ResultCache()
+        results = await asyncio.gather(cache.get_or_compute("k", boom), cache.get_or_compute("k", boom),
+                                       return_exceptions=True)
+        out = await cache.get_or_compute("b", busy, cacheable=lambda r: "error" not in r)
+        return cache, results, out
+
+    cache, results, out = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert out == ({"error": "busy"}, False)
+    assert cache.get("k") is None and cache.get("b") is None
+    assert not cache._inflight